@@ -4,7 +4,9 @@ Modèles PyQt5 pour le suivi des marchés publics
 
 from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex, QSortFilterProxyModel
 from PyQt5.QtGui import QBrush, QColor
+from PyQt5.QtWidgets import QStyledItemDelegate, QStyleOptionViewItem
 from datetime import datetime, date
+from functools import lru_cache
 from typing import List, Dict
 
 
@@ -70,21 +72,287 @@ HISTORIQUE_COLUMNS = [
 ]
 
 
+# Colonnes triées numériquement dans la vision globale
+MARCHES_GLOBAUX_NUMERIC_KEYS = (
+    "montant_initial_marche", "nb_avenants", "service_fait_cumule", "paye_cumule",
+    "reste_a_realiser", "reste_a_mandater", "pourcent_consomme",
+)
+
+
+# ============== PINCEAUX DE FOND ==============
+
+@lru_cache(maxsize=None)
+def cached_brush(color: str) -> QBrush:
+    """Retourne un QBrush partagé pour la couleur donnée (évite une allocation par cellule peinte)."""
+    return QBrush(QColor(color))
+
+
+# ============== COULEURS DE LIGNE PAR CODE ==============
+
+# Rôle renvoyant le code couleur (entier) de la ligne, lu par StatusDelegate
+STATUS_CODE_ROLE = Qt.UserRole
+
+# Codes de consommation (vision opérations)
+CONSOMMATION_COLORS = {
+    1: "#ffe0e0",  # Rouge si dépassé
+    2: "#fff3cd",  # Orange si proche
+    3: "#fff9e6",  # Jaune léger si en cours
+    4: "#e0ffe0",  # Vert si peu consommé
+}
+
+# Codes de statut (historique des factures)
+HISTORIQUE_STATUS_COLORS = {
+    1: "#d4edda",  # Vert pour payé
+    2: "#fff3cd",  # Orange pour facturé
+    3: "#d1ecf1",  # Bleu pour service fait
+    4: "#f8d7da",  # Rouge pour attente
+}
+
+
+def _consommation_code(pourcent):
+    pourcent = pourcent or 0
+    if pourcent >= 100:
+        return 1
+    elif pourcent >= 90:
+        return 2
+    elif pourcent >= 50:
+        return 3
+    return 4
+
+
+def _historique_status_code(statut):
+    statut = statut or ""
+    if "✅" in statut or "Payé" in statut:
+        return 1
+    elif "📋" in statut or "Facturée" in statut:
+        return 2
+    elif "⏳" in statut or "Service fait" in statut:
+        return 3
+    elif "⚠️" in statut or "attente" in statut:
+        return 4
+    return 0
+
+
+class StatusDelegate(QStyledItemDelegate):
+    """
+    Délégué qui colore le fond d'une cellule selon le code de sa ligne
+    (STATUS_CODE_ROLE), à partir de pinceaux construits une seule fois.
+    """
+
+    def __init__(self, colors, parent=None):
+        super().__init__(parent)
+        self._brushes = {code: QBrush(QColor(color)) for code, color in colors.items()}
+
+    def initStyleOption(self, option, index):
+        super().initStyleOption(option, index)
+        brush = self._brushes.get(index.data(STATUS_CODE_ROLE))
+        if brush is not None:
+            option.backgroundBrush = brush
+
+
+class WrapStatusDelegate(StatusDelegate):
+    """
+    StatusDelegate pour les colonnes à texte long (libellés, marchés) : le retour
+    à la ligne n'est activé que pour ces colonnes, la vue restant en wordWrap False.
+    """
+
+    def initStyleOption(self, option, index):
+        super().initStyleOption(option, index)
+        option.features |= QStyleOptionViewItem.WrapText
+
+
+# ============== PARTAGE DES CHAÎNES RÉPÉTÉES ==============
+
+# Colonnes texte à faible nombre de valeurs distinctes (une même chaîne sur beaucoup de lignes)
+INTERNED_KEYS = (
+    "marche", "operation", "fournisseur", "statut",
+    "libelle", "libelle_marche", "tranche_libelle",
+)
+
+
+def intern_rows(rows: List[Dict], keys=INTERNED_KEYS) -> List[Dict]:
+    """
+    Remplace, dans chaque ligne, les chaînes des colonnes `keys` par une instance
+    partagée : une seule copie en mémoire par valeur distincte, et les
+    comparaisons de chaînes identiques se résolvent par identité.
+    """
+    pool = {}
+    for row in rows:
+        for key in keys:
+            value = row.get(key)
+            if isinstance(value, str):
+                row[key] = pool.setdefault(value, value)
+    return rows
+
+
+# ============== CLÉS DE TRI PRÉCALCULÉES ==============
+
+# Rôle renvoyant la clé de tri typée d'une cellule (float, int, datetime ou str)
+SORT_KEY_ROLE = Qt.UserRole + 1
+
+
+def _float_sort_key(value):
+    try:
+        return float(value) if value not in (None, "") else 0.0
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def _int_sort_key(value):
+    try:
+        return int(value) if value not in (None, "") else 0
+    except (TypeError, ValueError):
+        return 0
+
+
+def _date_sort_key(value):
+    if isinstance(value, datetime):
+        return value
+    if isinstance(value, date):
+        return datetime(value.year, value.month, value.day)
+    if isinstance(value, str):
+        for fmt in ("%Y-%m-%d", "%d/%m/%Y"):
+            try:
+                return datetime.strptime(value, fmt)
+            except ValueError:
+                pass
+    return datetime.min
+
+
+def _str_sort_key(value):
+    return str(value) if value is not None else ""
+
+
+class SortKeyTableModel(QAbstractTableModel):
+    """
+    Modèle de base qui met en cache, colonne par colonne, les clés de tri typées.
+
+    Les clés sont calculées une seule fois par chargement (à la première demande
+    de tri sur la colonne) au lieu d'être reconverties à chaque comparaison du
+    proxy. Les sous-classes définissent COLUMNS et SORT_KEY_CONVERTERS
+    (clé de colonne -> fonction de conversion, str par défaut).
+    """
+
+    COLUMNS = []
+    SORT_KEY_CONVERTERS = {}
+
+    def __init__(self, rows=None):
+        super().__init__()
+        self.rows = rows or []
+        self._sort_keys = {}
+        self._status_codes = None
+
+    def set_data(self, rows: List[Dict]):
+        """Met à jour les données du modèle."""
+        self.beginResetModel()
+        self.rows = intern_rows(rows)
+        self._sort_keys = {}
+        self._status_codes = None
+        self.endResetModel()
+
+    def row_status_code(self, row):
+        """Code couleur de la ligne (calculé une fois par chargement pour toutes les lignes)."""
+        if self._status_codes is None:
+            self._status_codes = [self._compute_status_code(r) for r in self.rows]
+        return self._status_codes[row]
+
+    def _compute_status_code(self, row_data):
+        return 0
+
+    def refresh(self, rows: List[Dict]):
+        """Alias de set_data pour compatibilité."""
+        self.set_data(rows)
+
+    def sort_keys(self, column):
+        """Retourne la liste des clés de tri de la colonne (une par ligne)."""
+        keys = self._sort_keys.get(column)
+        if keys is None:
+            key, _ = self.COLUMNS[column]
+            convert = self.SORT_KEY_CONVERTERS.get(key, _str_sort_key)
+            keys = [convert(row.get(key)) for row in self.rows]
+            self._sort_keys[column] = keys
+        return keys
+
+
+class SortKeyProxy(QSortFilterProxyModel):
+    """Proxy qui compare les clés de tri précalculées par le modèle source."""
+
+    def lessThan(self, left, right):
+        keys = self.sourceModel().sort_keys(left.column())
+        lv = keys[left.row()]
+        rv = keys[right.row()]
+        # Chaînes partagées (intern_rows) : égalité par identité, sans comparer le texte
+        return lv is not rv and lv < rv
+
+
 # ============== MODÈLE POUR LA VISION GLOBALE ==============
 
 class MarchesGlobauxTableModel(QAbstractTableModel):
     """Modèle pour la vision globale des marchés (1 ligne = 1 marché)."""
 
+    # Rôles servis par data() ; les autres sont écartés d'emblée
+    _DATA_ROLES = frozenset((Qt.DisplayRole, Qt.ToolTipRole, Qt.TextAlignmentRole, Qt.BackgroundRole))
+
     def __init__(self, rows=None):
         super().__init__()
         self.rows = rows or []
+        # Dernier tri demandé (réappliqué à chaque rechargement)
+        self._sort_column = -1
+        self._sort_order = Qt.AscendingOrder
 
     def set_data(self, rows: List[Dict]):
         """Met à jour les données du modèle."""
         self.beginResetModel()
-        self.rows = rows
+        self.rows = intern_rows(rows)
+        if self._sort_column >= 0:
+            self._sort_rows(self._sort_column, self._sort_order)
         self.endResetModel()
 
+    def _sort_rows(self, column, order):
+        """Trie self.rows en place selon la colonne demandée."""
+        key, _ = MARCHES_GLOBAUX_COLUMNS[column]
+
+        if key in MARCHES_GLOBAUX_NUMERIC_KEYS:
+            def sort_key(row):
+                try:
+                    return float(row.get(key) or 0.0)
+                except (TypeError, ValueError):
+                    return 0.0
+        else:
+            def sort_key(row):
+                value = row.get(key)
+                return str(value) if value is not None else ""
+
+        self.rows.sort(key=sort_key, reverse=(order == Qt.DescendingOrder))
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        """
+        Trie directement les lignes du modèle source.
+
+        Le proxy n'a ainsi plus à maintenir sa propre table de tri (lessThan
+        appelé O(n log n) fois en Python) : il ne fait plus que filtrer.
+        """
+        if column < 0 or column >= len(MARCHES_GLOBAUX_COLUMNS):
+            return
+
+        self._sort_column = column
+        self._sort_order = order
+
+        self.layoutAboutToBeChanged.emit()
+        # Conserver la sélection : on suit les lignes par identité
+        old_indexes = self.persistentIndexList()
+        old_rows = [self.rows[idx.row()] for idx in old_indexes]
+
+        self._sort_rows(column, order)
+
+        positions = {id(row): i for i, row in enumerate(self.rows)}
+        new_indexes = [
+            self.index(positions[id(row)], idx.column())
+            for row, idx in zip(old_rows, old_indexes)
+        ]
+        self.changePersistentIndexList(old_indexes, new_indexes)
+        self.layoutChanged.emit()
+
     def refresh(self, rows: List[Dict]):
         """Alias de set_data pour compatibilité."""
         self.set_data(rows)
@@ -96,7 +364,7 @@ class MarchesGlobauxTableModel(QAbstractTableModel):
         return len(MARCHES_GLOBAUX_COLUMNS)
 
     def data(self, index, role=Qt.DisplayRole):
-        if not index.isValid():
+        if role not in self._DATA_ROLES or not index.isValid():
             return None
 
         row_data = self.rows[index.row()]
@@ -155,13 +423,13 @@ class MarchesGlobauxTableModel(QAbstractTableModel):
             # Coloration selon le pourcentage consommé
             pourcent = row_data.get("pourcent_consomme", 0)
             if pourcent >= 100:
-                return QBrush(QColor("#ffe0e0"))  # Rouge si dépassé
+                return cached_brush("#ffe0e0")  # Rouge si dépassé
             elif pourcent >= 90:
-                return QBrush(QColor("#fff3cd"))  # Orange si proche
+                return cached_brush("#fff3cd")  # Orange si proche
             elif pourcent >= 50:
-                return QBrush(QColor("#fff9e6"))  # Jaune léger si en cours
+                return cached_brush("#fff9e6")  # Jaune léger si en cours
             else:
-                return QBrush(QColor("#e0ffe0"))  # Vert si peu consommé
+                return cached_brush("#e0ffe0")  # Vert si peu consommé
 
         return None
 
@@ -175,22 +443,19 @@ class MarchesGlobauxTableModel(QAbstractTableModel):
 
 # ============== MODÈLE POUR LE DÉTAIL PAR TRANCHES ==============
 
-class MarchesTranchesTableModel(QAbstractTableModel):
+class MarchesTranchesTableModel(SortKeyTableModel):
     """Modèle pour le détail par tranches (1 ligne = 1 couple marché/tranche)."""
 
-    def __init__(self, rows=None):
-        super().__init__()
-        self.rows = rows or []
+    # Rôles servis par data() ; les autres sont écartés d'emblée
+    _DATA_ROLES = frozenset((Qt.DisplayRole, Qt.ToolTipRole, Qt.TextAlignmentRole, Qt.BackgroundRole, SORT_KEY_ROLE))
 
-    def set_data(self, rows: List[Dict]):
-        """Met à jour les données du modèle."""
-        self.beginResetModel()
-        self.rows = rows
-        self.endResetModel()
-
-    def refresh(self, rows: List[Dict]):
-        """Alias de set_data pour compatibilité."""
-        self.set_data(rows)
+    COLUMNS = MARCHES_TRANCHES_COLUMNS
+    SORT_KEY_CONVERTERS = {
+        "montant_initial_tranche": _float_sort_key,
+        "service_fait_tranche": _float_sort_key,
+        "paye_tranche": _float_sort_key,
+        "pourcent_consomme_tranche": _float_sort_key,
+    }
 
     def rowCount(self, parent=QModelIndex()):
         return len(self.rows)
@@ -199,12 +464,22 @@ class MarchesTranchesTableModel(QAbstractTableModel):
         return len(MARCHES_TRANCHES_COLUMNS)
 
     def data(self, index, role=Qt.DisplayRole):
-        if not index.isValid():
+        if role not in self._DATA_ROLES or not index.isValid():
             return None
 
+        if role == SORT_KEY_ROLE:
+            return self.sort_keys(index.column())[index.row()]
+
         row_data = self.rows[index.row()]
         key, _ = MARCHES_TRANCHES_COLUMNS[index.column()]
 
+        if role == Qt.ToolTipRole:
+            # Texte complet (la cellule est tronquée à l'affichage)
+            if key in ("marche", "tranche_libelle"):
+                value = row_data.get(key)
+                return str(value) if value else None
+            return None
+
         if role == Qt.DisplayRole:
             value = row_data.get(key)
 
@@ -238,13 +513,13 @@ class MarchesTranchesTableModel(QAbstractTableModel):
             # Coloration selon le pourcentage consommé de la tranche
             pourcent = row_data.get("pourcent_consomme_tranche", 0)
             if pourcent >= 100:
-                return QBrush(QColor("#ffe0e0"))  # Rouge si dépassé
+                return cached_brush("#ffe0e0")  # Rouge si dépassé
             elif pourcent >= 90:
-                return QBrush(QColor("#fff3cd"))  # Orange si proche
+                return cached_brush("#fff3cd")  # Orange si proche
             elif pourcent >= 50:
-                return QBrush(QColor("#fff9e6"))  # Jaune léger si en cours
+                return cached_brush("#fff9e6")  # Jaune léger si en cours
             else:
-                return QBrush(QColor("#e0ffe0"))  # Vert si peu consommé
+                return cached_brush("#e0ffe0")  # Vert si peu consommé
 
         return None
 
@@ -259,7 +534,7 @@ class MarchesTranchesTableModel(QAbstractTableModel):
 # ============== PROXY POUR FILTRES ET TRI ==============
 
 class MarchesGlobauxProxy(QSortFilterProxyModel):
-    """Proxy pour le tri et le filtrage de la vision globale."""
+    """Proxy pour le filtrage de la vision globale (le tri est fait par le modèle source)."""
 
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -267,11 +542,11 @@ class MarchesGlobauxProxy(QSortFilterProxyModel):
         self.filter_fournisseur = ""
 
     def setMarcheFilter(self, text):
-        self.filter_marche = text or ""
+        self.filter_marche = (text or "").lower()
         self.invalidateFilter()
 
     def setFournisseurFilter(self, text):
-        self.filter_fournisseur = text or ""
+        self.filter_fournisseur = (text or "").lower()
         self.invalidateFilter()
 
     def filterAcceptsRow(self, source_row, source_parent):
@@ -284,45 +559,25 @@ class MarchesGlobauxProxy(QSortFilterProxyModel):
         # Filtre par marché
         if self.filter_marche:
             marche = str(row.get("marche", "")).lower()
-            if self.filter_marche.lower() not in marche:
+            if self.filter_marche not in marche:
                 return False
 
         # Filtre par fournisseur
         if self.filter_fournisseur:
             fournisseur = str(row.get("fournisseur", "")).lower()
-            if self.filter_fournisseur.lower() not in fournisseur:
+            if self.filter_fournisseur not in fournisseur:
                 return False
 
         return True
 
-    def lessThan(self, left, right):
-        """Tri personnalisé pour chaque colonne."""
+    def sort(self, column, order=Qt.AscendingOrder):
+        """Délègue le tri au modèle source : le proxy ne sert plus qu'au filtrage."""
         src = self.sourceModel()
-        col = left.column()
-        key, _ = MARCHES_GLOBAUX_COLUMNS[col]
-
-        lv = src.rows[left.row()].get(key)
-        rv = src.rows[right.row()].get(key)
-
-        # Gestion des valeurs None
-        if lv is None:
-            lv = ""
-        if rv is None:
-            rv = ""
+        if src is not None:
+            src.sort(column, order)
 
-        # Tri numérique pour les montants et pourcentages
-        if key in ("montant_initial_marche", "service_fait_cumule", "paye_cumule",
-                  "reste_a_realiser", "reste_a_mandater", "pourcent_consomme"):
-            try:
-                lv = float(lv) if lv != "" else 0.0
-                rv = float(rv) if rv != "" else 0.0
-            except:
-                pass
-
-        return lv < rv
 
-
-class MarchesTranchesProxy(QSortFilterProxyModel):
+class MarchesTranchesProxy(SortKeyProxy):
     """Proxy pour le tri et le filtrage de la vision détaillée."""
 
     def __init__(self, parent=None):
@@ -330,7 +585,7 @@ class MarchesTranchesProxy(QSortFilterProxyModel):
         self.filter_marche = ""
 
     def setMarcheFilter(self, text):
-        self.filter_marche = text or ""
+        self.filter_marche = (text or "").lower()
         self.invalidateFilter()
 
     def filterAcceptsRow(self, source_row, source_parent):
@@ -343,65 +598,33 @@ class MarchesTranchesProxy(QSortFilterProxyModel):
         # Filtre par marché
         if self.filter_marche:
             marche = str(row.get("marche", "")).lower()
-            if marche != self.filter_marche.lower():
+            if marche != self.filter_marche:
                 return False
 
         return True
 
-    def lessThan(self, left, right):
-        """Tri personnalisé pour chaque colonne."""
-        src = self.sourceModel()
-        col = left.column()
-        key, _ = MARCHES_TRANCHES_COLUMNS[col]
-
-        lv = src.rows[left.row()].get(key)
-        rv = src.rows[right.row()].get(key)
-
-        # Gestion des valeurs None
-        if lv is None:
-            lv = ""
-        if rv is None:
-            rv = ""
-
-        # Tri numérique pour les montants et pourcentages
-        if key in ("montant_initial_tranche", "service_fait_tranche", "paye_tranche",
-                  "pourcent_consomme_tranche"):
-            try:
-                lv = float(lv) if lv != "" else 0.0
-                rv = float(rv) if rv != "" else 0.0
-            except:
-                pass
-
-        # Tri spécial pour les tranches (TF < TO1 < TO2...)
-        if key == "tranche":
-            # Gérer le tri numérique des tranches
-            try:
-                lv = float(lv) if lv != "" else -1
-                rv = float(rv) if rv != "" else -1
-            except:
-                pass
-
-        return lv < rv
-
 
 # ============== MODÈLE POUR LA VISION OPÉRATIONS ==============
 
-class OperationsTableModel(QAbstractTableModel):
+class OperationsTableModel(SortKeyTableModel):
     """Modèle pour la vision par opérations (1 ligne = 1 opération regroupant plusieurs lots)."""
 
-    def __init__(self, rows=None):
-        super().__init__()
-        self.rows = rows or []
+    # Rôles servis par data() ; les autres sont écartés d'emblée
+    _DATA_ROLES = frozenset((Qt.DisplayRole, Qt.ToolTipRole, Qt.TextAlignmentRole, STATUS_CODE_ROLE, SORT_KEY_ROLE))
 
-    def set_data(self, rows: List[Dict]):
-        """Met à jour les données du modèle."""
-        self.beginResetModel()
-        self.rows = rows
-        self.endResetModel()
+    COLUMNS = OPERATIONS_COLUMNS
+    SORT_KEY_CONVERTERS = {
+        "nb_lots": _int_sort_key,
+        "montant_initial_total": _float_sort_key,
+        "service_fait_total": _float_sort_key,
+        "paye_total": _float_sort_key,
+        "reste_a_realiser": _float_sort_key,
+        "reste_a_mandater": _float_sort_key,
+        "pourcent_consomme": _float_sort_key,
+    }
 
-    def refresh(self, rows: List[Dict]):
-        """Alias de set_data pour compatibilité."""
-        self.set_data(rows)
+    def _compute_status_code(self, row_data):
+        return _consommation_code(row_data.get("pourcent_consomme", 0))
 
     def rowCount(self, parent=QModelIndex()):
         return len(self.rows)
@@ -410,9 +633,12 @@ class OperationsTableModel(QAbstractTableModel):
         return len(OPERATIONS_COLUMNS)
 
     def data(self, index, role=Qt.DisplayRole):
-        if not index.isValid():
+        if role not in self._DATA_ROLES or not index.isValid():
             return None
 
+        if role == SORT_KEY_ROLE:
+            return self.sort_keys(index.column())[index.row()]
+
         row_data = self.rows[index.row()]
         key, _ = OPERATIONS_COLUMNS[index.column()]
 
@@ -462,6 +688,10 @@ class OperationsTableModel(QAbstractTableModel):
                 marches = row_data.get("marches", [])
                 if isinstance(marches, list) and len(marches) > 1:
                     return "Lots: " + ", ".join(marches)
+            # Texte complet (les lignes ont une hauteur fixe, le texte long est tronqué)
+            elif key in ("libelle", "fournisseur"):
+                value = row_data.get(key)
+                return str(value) if value else None
 
         if role == Qt.TextAlignmentRole:
             # Alignement à droite pour les montants et pourcentages
@@ -472,17 +702,9 @@ class OperationsTableModel(QAbstractTableModel):
                 return Qt.AlignCenter | Qt.AlignVCenter
             return Qt.AlignLeft | Qt.AlignVCenter
 
-        if role == Qt.BackgroundRole:
-            # Coloration selon le pourcentage consommé
-            pourcent = row_data.get("pourcent_consomme", 0)
-            if pourcent >= 100:
-                return QBrush(QColor("#ffe0e0"))  # Rouge si dépassé
-            elif pourcent >= 90:
-                return QBrush(QColor("#fff3cd"))  # Orange si proche
-            elif pourcent >= 50:
-                return QBrush(QColor("#fff9e6"))  # Jaune léger si en cours
-            else:
-                return QBrush(QColor("#e0ffe0"))  # Vert si peu consommé
+        if role == STATUS_CODE_ROLE:
+            # Coloration selon le pourcentage consommé (peinte par StatusDelegate)
+            return self.row_status_code(index.row())
 
         return None
 
@@ -496,22 +718,21 @@ class OperationsTableModel(QAbstractTableModel):
 
 # ============== MODÈLE POUR L'HISTORIQUE DES FACTURES ==============
 
-class HistoriqueTableModel(QAbstractTableModel):
+class HistoriqueTableModel(SortKeyTableModel):
     """Modèle pour l'historique des factures et paiements."""
 
-    def __init__(self, rows=None):
-        super().__init__()
-        self.rows = rows or []
+    # Rôles servis par data() ; les autres sont écartés d'emblée
+    _DATA_ROLES = frozenset((Qt.DisplayRole, Qt.ToolTipRole, Qt.TextAlignmentRole, STATUS_CODE_ROLE, SORT_KEY_ROLE))
 
-    def set_data(self, rows: List[Dict]):
-        """Met à jour les données du modèle."""
-        self.beginResetModel()
-        self.rows = rows
-        self.endResetModel()
+    COLUMNS = HISTORIQUE_COLUMNS
+    SORT_KEY_CONVERTERS = {
+        "date_sf": _date_sort_key,
+        "montant_sf": _float_sort_key,
+        "montant_ttc": _float_sort_key,
+    }
 
-    def refresh(self, rows: List[Dict]):
-        """Alias de set_data pour compatibilité."""
-        self.set_data(rows)
+    def _compute_status_code(self, row_data):
+        return _historique_status_code(row_data.get("statut", ""))
 
     def rowCount(self, parent=QModelIndex()):
         return len(self.rows)
@@ -520,12 +741,22 @@ class HistoriqueTableModel(QAbstractTableModel):
         return len(HISTORIQUE_COLUMNS)
 
     def data(self, index, role=Qt.DisplayRole):
-        if not index.isValid():
+        if role not in self._DATA_ROLES or not index.isValid():
             return None
 
+        if role == SORT_KEY_ROLE:
+            return self.sort_keys(index.column())[index.row()]
+
         row_data = self.rows[index.row()]
         key, _ = HISTORIQUE_COLUMNS[index.column()]
 
+        if role == Qt.ToolTipRole:
+            # Texte complet (les lignes ont une hauteur fixe, le texte long est tronqué)
+            if key in ("fournisseur", "libelle"):
+                value = row_data.get(key)
+                return str(value) if value else None
+            return None
+
         if role == Qt.DisplayRole:
             value = row_data.get(key)
 
@@ -566,17 +797,9 @@ class HistoriqueTableModel(QAbstractTableModel):
                 return Qt.AlignCenter | Qt.AlignVCenter
             return Qt.AlignLeft | Qt.AlignVCenter
 
-        if role == Qt.BackgroundRole:
-            # Coloration selon le statut
-            statut = row_data.get("statut", "")
-            if "✅" in statut or "Payé" in statut:
-                return QBrush(QColor("#d4edda"))  # Vert pour payé
-            elif "📋" in statut or "Facturée" in statut:
-                return QBrush(QColor("#fff3cd"))  # Orange pour facturé
-            elif "⏳" in statut or "Service fait" in statut:
-                return QBrush(QColor("#d1ecf1"))  # Bleu pour service fait
-            elif "⚠️" in statut or "attente" in statut:
-                return QBrush(QColor("#f8d7da"))  # Rouge pour attente
+        if role == STATUS_CODE_ROLE:
+            # Coloration selon le statut (peinte par StatusDelegate)
+            return self.row_status_code(index.row())
 
         return None
 
@@ -590,7 +813,7 @@ class HistoriqueTableModel(QAbstractTableModel):
 
 # ============== PROXY POUR OPÉRATIONS ==============
 
-class OperationsProxy(QSortFilterProxyModel):
+class OperationsProxy(SortKeyProxy):
     """Proxy pour le tri et le filtrage de la vision opérations."""
 
     def __init__(self, parent=None):
@@ -598,7 +821,7 @@ class OperationsProxy(QSortFilterProxyModel):
         self.filter_operation = ""
 
     def setOperationFilter(self, text):
-        self.filter_operation = text or ""
+        self.filter_operation = (text or "").lower()
         self.invalidateFilter()
 
     def filterAcceptsRow(self, source_row, source_parent):
@@ -611,49 +834,15 @@ class OperationsProxy(QSortFilterProxyModel):
         # Filtre par opération
         if self.filter_operation:
             operation = str(row.get("operation", "")).lower()
-            if self.filter_operation.lower() not in operation:
+            if self.filter_operation not in operation:
                 return False
 
         return True
 
-    def lessThan(self, left, right):
-        """Tri personnalisé pour chaque colonne."""
-        src = self.sourceModel()
-        col = left.column()
-        key, _ = OPERATIONS_COLUMNS[col]
-
-        lv = src.rows[left.row()].get(key)
-        rv = src.rows[right.row()].get(key)
-
-        # Gestion des valeurs None
-        if lv is None:
-            lv = ""
-        if rv is None:
-            rv = ""
-
-        # Tri numérique pour les montants et pourcentages
-        if key in ("montant_initial_total", "service_fait_total", "paye_total",
-                  "reste_a_realiser", "reste_a_mandater", "pourcent_consomme"):
-            try:
-                lv = float(lv) if lv != "" else 0.0
-                rv = float(rv) if rv != "" else 0.0
-            except:
-                pass
-
-        # Tri numérique pour nb_lots
-        if key == "nb_lots":
-            try:
-                lv = int(lv) if lv != "" else 0
-                rv = int(rv) if rv != "" else 0
-            except:
-                pass
-
-        return lv < rv
-
 
 # ============== PROXY POUR HISTORIQUE ==============
 
-class HistoriqueProxy(QSortFilterProxyModel):
+class HistoriqueProxy(SortKeyProxy):
     """Proxy pour le tri et le filtrage de l'historique."""
 
     def __init__(self, parent=None):
@@ -661,7 +850,7 @@ class HistoriqueProxy(QSortFilterProxyModel):
         self.filter_marche = ""
 
     def setMarcheFilter(self, text):
-        self.filter_marche = text or ""
+        self.filter_marche = (text or "").lower()
         self.invalidateFilter()
 
     def filterAcceptsRow(self, source_row, source_parent):
@@ -674,52 +863,7 @@ class HistoriqueProxy(QSortFilterProxyModel):
         # Filtre par marché
         if self.filter_marche:
             marche = str(row.get("marche", "")).lower()
-            if self.filter_marche.lower() not in marche:
+            if self.filter_marche not in marche:
                 return False
 
         return True
-
-    def lessThan(self, left, right):
-        """Tri personnalisé pour chaque colonne."""
-        src = self.sourceModel()
-        col = left.column()
-        key, _ = HISTORIQUE_COLUMNS[col]
-
-        lv = src.rows[left.row()].get(key)
-        rv = src.rows[right.row()].get(key)
-
-        # Gestion des valeurs None
-        if lv is None:
-            lv = ""
-        if rv is None:
-            rv = ""
-
-        # Tri numérique pour les montants
-        if key in ("montant_sf", "montant_ttc"):
-            try:
-                lv = float(lv) if lv != "" else 0.0
-                rv = float(rv) if rv != "" else 0.0
-            except:
-                pass
-
-        # Tri par date
-        if key == "date_sf":
-            try:
-                if isinstance(lv, str):
-                    for fmt in ["%Y-%m-%d", "%d/%m/%Y"]:
-                        try:
-                            lv = datetime.strptime(lv, fmt)
-                            break
-                        except:
-                            pass
-                if isinstance(rv, str):
-                    for fmt in ["%Y-%m-%d", "%d/%m/%Y"]:
-                        try:
-                            rv = datetime.strptime(rv, fmt)
-                            break
-                        except:
-                            pass
-            except:
-                pass
-
-        return lv < rv
@@ -1,18 +1,33 @@
 
 import sys
 import os
+import copy
+import heapq
+import multiprocessing
 import sqlite3
+import subprocess
+from collections import OrderedDict
+from itertools import chain, islice
+from operator import itemgetter
+from contextlib import contextmanager
+from functools import lru_cache, partial
+from enum import IntEnum
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime, date, timedelta
 
+import numpy as np
 import pandas as pd
 
 # Import des modules pour le suivi des marchés
 from marches_module import MarchesAnalyzer
+from marches_sync import MarchesSync
 from marches_models import (
     MarchesGlobauxTableModel, MarchesTranchesTableModel,
     MarchesGlobauxProxy, MarchesTranchesProxy,
     OperationsTableModel, OperationsProxy,
-    HistoriqueTableModel, HistoriqueProxy
+    HistoriqueTableModel, HistoriqueProxy,
+    StatusDelegate, WrapStatusDelegate, CONSOMMATION_COLORS, HISTORIQUE_STATUS_COLORS,
+    cached_brush,
 )
 from marches_dialogs import EditMarcheDialog
 
@@ -21,18 +36,21 @@ from PyQt5.QtCore import (
     QAbstractTableModel,
     QModelIndex,
     QSortFilterProxyModel,
+    QSignalBlocker,
     QTimer,
     QTime,
     QEvent,
+    QObject,
+    QRunnable,
+    QThreadPool,
+    pyqtSignal,
 )
-from PyQt5.QtGui import QIcon, QBrush, QColor, QFont, QStandardItemModel, QStandardItem
+from PyQt5.QtGui import QIcon, QFont, QStandardItemModel, QStandardItem
 from PyQt5.QtWidgets import (
     QApplication,
     QMainWindow,
     QFileDialog,
     QTableView,
-    QTableWidget,
-    QTableWidgetItem,
     QTabWidget,
     QToolBar,
     QToolButton,
@@ -55,10 +73,21 @@ from PyQt5.QtWidgets import (
     QVBoxLayout,
     QLineEdit,
     QCheckBox,    QTimeEdit,
+    QProgressDialog,
  )
 
 
 DB_NAME = "suivi_commandes.db"
+# Traces [DEBUG] en console, activées par SUIVI_DEBUG=1 (désactivées par défaut)
+DEBUG = os.environ.get("SUIVI_DEBUG") == "1"
+# Limite historique de SQLite sur le nombre de paramètres d'une requête (SQLITE_MAX_VARIABLE_NUMBER)
+SQLITE_MAX_PARAMS = 999
+# Nombre de rappels replanifiés par itération de la boucle d'événements : un seul
+# UPDATE ... WHERE id IN (...) par lot, aussi grand que le permet la limite de
+# paramètres (les deux autres paramètres sont la fréquence et la date)
+REMINDER_CHUNK_SIZE = SQLITE_MAX_PARAMS - 2
+# Nombre de décisions d'import mémorisées (clé : chemin, taille, date de modification)
+SHOULD_IMPORT_CACHE_SIZE = 4096
 
 
 # ============== FONCTION UTILITAIRE WORD WRAP ==============
@@ -174,22 +203,46 @@ class CheckableComboBox(QComboBox):
             if item:
                 item.setCheckState(Qt.Unchecked)
     
-    def addItem(self, text):
-        """Ajoute un item avec checkbox."""
+    @staticmethod
+    def _make_item(text):
         item = QStandardItem(text)
         item.setFlags(Qt.ItemIsUserCheckable | Qt.ItemIsEnabled)
         item.setCheckState(Qt.Unchecked)
-        self._model.appendRow(item)
+        return item
+
+    def addItem(self, text):
+        """Ajoute un item avec checkbox."""
+        self._model.appendRow(self._make_item(text))
     
     def addItems(self, texts):
-        """Ajoute plusieurs items avec checkboxes."""
-        for text in texts:
-            self.addItem(text)
+        """Ajoute plusieurs items avec checkboxes en une seule insertion dans le modèle."""
+        items = [self._make_item(text) for text in texts]
+        if items:
+            self._model.invisibleRootItem().appendRows(items)
     
     def clear(self):
         """Vide le combobox et recrée l'item [Tous]."""
         self._model.clear()
         self._add_all_item()
+
+    def set_items(self, texts):
+        """
+        Remplace les items par `texts`, seulement si la liste a changé.
+
+        Les items encore présents restent cochés.
+        """
+        existing = [self._model.item(i, 0).text() for i in range(1, self._model.rowCount())]
+        if existing == texts:
+            return
+        checked = set(self.checked_items())
+        self.clear()
+        self.addItems(texts)
+        if checked:
+            for i in range(1, self._model.rowCount()):
+                item = self._model.item(i, 0)
+                if item.text() in checked:
+                    item.setCheckState(Qt.Checked)
+            self._update_all_item()
     
     def currentText(self):
         """Retourne le texte des items cochés."""
@@ -206,6 +259,239 @@ def today_iso():
     return date.today().isoformat()
 
 
+@lru_cache(maxsize=2048)
+def format_iso_date(value):
+    """Date ISO (date seule ou date avec heure) au format JJ/MM/AAAA[ HH:MM] ; valeur brute si illisible."""
+    if not value:
+        return ""
+    # Découpage direct de "AAAA-MM-JJ[ HH:MM]" : ni strptime ni objet datetime par cellule
+    if (isinstance(value, str) and len(value) in (10, 16)
+            and value[4] == "-" and value[7] == "-"
+            and value[:4].isdigit() and value[5:7].isdigit() and value[8:10].isdigit()):
+        fr = f"{value[8:10]}/{value[5:7]}/{value[:4]}"
+        if len(value) == 10:
+            return fr
+        if value[10] == " " and value[13] == ":" and value[11:13].isdigit() and value[14:16].isdigit():
+            return f"{fr} {value[11:16]}"
+    return value
+
+
+# Montant affiché ("1 234,56 €") -> texte lisible par float() : une seule passe de translate
+_MONTANT_TRANS = str.maketrans({",": ".", " ": None, "\xa0": None, "\u202f": None, "€": None})
+
+
+# Repérage des colonnes de la feuille Statistiques d'après l'en-tête (en minuscules) :
+# (clé, sous-chaînes toutes requises, sous-chaînes exclues) ; la première règle vérifiée l'emporte.
+_EXPORT_HEADER_RULES = (
+    ("montant_ttc", ("montant", "ttc"), ()),
+    ("montant_facture", ("montant", "factur"), ()),
+    ("reste_a_facturer", ("reste", "facturer"), ()),
+    ("fournisseur", ("fournisseur",), ()),
+    ("statut_facturation", ("statut", "facturation"), ()),
+    ("statut", ("statut",), ("facturation",)),
+    ("section", ("section",), ()),
+    ("exercice", ("exercice",), ()),
+    ("marche", ("marché",), ()),
+    ("marche", ("marche",), ()),
+)
+
+
+@lru_cache(maxsize=32)
+def export_column_indices(headers):
+    """
+    Indices des colonnes utiles aux statistiques pour un tuple d'en-têtes
+    (clé -> indice ; pour une même clé, le dernier en-tête reconnu l'emporte).
+    """
+    col_indices = {}
+    for idx, header in enumerate(headers):
+        header_lower = header.lower()
+        for key, required, excluded in _EXPORT_HEADER_RULES:
+            if (all(part in header_lower for part in required)
+                    and not any(part in header_lower for part in excluded)):
+                col_indices[key] = idx
+                break
+    return col_indices
+
+
+# Regroupements de la feuille Statistiques : (clé de colonne, libellé des valeurs vides).
+# Sans libellé, la valeur est prise telle quelle (non nettoyée).
+_EXPORT_STATS_GROUPS = (
+    ("statut_facturation", None),
+    ("fournisseur", "(Vide)"),
+    ("section", "(Non renseigné)"),
+    ("exercice", "(Non renseigné)"),
+    ("statut", "(Non renseigné)"),
+)
+
+
+def aggregate_export_stats(data, col_indices):
+    """
+    Totaux et regroupements de la feuille Statistiques d'un export.
+
+    `data` : lignes exportées (textes affichés) ; `col_indices` : clé -> indice de colonne.
+    Les montants sont convertis et sommés par colonne entière (pandas) plutôt que
+    ligne à ligne en Python. Seules les colonnes utiles sont extraites des lignes :
+    le tableau intermédiaire ne duplique pas tout l'export.
+    Retourne (totaux, groupes) :
+    - totaux : {'montant_ttc', 'montant_facture', 'reste_a_facturer'} -> somme ;
+    - groupes : clé présente dans `col_indices` -> {valeur: [nombre, montant TTC,
+      part du montant TTC total]}, valeurs dans leur ordre de première apparition.
+    """
+    width = max(map(len, data), default=0)
+    shortest = min(map(len, data), default=0)
+    keys = ("montant_ttc", "montant_facture", "reste_a_facturer") + tuple(
+        key for key, _ in _EXPORT_STATS_GROUPS
+    )
+    needed = {col_indices[key] for key in keys if key in col_indices}
+
+    def column(idx):
+        # Bornes vérifiées une fois pour tout l'export : extraction directe (map en C)
+        # si toutes les lignes couvrent la colonne, complétée par None sinon
+        if idx < shortest:
+            return list(map(itemgetter(idx), data))
+        return [row[idx] if idx < len(row) else None for row in data]
+
+    df = pd.DataFrame(
+        {idx: column(idx) for idx in sorted(needed) if idx < width},
+        index=pd.RangeIndex(len(data)),
+    )
+
+    def montants(key):
+        idx = col_indices.get(key)
+        if idx is None or idx not in df.columns:
+            return pd.Series(0.0, index=df.index)
+        text = df[idx].astype(str).str.translate(_MONTANT_TRANS)
+        return pd.to_numeric(text, errors="coerce").fillna(0.0)
+
+    ttc = montants("montant_ttc")
+    totals = {
+        "montant_ttc": float(ttc.sum()),
+        "montant_facture": float(montants("montant_facture").sum()),
+        "reste_a_facturer": float(montants("reste_a_facturer").sum()),
+    }
+
+    # Regroupement en colonnes : chaque valeur reçoit un code entier (ordre de
+    # première apparition), puis nombres et montants sont réduits par bincount
+    ttc_values = ttc.to_numpy(dtype=float)
+    total_ttc = totals["montant_ttc"]
+    groups = {}
+    for key, empty in _EXPORT_STATS_GROUPS:
+        idx = col_indices.get(key)
+        if idx is None:
+            continue
+        groups[key] = {}
+        if idx not in df.columns:
+            continue
+        values = df[idx].astype(str)
+        if empty is not None:
+            values = values.str.strip().replace("", empty)
+        codes, uniques = pd.factorize(values, sort=False)
+        counts = np.bincount(codes, minlength=len(uniques))
+        sums = np.bincount(codes, weights=ttc_values, minlength=len(uniques))
+        parts = sums / total_ttc if total_ttc > 0 else np.zeros_like(sums)
+        groups[key] = {
+            value: [int(count), float(montant), float(part)]
+            for value, count, montant, part in zip(uniques, counts, sums, parts)
+        }
+    return totals, groups
+
+
+@lru_cache(maxsize=1)
+def pdf_paragraph_styles():
+    """
+    Styles de paragraphe de l'export PDF, construits une seule fois (reportlab
+    importé à la première demande) puis partagés par tous les exports.
+    """
+    from reportlab.lib import colors
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.lib.enums import TA_CENTER, TA_LEFT
+
+    styles = getSampleStyleSheet()
+    return {
+        "entreprise": ParagraphStyle(
+            'Entreprise',
+            parent=styles['Normal'],
+            fontSize=12,
+            alignment=TA_CENTER,
+            fontName='Helvetica-Bold'
+        ),
+        "adresse": ParagraphStyle(
+            'Adresse',
+            parent=styles['Normal'],
+            fontSize=9,
+            alignment=TA_CENTER
+        ),
+        "titre": ParagraphStyle(
+            'Titre',
+            parent=styles['Heading1'],
+            fontSize=16,
+            alignment=TA_CENTER,
+            fontName='Helvetica-Bold',
+            textColor=colors.HexColor("#0078d4")
+        ),
+        "date": ParagraphStyle(
+            'Date',
+            parent=styles['Normal'],
+            fontSize=9,
+            alignment=TA_CENTER,
+            textColor=colors.grey
+        ),
+        "filtres": ParagraphStyle(
+            'Filtres',
+            parent=styles['Normal'],
+            fontSize=8,
+            alignment=TA_LEFT,
+            textColor=colors.grey
+        ),
+        # Cellules avec word wrap
+        "cell": ParagraphStyle(
+            'CellStyle',
+            parent=styles['Normal'],
+            fontSize=6,
+            leading=7,
+            alignment=TA_LEFT
+        ),
+        "footer": ParagraphStyle(
+            'Footer',
+            parent=styles['Normal'],
+            fontSize=7,
+            alignment=TA_CENTER,
+            textColor=colors.grey
+        ),
+    }
+
+
+@lru_cache(maxsize=1)
+def excel_export_styles():
+    """
+    Polices, remplissages, alignements et bordures de l'export Excel, construits
+    une seule fois (openpyxl importé à la première demande). Les objets de style
+    openpyxl sont immuables : les mêmes instances servent à tous les classeurs.
+    """
+    from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
+
+    thin = Side(style='thin')
+    grey = Side(style='thin', color="CCCCCC")
+    return {
+        # Remplissages unis, par couleur
+        "fills": {
+            color: PatternFill(start_color=color, end_color=color, fill_type="solid")
+            for color in ("0078D4", "F8F9FA", "E7F3FF", "E0FFE0", "FFF3CD", "FFE0E0")
+        },
+        "header_font": Font(bold=True, color="FFFFFF"),
+        "header_alignment": Alignment(horizontal='center', vertical='center', wrap_text=True),
+        "header_border": Border(left=thin, right=thin, top=thin, bottom=thin),
+        "data_alignment": Alignment(horizontal='left', vertical='center', wrap_text=True),
+        "data_border": Border(left=grey, right=grey, top=grey, bottom=grey),
+        "title_font": Font(size=14, bold=True, color="0078D4"),
+        "block_font": Font(size=12, bold=True, color="FFFFFF"),
+        "bold_font": Font(bold=True),
+        # Montants facturés / restant dus de la synthèse financière
+        "facture_font": Font(color="28A745"),
+        "reste_font": Font(color="DC3545", bold=True),
+    }
+
+
 def parse_date_safe(value):
     if value is None or value == "":
         return None
@@ -224,6 +510,226 @@ def parse_date_safe(value):
         return None
 
 
+def parse_date_series(series):
+    """Version colonne de parse_date_safe : dates ISO (str) ou None."""
+    if pd.api.types.is_datetime64_any_dtype(series):
+        iso = series.dt.strftime("%Y-%m-%d")
+        return iso.astype(object).where(series.notna(), None)
+    # Colonne texte/mixte : on garde l'analyse multi-formats valeur par valeur
+    return series.map(parse_date_safe).astype(object)
+
+
+def read_excel_columns(filepath, wanted, text_cols=()):
+    """
+    Lit dans un DataFrame les seules colonnes `wanted` de la première feuille.
+
+    Les .xlsx sont parcourus ligne à ligne en lecture seule (openpyxl,
+    read_only/values_only) : seules les cellules des colonnes retenues sont
+    conservées, sans matérialiser la feuille entière. Les autres formats (.xls)
+    passent par pd.read_excel. Les colonnes `text_cols` sont lues en texte.
+    """
+    wanted = set(wanted)
+    if not filepath.lower().endswith(".xlsx"):
+        return pd.read_excel(
+            filepath,
+            usecols=lambda c: c in wanted,
+            dtype={c: str for c in text_cols},
+        )
+
+    from openpyxl import load_workbook
+
+    wb = load_workbook(filepath, read_only=True, data_only=True)
+    try:
+        rows = wb.worksheets[0].iter_rows(values_only=True)
+        headers = next(rows, ())
+        # Première occurrence de chaque en-tête retenu
+        col_index = {}
+        for i, header in enumerate(headers):
+            if header in wanted and header not in col_index:
+                col_index[header] = i
+        columns = {name: [] for name in col_index}
+        positions = list(col_index.items())
+        for row in rows:
+            values = [row[i] if i < len(row) else None for _, i in positions]
+            if all(v is None for v in values):
+                continue
+            for (name, _), value in zip(positions, values):
+                columns[name].append(value)
+    finally:
+        wb.close()
+
+    df = pd.DataFrame(columns)
+    for col in text_cols:
+        if col in df.columns:
+            df[col] = df[col].map(lambda v: v if v is None else str(v))
+    return df
+
+
+def text_column(df, col):
+    """Colonne `col` en texte ("" pour les vides), ou "" partout si `col` est None."""
+    if col is None:
+        return pd.Series("", index=df.index, dtype=object)
+    return df[col].fillna("").astype(str)
+
+
+def number_column(df, col):
+    """Colonne `col` en float (None pour les vides), ou None partout si `col` est None."""
+    if col is None:
+        return pd.Series(None, index=df.index, dtype=object)
+    values = pd.to_numeric(df[col], errors="coerce").astype(float)
+    return values.astype(object).where(values.notna(), None)
+
+
+def parse_commandes_file(filepath):
+    """
+    Lit un fichier de commandes et renvoie les lignes prêtes pour
+    Database.upsert_commandes_bulk (une par couple Exercice / N° Commande).
+
+    Fonction autonome (ni Qt ni base) : exécutable dans un processus de
+    travail. Lève ValueError si des colonnes attendues manquent.
+    """
+    filename = os.path.basename(filepath)
+
+    expected = [
+        "Exercice", "N° Commande", "Fournisseur", "Libellé",
+        "Date de la commande", "Marché", "Service émetteur", "Montant TTC",
+        "Section", "Article par fonction", "Article par nature"
+    ]
+    text_cols = ["Fournisseur", "Libellé", "Marché", "Service émetteur",
+                 "Section", "Article par fonction", "Article par nature"]
+
+    # Seules les colonnes utilisées sont lues ; identifiants et libellés en texte
+    df = read_excel_columns(filepath, expected, ["Exercice", "N° Commande"] + text_cols)
+
+    missing = [c for c in expected if c not in df.columns]
+    if missing:
+        raise ValueError("Colonnes manquantes: " + ", ".join(missing))
+
+    # Grouper par (Exercice, N° Commande)
+    grouped = df.groupby(["Exercice", "N° Commande"], as_index=False).agg({
+        "Fournisseur": "first",
+        "Libellé": "first",
+        "Date de la commande": "first",
+        "Marché": "first",
+        "Service émetteur": "first",
+        "Montant TTC": "sum",
+        "Section": "first",
+        "Article par fonction": "first",
+        "Article par nature": "first"
+    })
+
+    # Conversion colonne par colonne
+    for col in text_cols:
+        grouped[col] = grouped[col].fillna("").astype(str)
+    montants = pd.to_numeric(grouped["Montant TTC"], errors="coerce").astype(float)
+    montants = montants.astype(object).where(montants.notna(), None)
+
+    return list(zip(
+        grouped["Exercice"].astype(str),
+        grouped["N° Commande"].astype(str),
+        grouped["Fournisseur"],
+        grouped["Libellé"],
+        parse_date_series(grouped["Date de la commande"]),
+        grouped["Marché"],
+        grouped["Service émetteur"],
+        montants,
+        grouped["Section"],
+        grouped["Article par fonction"],
+        grouped["Article par nature"],
+        [filename] * len(grouped),
+    ))
+
+
+def parse_factures_file(filepath):
+    """
+    Lit un fichier de factures et renvoie les lignes prêtes pour
+    Database.insert_factures_bulk.
+
+    Fonction autonome (ni Qt ni base) : exécutable dans un processus de
+    travail. Lève ValueError si des colonnes obligatoires manquent.
+    """
+    filename = os.path.basename(filepath)
+
+    required_cols = {
+        "Exercice", "Code mouvement", "Nom tiers",
+        "Libellé mouvement", "Date service fait", "Montant service fait"
+    }
+    # Colonnes optionnelles, par ordre de préférence
+    facture_cols = ["N° pièce", "Facture", "N° facture"]
+    montant_ttc_cols = ["Montant TTC", "Montant TTC mouvement"]
+    marche_cols = ["Marché", "March\u00e9"]
+    used_cols = required_cols.union(
+        facture_cols, montant_ttc_cols, marche_cols,
+        ["Tranche", "Mandat", "Montant initial"],
+    )
+    text_cols = ["Code mouvement", "Nom tiers", "Libellé mouvement", "Tranche", "Mandat"]
+
+    # Seules les colonnes utilisées sont lues ; identifiants et libellés en texte
+    df = read_excel_columns(filepath, used_cols, text_cols + facture_cols + marche_cols)
+
+    if DEBUG:
+        print(f"[DEBUG] {len(df.columns)} colonnes utiles trouvées dans {filename}")
+
+    missing = required_cols - set(df.columns)
+    if missing:
+        raise ValueError("Colonnes manquantes: " + ", ".join(missing))
+
+    # Trouver la colonne N° de facture (optionnelle)
+    col_facture = None
+    for col in facture_cols:
+        if col in df.columns:
+            col_facture = col
+            if DEBUG:
+                print(f"[DEBUG] Colonne facture trouvée: '{col}'")
+            break
+
+    # Trouver la colonne Montant TTC
+    col_montant_ttc = None
+    for col in montant_ttc_cols:
+        if col in df.columns:
+            col_montant_ttc = col
+            if DEBUG:
+                print(f"[DEBUG] Colonne montant TTC trouvée: '{col}'")
+            break
+
+    # Trouver la colonne Marché
+    col_marche = None
+    for col in marche_cols:
+        if col in df.columns:
+            col_marche = col
+            if DEBUG:
+                print(f"[DEBUG] Colonne marché trouvée: '{col}'")
+            break
+
+    if col_marche is None:
+        print(f"[WARNING] Aucune colonne Marché trouvée dans {filename}")
+
+    # Trouver les colonnes additionnelles pour l'analyse des marchés
+    col_tranche = "Tranche" if "Tranche" in df.columns else None
+    col_mandat = "Mandat" if "Mandat" in df.columns else None
+    col_montant_initial = "Montant initial" if "Montant initial" in df.columns else None
+
+    # Conversion colonne par colonne
+    exercices = df["Exercice"]
+    exercice = exercices.astype("Int64").astype(str).where(exercices.notna(), "")
+    num_facture = text_column(df, col_facture)
+    # IMPORTANT: Le N° de commande est dans "Code mouvement", pas dans "Commande" (qui est vide)
+    code_mouvement = text_column(df, "Code mouvement")
+    date_facture = parse_date_series(df["Date service fait"])
+    montant_service_fait = pd.to_numeric(df["Montant service fait"], errors="coerce").fillna(0.0).astype(float)
+
+    statuts = facture_status_series(num_facture, montant_service_fait, date_facture)
+
+    return list(zip(
+        exercice, num_facture, code_mouvement,
+        text_column(df, "Nom tiers"), text_column(df, "Libellé mouvement"), date_facture,
+        number_column(df, col_montant_ttc), montant_service_fait, text_column(df, col_marche),
+        statuts,
+        text_column(df, col_tranche), code_mouvement,
+        text_column(df, col_mandat), number_column(df, col_montant_initial),
+    ))
+
+
 def smart_word_wrap(text, max_width=40):
     """Découpe intelligente du texte en respectant les mots."""
     if not text or len(text) <= max_width:
@@ -290,12 +796,60 @@ def compute_facture_status(num_facture, montant_service_fait, date_facture):
         return "A vérifier"
 
 
+_EMPTY_MARKERS = ("", "none", "nan", "nat", "na")
+
+
+def facture_status_series(num_facture, montant_service_fait, date_facture):
+    """
+    Version colonne de compute_facture_status (mêmes règles, même ordre).
+
+    `num_facture` : textes, `montant_service_fait` : floats, `date_facture` :
+    dates ISO ou None. Retourne un tableau de statuts.
+    """
+    has_facture = ~num_facture.str.strip().str.lower().isin(_EMPTY_MARKERS)
+    has_service_fait = montant_service_fait > 0.01  # Tolérance pour les arrondis
+    dates = date_facture.fillna("").astype(str).str.strip().str.lower()
+    has_date = ~dates.isin(_EMPTY_MARKERS)
+    return np.select(
+        [has_facture & has_service_fait, has_service_fait, has_date],
+        ["Facturée", "Service fait", "En attente de paiement"],
+        default="A vérifier",
+    )
+
+
 class Database:
-    def __init__(self, path):
+    def __init__(self, path, init_schema=True, check_same_thread=True):
         self.path = path
-        self.conn = sqlite3.connect(self.path)
+        self.conn = sqlite3.connect(self.path, check_same_thread=check_same_thread)
         self.conn.row_factory = sqlite3.Row
-        self._init_schema()
+        # Journal WAL : les lectures des onglets ne sont plus bloquées par un import
+        # en cours, et un commit n'est plus qu'un ajout au journal (pas de fsync).
+        # Le cache de pages est limité à 64 Mo, les tables temporaires restent en mémoire.
+        for pragma in (
+            "journal_mode=WAL",
+            "synchronous=NORMAL",
+            "temp_store=MEMORY",
+            "cache_size=-65536",
+            "busy_timeout=5000",
+        ):
+            self.conn.execute(f"PRAGMA {pragma}")
+        # Décisions de should_import_file, par nom de fichier (LRU)
+        self._should_import_cache = OrderedDict()
+        if init_schema:
+            self._init_schema()
+
+    def for_thread(self):
+        """Ouvre une connexion dédiée sur la même base, utilisable depuis un thread de travail.
+
+        Le schéma n'est pas réinitialisé : l'instance principale s'en est déjà chargée.
+        """
+        return Database(self.path, init_schema=False, check_same_thread=False)
+
+    def close(self):
+        """Ferme la connexion SQLite."""
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
 
     def _init_schema(self):
         cur = self.conn.cursor()
@@ -524,6 +1078,22 @@ class Database:
             cur.execute("ALTER TABLE marches ADD COLUMN type_marche TEXT DEFAULT 'CLASSIQUE'")
             self.conn.commit()
 
+        # Index partiels sur les valeurs renseignées des colonnes de filtres :
+        # les SELECT DISTINCT ... ORDER BY deviennent un simple parcours d'index couvrant
+        for table, column in (
+            ("commandes", "marche"),
+            ("commandes", "fournisseur"),
+            ("commandes", "article_fonction"),
+            ("commandes", "article_nature"),
+            ("commandes", "service_emetteur"),
+            ("factures", "marche"),
+            ("factures", "fournisseur"),
+        ):
+            cur.execute(
+                f"CREATE INDEX IF NOT EXISTS idx_{table}_{column} ON {table}({column}) "
+                f"WHERE {column} IS NOT NULL AND {column} != ''"
+            )
+
         self.conn.commit()
 
     # -------------- Config --------------
@@ -966,6 +1536,80 @@ class Database:
 
         self.conn.commit()
 
+    def upsert_commandes_bulk(self, rows):
+        """
+        Insère ou met à jour un lot de commandes en une seule requête préparée.
+
+        `rows` : tuples (exercice, num_commande, fournisseur, libelle, date_commande,
+        marche, service_emetteur, montant_ttc, section, article_fonction,
+        article_nature, source_file). Même comportement que upsert_commande :
+        les nouvelles commandes sont créées « A suivre » avec un rappel planifié,
+        les existantes ne voient que leurs données importées mises à jour.
+        """
+        try:
+            freq = int(self.get_config("global_reminder_days", "7") or 7)
+        except ValueError:
+            freq = 7
+        if freq < 0:
+            freq = 0
+
+        t_val = self.get_config("global_reminder_time", "09:00") or "09:00"
+        try:
+            hh, mm = map(int, t_val.split(":"))
+            hh = max(0, min(23, hh))
+            mm = max(0, min(59, mm))
+        except Exception:
+            hh, mm = 9, 0
+
+        date_base = date.today() + timedelta(days=freq)
+        prochaine_dt = datetime.combine(date_base, datetime.min.time()).replace(hour=hh, minute=mm)
+        prochaine = prochaine_dt.strftime("%Y-%m-%d %H:%M")
+        now = datetime.now().isoformat(timespec="seconds")
+
+        params = (
+            (
+                exercice, num_commande, fournisseur, libelle, date_commande,
+                marche, service_emetteur, montant_ttc, section,
+                article_fonction, article_nature,
+                "A suivre", 1, freq, prochaine, None, "", now,
+                0.0, montant_ttc or 0.0, "Non facturée", source_file,
+            )
+            for (exercice, num_commande, fournisseur, libelle, date_commande,
+                 marche, service_emetteur, montant_ttc, section,
+                 article_fonction, article_nature, source_file) in rows
+        )
+
+        with self.conn:
+            # Verrou d'écriture pris d'emblée : pas de SQLITE_BUSY en cours de lot
+            if not self.conn.in_transaction:
+                self.conn.execute("BEGIN IMMEDIATE")
+            self.conn.executemany(
+                """
+                INSERT INTO commandes (
+                    exercice, num_commande, fournisseur, libelle, date_commande,
+                    marche, service_emetteur, montant_ttc, section,
+                    article_fonction, article_nature,
+                    statut, rappel_actif, frequence_rappel_jours,
+                    prochaine_date_rappel, date_envoi,
+                    notes, last_update, montant_facture, reste_a_facturer, statut_facturation,
+                    source_file
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(exercice, num_commande) DO UPDATE SET
+                    fournisseur = excluded.fournisseur,
+                    libelle = excluded.libelle,
+                    date_commande = excluded.date_commande,
+                    marche = excluded.marche,
+                    service_emetteur = excluded.service_emetteur,
+                    montant_ttc = excluded.montant_ttc,
+                    section = excluded.section,
+                    article_fonction = excluded.article_fonction,
+                    article_nature = excluded.article_nature,
+                    last_update = excluded.last_update,
+                    source_file = excluded.source_file
+                """,
+                params,
+            )
+
     def fetch_all_commandes(self):
         cur = self.conn.cursor()
         cur.execute(
@@ -976,30 +1620,35 @@ class Database:
         )
         return cur.fetchall()
 
+    @staticmethod
+    def _id_chunks(ids, reserved):
+        """Découpe `ids` en lots tenant dans une requête avec `reserved` autres paramètres."""
+        size = SQLITE_MAX_PARAMS - reserved
+        ids = list(ids)
+        for i in range(0, len(ids), size):
+            yield ids[i:i + size]
+
     def update_statut_for_ids(self, ids, statut, disable_rappel=False):
         if not ids:
             return
         cur = self.conn.cursor()
         date_envoi = today_iso() if statut == "Envoyée" else None
         if disable_rappel:
-            cur.execute(
-                f"""
+            sql = """
                 UPDATE commandes
                 SET statut = ?, rappel_actif = 0, prochaine_date_rappel = NULL,
                     date_envoi = ?
-                WHERE id IN ({",".join("?" * len(ids))})
-                """,
-                (statut, date_envoi, *ids),
-            )
+                WHERE id IN ({})
+                """
         else:
-            cur.execute(
-                f"""
+            sql = """
                 UPDATE commandes
                 SET statut = ?, date_envoi = ?
-                WHERE id IN ({",".join("?" * len(ids))})
-                """,
-                (statut, date_envoi, *ids),
-            )
+                WHERE id IN ({})
+                """
+        # Un UPDATE par lot d'ids (un seul en pratique), le tout en une transaction
+        for chunk in self._id_chunks(ids, 2):
+            cur.execute(sql.format(",".join("?" * len(chunk))), (statut, date_envoi, *chunk))
         self.conn.commit()
 
     def reschedule_rappel_for_ids(self, ids):
@@ -1024,16 +1673,18 @@ class Database:
         prochaine_dt = datetime.combine(date_base, datetime.min.time()).replace(hour=hh, minute=mm)
         date_next = prochaine_dt.strftime("%Y-%m-%d %H:%M")
         cur = self.conn.cursor()
-        cur.execute(
-            f"""
-            UPDATE commandes
-            SET rappel_actif = 1,
-                frequence_rappel_jours = ?,
-                prochaine_date_rappel = ?
-            WHERE id IN ({",".join("?" * len(ids))})
-            """,
-            (days, date_next, *ids),
-        )
+        # Un UPDATE par lot d'ids (un seul en pratique), le tout en une transaction
+        for chunk in self._id_chunks(ids, 2):
+            cur.execute(
+                f"""
+                UPDATE commandes
+                SET rappel_actif = 1,
+                    frequence_rappel_jours = ?,
+                    prochaine_date_rappel = ?
+                WHERE id IN ({",".join("?" * len(chunk))})
+                """,
+                (days, date_next, *chunk),
+            )
         self.conn.commit()
 
     def due_reminders(self):
@@ -1066,6 +1717,19 @@ class Database:
         )
         return cur.fetchall()
 
+    def count_active_reminders(self):
+        """Nombre de rappels actifs (mêmes critères que all_active_reminders)."""
+        cur = self.conn.cursor()
+        cur.execute(
+            """
+            SELECT COUNT(*) FROM commandes
+            WHERE statut != 'Envoyée'
+              AND rappel_actif = 1
+              AND prochaine_date_rappel IS NOT NULL
+            """
+        )
+        return cur.fetchone()[0]
+
     # -------------- Factures --------------
 
     def upsert_facture(self, data):
@@ -1150,6 +1814,65 @@ class Database:
 
         self.conn.commit()
 
+    def insert_factures_bulk(self, rows, source_file):
+        """
+        Insère un lot de lignes de factures en une seule requête préparée.
+
+        `rows` : itérable de tuples (exercice, num_facture, code_mouvement, fournisseur,
+        libelle, date_facture, montant_ttc, montant_service_fait, marche, statut_facture,
+        tranche, commande, num_mandat, montant_initial), consommé une seule fois.
+        Retourne le nombre de lignes insérées.
+
+        Les lignes sont insérées par paquets via un INSERT multi-lignes
+        (VALUES (...), (...), ...) ; le reste est inséré ligne à ligne. Les
+        paramètres sont produits paquet par paquet : pas de copie complète de `rows`.
+        """
+        now = datetime.now().isoformat(timespec="seconds")
+        params = (
+            (
+                exercice, num_facture, code_mouvement,
+                fournisseur, libelle, date_facture,
+                montant_ttc, montant_service_fait, marche,
+                statut,
+                0, None, None, "", now, source_file,
+                tranche, commande, num_mandat, montant_initial,
+            )
+            for (exercice, num_facture, code_mouvement, fournisseur, libelle,
+                 date_facture, montant_ttc, montant_service_fait, marche, statut,
+                 tranche, commande, num_mandat, montant_initial) in rows
+        )
+        insert_sql = """
+            INSERT INTO factures (
+                exercice, num_facture, code_mouvement,
+                fournisseur, libelle, date_facture,
+                montant_ttc, montant_service_fait, marche,
+                statut_facture,
+                rappel_facture_actif, frequence_rappel_facture_jours,
+                prochaine_date_rappel_facture, notes, last_update, source_file,
+                tranche, commande, num_mandat, montant_initial
+            ) VALUES """
+        row_placeholders = "(?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+        # Autant de lignes par paquet que le permet la limite de paramètres
+        chunk_size = SQLITE_MAX_PARAMS // 20
+        # Même texte SQL pour tous les paquets complets : requête préparée une seule fois
+        chunk_sql = insert_sql + ", ".join([row_placeholders] * chunk_size)
+        count = 0
+        with self.conn:
+            # Verrou d'écriture pris d'emblée : pas de SQLITE_BUSY en cours de lot
+            if not self.conn.in_transaction:
+                self.conn.execute("BEGIN IMMEDIATE")
+            while True:
+                chunk = list(islice(params, chunk_size))
+                if len(chunk) < chunk_size:
+                    # Dernier paquet incomplet (éventuellement vide) : ligne à ligne
+                    if chunk:
+                        self.conn.executemany(insert_sql + row_placeholders, chunk)
+                    count += len(chunk)
+                    break
+                self.conn.execute(chunk_sql, list(chain.from_iterable(chunk)))
+                count += chunk_size
+        return count
+
     def fetch_all_factures(self):
         cur = self.conn.cursor()
         cur.execute(
@@ -1163,8 +1886,9 @@ class Database:
     # -------------- Agrégations facturation --------------
 
 
-    def recompute_facturation(self):
-        """Calcule et met à jour pour chaque commande :
+    def recompute_facturation(self, num_commandes=None):
+        """Calcule et met à jour pour chaque commande (ou seulement pour les
+        numéros de `num_commandes`, après un import) :
         - montant_facture : somme des Montant service fait des factures liées (code_mouvement = num_commande)
         - reste_a_facturer : montant_commande - montant_facture
         - statut_facturation : Non / Partiellement / Totalement facturée
@@ -1174,21 +1898,36 @@ class Database:
           le statut de la commande est automatiquement positionné à "Envoyée".
         """
         cur = self.conn.cursor()
-
-        # Somme des montants service fait par commande (code_mouvement)
-        cur.execute(
-            """
+        totals_sql = """
             SELECT code_mouvement, SUM(montant_service_fait) AS total
             FROM factures
             WHERE code_mouvement IS NOT NULL AND code_mouvement != ''
+            {}
             GROUP BY code_mouvement
-            """
-        )
-        totals = {row["code_mouvement"]: (row["total"] or 0.0) for row in cur.fetchall()}
+        """
+        commandes_sql = "SELECT id, num_commande, montant_ttc, statut FROM commandes {}"
+
+        # Somme des montants service fait par commande (code_mouvement)
+        if num_commandes is None:
+            cur.execute(totals_sql.format(""))
+            totals = {row["code_mouvement"]: (row["total"] or 0.0) for row in cur.fetchall()}
+            cur.execute(commandes_sql.format(""))
+            rows = cur.fetchall()
+        else:
+            # Par lots de 500 numéros (limite des paramètres SQLite)
+            nums = sorted(set(num_commandes))
+            totals = {}
+            rows = []
+            for start in range(0, len(nums), 500):
+                chunk = nums[start:start + 500]
+                marks = ",".join("?" * len(chunk))
+                cur.execute(totals_sql.format(f"AND code_mouvement IN ({marks})"), chunk)
+                totals.update((row["code_mouvement"], row["total"] or 0.0) for row in cur.fetchall())
+                cur.execute(commandes_sql.format(f"WHERE num_commande IN ({marks})"), chunk)
+                rows.extend(cur.fetchall())
 
         # Recalcule pour chaque commande
-        cur.execute("SELECT id, num_commande, montant_ttc, statut FROM commandes")
-        rows = cur.fetchall()
+        updates = []
         for row in rows:
             num = row["num_commande"]
             mt_cmd = row["montant_ttc"] or 0.0
@@ -1213,15 +1952,16 @@ class Database:
             else:
                 new_statut = statut_cmd or "A suivre"
 
-            cur.execute(
-                """
-                UPDATE commandes
-                SET montant_facture = ?, reste_a_facturer = ?, statut_facturation = ?, statut = ?
-                WHERE id = ?
-                """,
-                (mt_fact, reste, statut_fact, new_statut, row["id"]),
-            )
+            updates.append((mt_fact, reste, statut_fact, new_statut, row["id"]))
 
+        cur.executemany(
+            """
+            UPDATE commandes
+            SET montant_facture = ?, reste_a_facturer = ?, statut_facturation = ?, statut = ?
+            WHERE id = ?
+            """,
+            updates,
+        )
         self.conn.commit()
 
 
@@ -1296,7 +2036,7 @@ class Database:
         hash_md5 = hashlib.md5()
         try:
             with open(filepath, "rb") as f:
-                for chunk in iter(lambda: f.read(4096), b""):
+                for chunk in iter(lambda: f.read(1024 * 1024), b""):
                     hash_md5.update(chunk)
             return hash_md5.hexdigest()
         except Exception as e:
@@ -1340,19 +2080,44 @@ class Database:
              import_type, records_imported, status, error_message)
         )
         self.conn.commit()
+        # Le suivi de ce fichier vient de changer : sa décision mémorisée n'est plus valable
+        self._should_import_cache.pop(filename, None)
 
     def should_import_file(self, filepath: str) -> tuple:
         """
         Vérifie si un fichier doit être importé.
         Retourne (should_import: bool, reason: str)
+
+        La décision est mémorisée tant que le chemin, la taille et la date de
+        modification du fichier ne changent pas (et jusqu'au prochain
+        record_import du fichier) : un dossier inchangé ne coûte que des stat().
         """
         import os
 
         filename = os.path.basename(filepath)
-        file_hash = self.calculate_file_hash(filepath)
+        try:
+            stat = os.stat(filepath)
+        except OSError:
+            stat = None
+        if stat is None:
+            return self._should_import_file(filepath, filename, None)
+
+        key = (filepath, stat.st_size, stat.st_mtime_ns)
+        cached = self._should_import_cache.get(filename)
+        if cached is not None and cached[0] == key:
+            self._should_import_cache.move_to_end(filename)
+            return cached[1]
+
+        result = self._should_import_file(filepath, filename, stat)
+        self._should_import_cache[filename] = (key, result)
+        self._should_import_cache.move_to_end(filename)
+        if len(self._should_import_cache) > SHOULD_IMPORT_CACHE_SIZE:
+            self._should_import_cache.popitem(last=False)
+        return result
 
-        if not file_hash:
-            return False, "Impossible de calculer le hash"
+    def _should_import_file(self, filepath: str, filename: str, stat) -> tuple:
+        """Décision réelle de should_import_file (lecture du suivi, puis hash si nécessaire)."""
+        from datetime import datetime
 
         record = self.get_import_record(filename)
 
@@ -1363,6 +2128,17 @@ class Database:
         if record["status"] == "error":
             return True, "Import précédent en erreur - réessai"
 
+        # Taille et date de modification identiques à l'import précédent :
+        # fichier inchangé, inutile de relire son contenu pour le hacher
+        if (stat is not None and record["file_size"] == stat.st_size
+                and record["last_modified_date"] == datetime.fromtimestamp(stat.st_mtime).isoformat()):
+            return False, "Fichier déjà importé et inchangé"
+
+        file_hash = self.calculate_file_hash(filepath)
+
+        if not file_hash:
+            return False, "Impossible de calculer le hash"
+
         if record["file_hash"] != file_hash:
             return True, "Fichier modifié (hash différent)"
 
@@ -1430,16 +2206,55 @@ COMMANDES_COLUMNS = [
 ]
 
 
-class CommandesTableModel(QAbstractTableModel):
-    def __init__(self, db: Database):
+class RowsTableModel(QAbstractTableModel):
+    """
+    Base des modèles Commandes/Factures/Facturation (une ligne SQLite par ligne).
+
+    `lowered(key)` fournit la colonne `key` en minuscules, calculée une seule
+    fois par chargement : les filtres texte des proxies n'appellent plus
+    str()/lower() sur chaque ligne à chaque refiltrage.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._lowered = {}
+
+    def lowered(self, key):
+        values = self._lowered.get(key)
+        if values is None:
+            values = self._lowered[key] = [str(row[key] or "").lower() for row in self.rows]
+        return values
+
+    def display_rows(self, source_rows, columns):
+        """
+        Textes affichés (voir display) des lignes `source_rows` du modèle, pour
+        les `columns` données : lecture directe des lignes, sans data() par cellule.
+        """
+        keys = [key for key, _ in columns]
+        display = self.display
+        data = []
+        for source_row in source_rows:
+            row = self.rows[source_row]
+            values = [display(row, key) for key in keys]
+            data.append(["" if value is None else str(value) for value in values])
+        return data
+
+
+class CommandesTableModel(RowsTableModel):
+    # Rôles servis par data() ; les autres sont écartés d'emblée
+    _DATA_ROLES = frozenset((Qt.DisplayRole, Qt.TextAlignmentRole, Qt.BackgroundRole))
+
+    def __init__(self, db: Database, rows=None):
         super().__init__()
         self.db = db
         self.rows = []
-        self.refresh()
+        self.refresh(rows)
 
-    def refresh(self):
+    def refresh(self, rows=None):
+        """Recharge le modèle (lignes déjà lues fournies par un thread, sinon lecture en base)."""
         self.beginResetModel()
-        self.rows = list(self.db.fetch_all_commandes())
+        self.rows = list(self.db.fetch_all_commandes()) if rows is None else list(rows)
+        self._lowered = {}
         self.endResetModel()
 
     def rowCount(self, parent=QModelIndex()):
@@ -1449,31 +2264,13 @@ class CommandesTableModel(QAbstractTableModel):
         return len(COMMANDES_COLUMNS)
 
     def data(self, index, role=Qt.DisplayRole):
-        if not index.isValid():
+        if role not in self._DATA_ROLES or not index.isValid():
             return None
         row = self.rows[index.row()]
         key, _ = COMMANDES_COLUMNS[index.column()]
 
         if role == Qt.DisplayRole:
-            value = row[key]
-            if key in ("date_commande", "prochaine_date_rappel", "date_envoi") and value:
-                try:
-                    # Supporte date seule ou date+heure pour les rappels.
-                    if len(value) > 10:
-                        d = datetime.strptime(value, "%Y-%m-%d %H:%M")
-                        return d.strftime("%d/%m/%Y %H:%M")
-                    else:
-                        d = datetime.strptime(value, "%Y-%m-%d")
-                        return d.strftime("%d/%m/%Y")
-                except Exception:
-                    return value
-            if key in ("montant_ttc", "montant_facture", "reste_a_facturer") and value is not None:
-                return f"{float(value):,.2f}".replace(",", " ").replace(".", ",")
-            if key == "libelle" and value:
-                return smart_word_wrap(str(value), 50)
-            if key == "fournisseur" and value:
-                return smart_word_wrap(str(value), 30)
-            return value
+            return self.display(row, key)
 
         if role == Qt.TextAlignmentRole:
             if key in ("montant_ttc", "montant_facture", "reste_a_facturer", "date_commande", "prochaine_date_rappel", "date_envoi"):
@@ -1483,7 +2280,7 @@ class CommandesTableModel(QAbstractTableModel):
         if role == Qt.BackgroundRole:
             statut = row["statut"]
             if statut == "Envoyée":
-                return QBrush(QColor("#d0ffd0"))
+                return cached_brush("#d0ffd0")
             if statut == "A suivre":
                 pr = row["prochaine_date_rappel"]
                 if pr:
@@ -1492,21 +2289,21 @@ class CommandesTableModel(QAbstractTableModel):
                         if len(pr) > 10:
                             d = datetime.strptime(pr, "%Y-%m-%d %H:%M")
                             if d < datetime.now():
-                                return QBrush(QColor("#ffd0d0"))
+                                return cached_brush("#ffd0d0")
                         else:
                             d = datetime.strptime(pr, "%Y-%m-%d").date()
                             if d < date.today():
-                                return QBrush(QColor("#ffd0d0"))
+                                return cached_brush("#ffd0d0")
                     except Exception:
                         pass
             # Coloration facturation
             stat_fact = row["statut_facturation"]
             if stat_fact == "Totalement facturée":
-                return QBrush(QColor("#e0ffe0"))
+                return cached_brush("#e0ffe0")
             if stat_fact == "Partiellement facturée":
-                return QBrush(QColor("#fff3cd"))
+                return cached_brush("#fff3cd")
             if stat_fact == "Non facturée":
-                return QBrush(QColor("#ffe0e0"))
+                return cached_brush("#ffe0e0")
 
         return None
 
@@ -1522,56 +2319,101 @@ class CommandesTableModel(QAbstractTableModel):
             return self.rows[row_index]["id"]
         return None
 
+    @staticmethod
+    def display(row, key):
+        """Texte affiché pour la colonne `key` de `row`."""
+        value = row[key]
+        if key in ("date_commande", "prochaine_date_rappel", "date_envoi") and value:
+            # Supporte date seule ou date+heure pour les rappels.
+            return format_iso_date(value)
+        if key in ("montant_ttc", "montant_facture", "reste_a_facturer") and value is not None:
+            return f"{float(value):,.2f}".replace(",", " ").replace(".", ",")
+        if key == "libelle" and value:
+            return smart_word_wrap(str(value), 50)
+        if key == "fournisseur" and value:
+            return smart_word_wrap(str(value), 30)
+        return value
+
+
+class BatchFilterProxy(QSortFilterProxyModel):
+    """
+    Proxy dont l'invalidation du filtre peut être suspendue.
+
+    Tant que `_suspend_invalidate` est vrai, les setters de filtre ne font que
+    mémoriser qu'une invalidation est en attente ; `resume_invalidate()` la
+    déclenche une seule fois (voir MainWindow._batch_filters).
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._suspend_invalidate = False
+        self._invalidate_pending = False
+
+    def _set_filter(self, attr, value):
+        """Affecte le critère `attr` et ne refiltre que si sa valeur a changé."""
+        if getattr(self, attr) == value:
+            return
+        setattr(self, attr, value)
+        self.invalidateFilter()
+
+    def invalidateFilter(self):
+        if self._suspend_invalidate:
+            self._invalidate_pending = True
+            return
+        super().invalidateFilter()
+
+    def suspend_invalidate(self):
+        self._suspend_invalidate = True
+
+    def resume_invalidate(self):
+        self._suspend_invalidate = False
+        if self._invalidate_pending:
+            self._invalidate_pending = False
+            super().invalidateFilter()
 
-class CommandesProxy(QSortFilterProxyModel):
+
+class CommandesProxy(BatchFilterProxy):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.filter_status = "Tous"
+        # Les filtres texte (sous-chaîne) sont stockés en minuscules par les setters
         self.filter_fournisseur = ""
         self.filter_facturation = "Tous"
         self.filter_marche = "Tous"
-        # Nouveaux filtres multiples
-        self.filter_article_fonction = []
-        self.filter_article_nature = []
-        self.filter_service_emetteur = []
+        # Nouveaux filtres multiples (ensembles : test d'appartenance en O(1))
+        self.filter_article_fonction = set()
+        self.filter_article_nature = set()
+        self.filter_service_emetteur = set()
         # Filtre de recherche par N° de commande
         self.filter_num_commande = ""
 
     def setStatusFilter(self, status):
-        self.filter_status = status
-        self.invalidateFilter()
+        self._set_filter("filter_status", status)
 
     def setFournisseurFilter(self, text):
-        self.filter_fournisseur = text or ""
-        self.invalidateFilter()
+        self._set_filter("filter_fournisseur", (text or "").lower())
 
     def setFacturationFilter(self, text):
-        self.filter_facturation = text or ""
-        self.invalidateFilter()
+        self._set_filter("filter_facturation", text or "")
 
     def setMarcheFilter(self, text):
-        self.filter_marche = text or "Tous"
-        self.invalidateFilter()
+        self._set_filter("filter_marche", text or "Tous")
 
     def setNumCommandeFilter(self, text):
         """Filtre par numéro de commande."""
-        self.filter_num_commande = text or ""
-        self.invalidateFilter()
+        self._set_filter("filter_num_commande", (text or "").lower())
     
     def setArticleFonctionFilter(self, values):
         """Filtre par article fonction (liste de valeurs)."""
-        self.filter_article_fonction = values if values else []
-        self.invalidateFilter()
+        self._set_filter("filter_article_fonction", set(values) if values else set())
     
     def setArticleNatureFilter(self, values):
         """Filtre par article nature (liste de valeurs)."""
-        self.filter_article_nature = values if values else []
-        self.invalidateFilter()
+        self._set_filter("filter_article_nature", set(values) if values else set())
     
     def setServiceEmetteurFilter(self, values):
         """Filtre par service émetteur (liste de valeurs)."""
-        self.filter_service_emetteur = values if values else []
-        self.invalidateFilter()
+        self._set_filter("filter_service_emetteur", set(values) if values else set())
 
     def lessThan(self, left, right):
         src = self.sourceModel()
@@ -1614,8 +2456,7 @@ class CommandesProxy(QSortFilterProxyModel):
                 return False
 
         if self.filter_fournisseur:
-            fournisseur = row["fournisseur"] or ""
-            if self.filter_fournisseur.lower() not in fournisseur.lower():
+            if self.filter_fournisseur not in model.lowered("fournisseur")[source_row]:
                 return False
 
         if self.filter_facturation != "Tous":
@@ -1645,8 +2486,7 @@ class CommandesProxy(QSortFilterProxyModel):
 
         # Filtre par numéro de commande
         if self.filter_num_commande:
-            num_commande = str(row["num_commande"] or "")
-            if self.filter_num_commande.lower() not in num_commande.lower():
+            if self.filter_num_commande not in model.lowered("num_commande")[source_row]:
                 return False
 
         return True
@@ -1668,16 +2508,21 @@ FACTURES_COLUMNS = [
 ]
 
 
-class FacturesTableModel(QAbstractTableModel):
-    def __init__(self, db: Database):
+class FacturesTableModel(RowsTableModel):
+    # Rôles servis par data() ; les autres sont écartés d'emblée
+    _DATA_ROLES = frozenset((Qt.DisplayRole, Qt.TextAlignmentRole, Qt.BackgroundRole))
+
+    def __init__(self, db: Database, rows=None):
         super().__init__()
         self.db = db
         self.rows = []
-        self.refresh()
+        self.refresh(rows)
 
-    def refresh(self):
+    def refresh(self, rows=None):
+        """Recharge le modèle (lignes déjà lues fournies par un thread, sinon lecture en base)."""
         self.beginResetModel()
-        self.rows = list(self.db.fetch_all_factures())
+        self.rows = list(self.db.fetch_all_factures()) if rows is None else list(rows)
+        self._lowered = {}
         self.endResetModel()
 
     def rowCount(self, parent=QModelIndex()):
@@ -1687,26 +2532,13 @@ class FacturesTableModel(QAbstractTableModel):
         return len(FACTURES_COLUMNS)
 
     def data(self, index, role=Qt.DisplayRole):
-        if not index.isValid():
+        if role not in self._DATA_ROLES or not index.isValid():
             return None
         row = self.rows[index.row()]
         key, _ = FACTURES_COLUMNS[index.column()]
 
         if role == Qt.DisplayRole:
-            value = row[key]
-            if key == "date_facture" and value:
-                try:
-                    d = datetime.strptime(value, "%Y-%m-%d").date()
-                    return d.strftime("%d/%m/%Y")
-                except Exception:
-                    return value
-            if key in ("montant_service_fait", "montant_ttc") and value is not None:
-                return f"{float(value):,.2f}".replace(",", " ").replace(".", ",")
-            if key == "libelle" and value:
-                return smart_word_wrap(str(value), 50)
-            if key == "fournisseur" and value:
-                return smart_word_wrap(str(value), 30)
-            return value or ""
+            return self.display(row, key)
 
         if role == Qt.TextAlignmentRole:
             if key in ("montant_service_fait", "montant_ttc", "date_facture"):
@@ -1716,11 +2548,11 @@ class FacturesTableModel(QAbstractTableModel):
         if role == Qt.BackgroundRole:
             statut = row["statut_facture"] or ""
             if statut == "Facturée":
-                return QBrush(QColor("#d0ffd0"))
+                return cached_brush("#d0ffd0")
             elif statut == "Service fait":
-                return QBrush(QColor("#fff3cd"))
+                return cached_brush("#fff3cd")
             elif statut == "En attente de paiement":
-                return QBrush(QColor("#ffe0e0"))
+                return cached_brush("#ffe0e0")
 
         return None
 
@@ -1736,8 +2568,22 @@ class FacturesTableModel(QAbstractTableModel):
             return self.rows[row_index]["id"]
         return None
 
-
-class FacturesProxy(QSortFilterProxyModel):
+    @staticmethod
+    def display(row, key):
+        """Texte affiché pour la colonne `key` de `row`."""
+        value = row[key]
+        if key == "date_facture" and value:
+            return format_iso_date(value)
+        if key in ("montant_service_fait", "montant_ttc") and value is not None:
+            return f"{float(value):,.2f}".replace(",", " ").replace(".", ",")
+        if key == "libelle" and value:
+            return smart_word_wrap(str(value), 50)
+        if key == "fournisseur" and value:
+            return smart_word_wrap(str(value), 30)
+        return value or ""
+
+
+class FacturesProxy(BatchFilterProxy):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.filter_statut = "Tous"
@@ -1749,30 +2595,24 @@ class FacturesProxy(QSortFilterProxyModel):
         self.filter_num_facture = ""
 
     def setStatutFilter(self, text):
-        self.filter_statut = text or "Tous"
-        self.invalidateFilter()
+        self._set_filter("filter_statut", text or "Tous")
 
     def setFournisseurFilter(self, text):
-        self.filter_fournisseur = text or ""
-        self.invalidateFilter()
+        self._set_filter("filter_fournisseur", (text or "").lower())
 
     def setExerciceFilter(self, text):
-        self.filter_exercice = text or "Tous"
-        self.invalidateFilter()
+        self._set_filter("filter_exercice", text or "Tous")
 
     def setMarcheFilter(self, text):
-        self.filter_marche = text or "Tous"
-        self.invalidateFilter()
+        self._set_filter("filter_marche", text or "Tous")
 
     def setNumCommandeFilter(self, text):
         """Filtre par numéro de commande."""
-        self.filter_num_commande = text or ""
-        self.invalidateFilter()
+        self._set_filter("filter_num_commande", (text or "").lower())
 
     def setNumFactureFilter(self, text):
         """Filtre par numéro de facture."""
-        self.filter_num_facture = text or ""
-        self.invalidateFilter()
+        self._set_filter("filter_num_facture", (text or "").lower())
 
     def lessThan(self, left, right):
         src = self.sourceModel()
@@ -1815,8 +2655,7 @@ class FacturesProxy(QSortFilterProxyModel):
                 return False
 
         if self.filter_fournisseur:
-            fournisseur = row["fournisseur"] or ""
-            if self.filter_fournisseur.lower() not in fournisseur.lower():
+            if self.filter_fournisseur not in model.lowered("fournisseur")[source_row]:
                 return False
 
         if self.filter_exercice != "Tous":
@@ -1830,14 +2669,12 @@ class FacturesProxy(QSortFilterProxyModel):
 
         # Filtre par numéro de commande (via code_mouvement)
         if self.filter_num_commande:
-            code_mouvement = str(row["code_mouvement"] or "")
-            if self.filter_num_commande.lower() not in code_mouvement.lower():
+            if self.filter_num_commande not in model.lowered("code_mouvement")[source_row]:
                 return False
 
         # Filtre par numéro de facture
         if self.filter_num_facture:
-            num_facture = str(row["num_facture"] or "")
-            if self.filter_num_facture.lower() not in num_facture.lower():
+            if self.filter_num_facture not in model.lowered("num_facture")[source_row]:
                 return False
 
         return True
@@ -1858,17 +2695,29 @@ FACTURATION_COLUMNS = [
     ("derniere_facture", "Dernière\nfacture"),
 ]
 
+# Statut de facturation -> code entier (0 : inconnu), indice des couleurs d'export
+STATUT_FACTURATION_CODES = {
+    "Non facturée": 1,
+    "Partiellement facturée": 2,
+    "Totalement facturée": 3,
+}
 
-class FacturationTableModel(QAbstractTableModel):
-    def __init__(self, db: Database):
+
+class FacturationTableModel(RowsTableModel):
+    # Rôles servis par data() ; les autres sont écartés d'emblée
+    _DATA_ROLES = frozenset((Qt.DisplayRole, Qt.TextAlignmentRole, Qt.BackgroundRole))
+
+    def __init__(self, db: Database, rows=None):
         super().__init__()
         self.db = db
         self.rows = []
-        self.refresh()
+        self.refresh(rows)
 
-    def refresh(self):
+    def refresh(self, rows=None):
+        """Recharge le modèle (lignes déjà lues fournies par un thread, sinon lecture en base)."""
         self.beginResetModel()
-        self.rows = list(self.db.fetch_facturation_synthese())
+        self.rows = list(self.db.fetch_facturation_synthese()) if rows is None else list(rows)
+        self._lowered = {}
         self.endResetModel()
 
     def rowCount(self, parent=QModelIndex()):
@@ -1878,26 +2727,13 @@ class FacturationTableModel(QAbstractTableModel):
         return len(FACTURATION_COLUMNS)
 
     def data(self, index, role=Qt.DisplayRole):
-        if not index.isValid():
+        if role not in self._DATA_ROLES or not index.isValid():
             return None
         row = self.rows[index.row()]
         key, _ = FACTURATION_COLUMNS[index.column()]
 
         if role == Qt.DisplayRole:
-            value = row[key]
-            if key == "derniere_facture" and value:
-                try:
-                    d = datetime.strptime(value, "%Y-%m-%d").date()
-                    return d.strftime("%d/%m/%Y")
-                except Exception:
-                    return value
-            if key in ("montant_commande", "montant_facture", "reste_a_facturer") and value is not None:
-                return f"{float(value):,.2f}".replace(",", " ").replace(".", ",")
-            if key == "fournisseur" and value:
-                return smart_word_wrap(str(value), 30)
-            if key == "libelle" and value:
-                return smart_word_wrap(str(value), 50)
-            return value or ""
+            return self.display(row, key)
 
         if role == Qt.TextAlignmentRole:
             if key in ("montant_commande", "montant_facture", "reste_a_facturer"):
@@ -1907,11 +2743,11 @@ class FacturationTableModel(QAbstractTableModel):
         if role == Qt.BackgroundRole:
             statut = row["statut_facturation"] or ""
             if statut == "Totalement facturée":
-                return QBrush(QColor("#e0ffe0"))
+                return cached_brush("#e0ffe0")
             elif statut == "Partiellement facturée":
-                return QBrush(QColor("#fff3cd"))
+                return cached_brush("#fff3cd")
             elif statut == "Non facturée":
-                return QBrush(QColor("#ffe0e0"))
+                return cached_brush("#ffe0e0")
 
         return None
 
@@ -1922,8 +2758,22 @@ class FacturationTableModel(QAbstractTableModel):
             return FACTURATION_COLUMNS[section][1]
         return section + 1
 
-
-class FacturationProxy(QSortFilterProxyModel):
+    @staticmethod
+    def display(row, key):
+        """Texte affiché pour la colonne `key` de `row`."""
+        value = row[key]
+        if key == "derniere_facture" and value:
+            return format_iso_date(value)
+        if key in ("montant_commande", "montant_facture", "reste_a_facturer") and value is not None:
+            return f"{float(value):,.2f}".replace(",", " ").replace(".", ",")
+        if key == "fournisseur" and value:
+            return smart_word_wrap(str(value), 30)
+        if key == "libelle" and value:
+            return smart_word_wrap(str(value), 50)
+        return value or ""
+
+
+class FacturationProxy(BatchFilterProxy):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.filter_statut = "Tous"
@@ -1931,16 +2781,13 @@ class FacturationProxy(QSortFilterProxyModel):
         self.filter_marche = "Tous"
 
     def setStatutFilter(self, text):
-        self.filter_statut = text or "Tous"
-        self.invalidateFilter()
+        self._set_filter("filter_statut", text or "Tous")
 
     def setFournisseurFilter(self, text):
-        self.filter_fournisseur = text or ""
-        self.invalidateFilter()
+        self._set_filter("filter_fournisseur", (text or "").lower())
 
     def setMarcheFilter(self, text):
-        self.filter_marche = text or "Tous"
-        self.invalidateFilter()
+        self._set_filter("filter_marche", text or "Tous")
 
     def lessThan(self, left, right):
         src = self.sourceModel()
@@ -1983,8 +2830,7 @@ class FacturationProxy(QSortFilterProxyModel):
                 return False
 
         if self.filter_fournisseur:
-            fournisseur = row["fournisseur"] or ""
-            if self.filter_fournisseur.lower() not in fournisseur.lower():
+            if self.filter_fournisseur not in model.lowered("fournisseur")[source_row]:
                 return False
 
         if self.filter_marche != "Tous":
@@ -1995,49 +2841,200 @@ class FacturationProxy(QSortFilterProxyModel):
         return True
 
 
-# ------------------ DIALOGUE CONFIG ------------------
+# ============== MODELES RAPPELS ==============
 
 
-class ConfigDialog(QDialog):
-    def __init__(self, db: Database, parent=None):
-        super().__init__(parent)
-        self.db = db
-        self.setWindowTitle("Configuration globale")
-        self.resize(600, 500)
+RAPPELS_COLUMNS = [
+    ("exercice", "Exercice"),
+    ("num_commande", "N° Commande"),
+    ("fournisseur", "Fournisseur"),
+    ("date_commande", "Date commande"),
+    ("prochaine_date_rappel", "Prochain rappel"),
+    ("statut", "Statut"),
+]
 
-        # Créer un QTabWidget pour les différentes sections
-        tabs = QTabWidget(self)
-        
-        # ========== ONGLET GÉNÉRAL ==========
-        tab_general = QWidget()
-        form_general = QFormLayout(tab_general)
 
-        # Dossier source des fichiers Excel
-        self.source_dir_edit = QLineEdit(self)
-        self.source_dir_edit.setText(db.get_config("excel_source_directory", "") or "")
-        btn_source_dir = QPushButton("Parcourir…", self)
-        btn_source_dir.clicked.connect(self.browse_source_dir)
-        w_source_dir = QWidget(self)
-        l_source_dir = QHBoxLayout(w_source_dir)
-        l_source_dir.setContentsMargins(0, 0, 0, 0)
-        l_source_dir.addWidget(self.source_dir_edit)
-        l_source_dir.addWidget(btn_source_dir)
-        form_general.addRow("Dossier des fichiers Excel:", w_source_dir)
+class RappelsTableModel(QAbstractTableModel):
+    """
+    Rappels actifs (une ligne SQLite par ligne).
 
-        # Intervalle rappels (minutes)
-        self.interval_spin = QSpinBox(self)
-        self.interval_spin.setRange(1, 1440)
-        val = db.get_config("reminder_interval_minutes", "5")
-        try:
-            val = int(val)
-        except ValueError:
-            val = 5
-        self.interval_spin.setValue(max(1, val))
-        self.interval_spin.setSuffix(" min")
-        form_general.addRow("Intervalle de vérification des rappels:", self.interval_spin)
+    Les cellules sont formatées à la demande, pour les seules lignes affichées.
+    Qt.UserRole renvoie la valeur brute (dates ISO) : c'est le rôle de tri.
+    """
 
-        # Délai rappels commandes (jours)
-        # Délai rappels commandes (jours)
+    # Rôles servis par data() ; les autres sont écartés d'emblée
+    _DATA_ROLES = frozenset((Qt.DisplayRole, Qt.TextAlignmentRole, Qt.UserRole))
+    _DATE_KEYS = ("date_commande", "prochaine_date_rappel")
+
+    def __init__(self, db: Database):
+        super().__init__()
+        self.db = db
+        self.rows = []
+
+    def refresh(self, rows=None):
+        """Recharge le modèle (rappels déjà lus fournis par un thread, sinon lecture en base)."""
+        self.beginResetModel()
+        self.rows = list(self.db.all_active_reminders()) if rows is None else list(rows)
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()):
+        return len(self.rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return len(RAPPELS_COLUMNS)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if role not in self._DATA_ROLES or not index.isValid():
+            return None
+        key, _ = RAPPELS_COLUMNS[index.column()]
+
+        if role == Qt.TextAlignmentRole:
+            if key in self._DATE_KEYS:
+                return Qt.AlignRight | Qt.AlignVCenter
+            return Qt.AlignLeft | Qt.AlignVCenter
+
+        value = self.rows[index.row()][key] or ""
+        if role == Qt.DisplayRole and key in self._DATE_KEYS:
+            return format_iso_date(value)
+        return str(value)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole:
+            return None
+        if orientation == Qt.Horizontal:
+            return RAPPELS_COLUMNS[section][1]
+        return section + 1
+
+
+REMINDER_TEST_COLUMNS = [
+    ("num_commande", "N° Commande"),
+    ("fournisseur", "Fournisseur"),
+    ("date_commande", "Date commande"),
+    ("prochaine_date_rappel", "Prochain rappel"),
+    ("statut", "Statut"),
+    (None, "État"),
+]
+
+
+class ReminderTestModel(QAbstractTableModel):
+    """Rappels actifs de la fenêtre de test, avec leur état (dû aujourd'hui ou futur)."""
+
+    # Rôles servis par data() ; les autres sont écartés d'emblée
+    _DATA_ROLES = frozenset((Qt.DisplayRole, Qt.BackgroundRole, Qt.FontRole))
+
+    def __init__(self, rows, due_ids, parent=None):
+        super().__init__(parent)
+        self.rows = list(rows)
+        self.due_ids = due_ids
+        self._due_font = QFont()
+        self._due_font.setBold(True)
+
+    def rowCount(self, parent=QModelIndex()):
+        return len(self.rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return len(REMINDER_TEST_COLUMNS)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if role not in self._DATA_ROLES or not index.isValid():
+            return None
+        row = self.rows[index.row()]
+        key, _ = REMINDER_TEST_COLUMNS[index.column()]
+
+        if key is None:
+            # État (Dû / Futur)
+            is_due = row["id"] in self.due_ids
+            if role == Qt.DisplayRole:
+                return "🔴 DÛ" if is_due else "🟢 Futur"
+            if not is_due:
+                return None
+            if role == Qt.BackgroundRole:
+                return cached_brush("#ffe6e6")
+            return self._due_font
+
+        if role != Qt.DisplayRole:
+            return None
+        if key in ("date_commande", "prochaine_date_rappel"):
+            return format_iso_date(row[key])
+        return row[key] or ""
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole:
+            return None
+        if orientation == Qt.Horizontal:
+            return REMINDER_TEST_COLUMNS[section][1]
+        return section + 1
+
+
+# ------------------ EXPORTS EN ARRIÈRE-PLAN ------------------
+
+
+class ExportSignals(QObject):
+    """Signaux d'une tâche d'export (émis depuis le thread de travail)."""
+    finished = pyqtSignal(object)
+    failed = pyqtSignal(str)
+
+
+class ExportTask(QRunnable):
+    """Exécute une fonction d'export (écriture PDF/Excel) ou de lecture en base dans le QThreadPool."""
+
+    def __init__(self, job):
+        super().__init__()
+        self.job = job
+        self.signals = ExportSignals()
+
+    def run(self):
+        try:
+            result = self.job()
+        except Exception as e:
+            self.signals.failed.emit(str(e))
+        else:
+            self.signals.finished.emit(result)
+
+
+# ------------------ DIALOGUE CONFIG ------------------
+
+
+class ConfigDialog(QDialog):
+    def __init__(self, db: Database, parent=None):
+        super().__init__(parent)
+        self.db = db
+        self.setWindowTitle("Configuration globale")
+        self.resize(600, 500)
+
+        # Créer un QTabWidget pour les différentes sections
+        tabs = QTabWidget(self)
+        
+        # ========== ONGLET GÉNÉRAL ==========
+        tab_general = QWidget()
+        form_general = QFormLayout(tab_general)
+
+        # Dossier source des fichiers Excel
+        self.source_dir_edit = QLineEdit(self)
+        self.source_dir_edit.setText(db.get_config("excel_source_directory", "") or "")
+        btn_source_dir = QPushButton("Parcourir…", self)
+        btn_source_dir.clicked.connect(self.browse_source_dir)
+        w_source_dir = QWidget(self)
+        l_source_dir = QHBoxLayout(w_source_dir)
+        l_source_dir.setContentsMargins(0, 0, 0, 0)
+        l_source_dir.addWidget(self.source_dir_edit)
+        l_source_dir.addWidget(btn_source_dir)
+        form_general.addRow("Dossier des fichiers Excel:", w_source_dir)
+
+        # Intervalle rappels (minutes)
+        self.interval_spin = QSpinBox(self)
+        self.interval_spin.setRange(1, 1440)
+        val = db.get_config("reminder_interval_minutes", "5")
+        try:
+            val = int(val)
+        except ValueError:
+            val = 5
+        self.interval_spin.setValue(max(1, val))
+        self.interval_spin.setSuffix(" min")
+        form_general.addRow("Intervalle de vérification des rappels:", self.interval_spin)
+
+        # Délai rappels commandes (jours)
+        # Délai rappels commandes (jours)
         self.rem_cmd_spin = QSpinBox(self)
         self.rem_cmd_spin.setRange(0, 365)
         val = db.get_config("global_reminder_days", "7")
@@ -2186,9 +3183,168 @@ class ConfigDialog(QDialog):
         super().accept()
 
 
+# ------------------ FEUILLES DE STYLE DES BARRES D'OUTILS ------------------
+# Construites une seule fois à l'import.
+
+# Boutons colorés de la barre d'actions : (objectName, normal, survol, appui)
+_TB1_BUTTON_COLORS = (
+    ("selection_btn", "#6c757d", "#545b62", "#3d4349"),
+    ("action_envoyee", "#28a745", "#218838", "#1e7e34"),
+    ("action_suivre", "#fd7e14", "#e8590c", "#bd4b00"),
+    ("action_rappel", "#17a2b8", "#138496", "#0f6674"),
+    ("config_btn", "#6c757d", "#545b62", "#3d4349"),
+    ("export_btn", "#6610f2", "#5a0cd9", "#4a09b3"),
+    ("test_rappels_btn", "#20c997", "#1ab386", "#148f6a"),
+)
+
+_TB1_QSS = """
+    QToolBar {
+        background-color: #ffffff;
+        border-bottom: 2px solid #e0e0e0;
+        padding: 6px;
+        spacing: 4px;
+    }
+    QToolButton {
+        background-color: #0078d4;
+        color: white;
+        border: none;
+        border-radius: 4px;
+        padding: 4px 10px;
+        font-weight: bold;
+        font-size: 8pt;
+        min-height: 24px;
+        min-width: 0px;
+    }
+    QToolButton:hover {
+        background-color: #005a9e;
+    }
+    QToolButton:pressed {
+        background-color: #004578;
+    }
+""" + "".join(
+    f"""
+    QToolButton[objectName="{name}"] {{ background-color: {normal}; }}
+    QToolButton[objectName="{name}"]:hover {{ background-color: {hover}; }}
+    QToolButton[objectName="{name}"]:pressed {{ background-color: {pressed}; }}"""
+    for name, normal, hover, pressed in _TB1_BUTTON_COLORS
+) + """
+    QToolButton::menu-indicator {
+        image: none;
+        width: 0px;
+    }
+"""
+
+_TB2_QSS = """
+    QToolBar {
+        background-color: #f5f5f5;
+        border: 1px solid #d0d0d0;
+        border-radius: 6px;
+        padding: 4px;
+        spacing: 3px;
+    }
+    QLabel {
+        font-weight: bold;
+        padding: 0px 3px;
+    }
+    QComboBox {
+        border: 1px solid #c0c0c0;
+        border-radius: 4px;
+        padding: 2px 5px;
+        background-color: white;
+        min-height: 20px;
+    }
+    QComboBox:hover {
+        border: 1px solid #0078d4;
+    }
+    QComboBox::drop-down {
+        border: none;
+    }
+"""
+
+_TB3_QSS = """
+    QToolBar {
+        background-color: #e8f4f8;
+        border: 1px solid #b0d0e0;
+        border-radius: 6px;
+        padding: 4px;
+        spacing: 3px;
+    }
+    QLabel {
+        font-weight: bold;
+        padding: 0px 3px;
+    }
+    QLineEdit {
+        border: 1px solid #c0c0c0;
+        border-radius: 4px;
+        padding: 2px 5px;
+        background-color: white;
+        min-height: 20px;
+        min-width: 150px;
+    }
+    QLineEdit:hover {
+        border: 1px solid #0078d4;
+    }
+    QLineEdit:focus {
+        border: 2px solid #0078d4;
+    }
+"""
+
+# Couleurs de l'onglet actif, par index d'onglet
+_TAB_COLORS = {
+    0: {"bg": "#0078d4", "border": "#005a9e", "shadow": "rgba(0, 120, 212, 0.3)"},  # Commandes - Bleu
+    1: {"bg": "#fd7e14", "border": "#e8590c", "shadow": "rgba(253, 126, 20, 0.3)"},  # Rappels - Orange
+    2: {"bg": "#28a745", "border": "#218838", "shadow": "rgba(40, 167, 69, 0.3)"},   # Factures - Vert
+    3: {"bg": "#6f42c1", "border": "#5a32a3", "shadow": "rgba(111, 66, 193, 0.3)"},  # Facturation - Violet
+}
+
+# Feuille de style des onglets pour chaque onglet actif coloré (construite une seule fois)
+_TAB_QSS = {
+    index: f"""
+        QTabWidget::pane {{
+            border: 2px solid #e0e0e0;
+            border-radius: 8px;
+            background-color: white;
+            top: -2px;
+        }}
+        QTabBar::tab {{
+            background-color: #f8f9fa;
+            color: #495057;
+            border: 2px solid transparent;
+            border-radius: 8px 8px 0 0;
+            padding: 12px 24px;
+            margin-right: 4px;
+            font-size: 10pt;
+            font-weight: normal;
+            min-width: 120px;
+        }}
+        QTabBar::tab:hover {{
+            background-color: #e9ecef;
+        }}
+        QTabBar::tab:selected {{
+            background-color: {color['bg']};
+            color: white;
+            border: 2px solid {color['border']};
+            font-weight: bold;
+        }}
+    """
+    for index, color in _TAB_COLORS.items()
+}
+
+
 # ------------------ FENETRE PRINCIPALE ------------------
 
 
+class Tab(IntEnum):
+    """Onglets de la fenêtre principale, dans l'ordre d'insertion."""
+    COMMANDES = 0
+    RAPPELS = 1
+    FACTURES = 2
+    FACTURATION = 3
+    MARCHES = 4
+    OPERATIONS = 5
+    HISTORIQUE = 6
+
+
 class MainWindow(QMainWindow):
     def __init__(self, db_path):
         super().__init__()
@@ -2197,22 +3353,48 @@ class MainWindow(QMainWindow):
 
         self.db = Database(db_path)
         self.error_log = []  # journal des erreurs pour export
+        self._log_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "suivi_log.txt")
+        # Nombre de lignes de chaque vue lors de la dernière mesure de ses colonnes
+        self._measured_rows = {}
+        # Application Outlook (COM), obtenue au premier rappel envoyé par mail
+        self._outlook = None
+        # Lectures en arrière-plan (voir _run_db_read) : tâches en cours et
+        # numéro de la dernière lecture demandée, par nature de lecture
+        self._db_read_tasks = set()
+        self._db_read_seq = {}
+        # Nombre affiché dans le titre de l'onglet Rappels (None : titre pas encore calculé)
+        self._rappels_badge_count = None
+        # Avertissement "sélection vide", non modal et réutilisé d'une action à l'autre
+        self._empty_selection_msg = QMessageBox(
+            QMessageBox.Information, "Sélection vide", "Aucune ligne sélectionnée.",
+            QMessageBox.Ok, self,
+        )
+        self._empty_selection_msg.setModal(False)
+
+        # Lecture initiale des trois tables en parallèle (une connexion par thread)
+        cmd_rows, fact_rows, synth_rows = self._fetch_db_rows()
 
         # Modèles Commandes
-        self.cmd_model = CommandesTableModel(self.db)
+        self.cmd_model = CommandesTableModel(self.db, cmd_rows)
         self.cmd_proxy = CommandesProxy(self)
         self.cmd_proxy.setSourceModel(self.cmd_model)
 
         # Modèles Factures
-        self.fact_model = FacturesTableModel(self.db)
+        self.fact_model = FacturesTableModel(self.db, fact_rows)
         self.fact_proxy = FacturesProxy(self)
         self.fact_proxy.setSourceModel(self.fact_model)
 
         # Modèles Facturation
-        self.synth_model = FacturationTableModel(self.db)
+        self.synth_model = FacturationTableModel(self.db, synth_rows)
         self.synth_proxy = FacturationProxy(self)
         self.synth_proxy.setSourceModel(self.synth_model)
 
+        # Modèles Rappels (chargés à la première ouverture de l'onglet)
+        self.rappels_model = RappelsTableModel(self.db)
+        self.rappels_proxy = QSortFilterProxyModel(self)
+        self.rappels_proxy.setSortRole(Qt.UserRole)
+        self.rappels_proxy.setSourceModel(self.rappels_model)
+
         # Modèles Suivi des Marchés
         self.marches_global_model = MarchesGlobauxTableModel()
         self.marches_global_proxy = MarchesGlobauxProxy(self)
@@ -2308,8 +3490,8 @@ class MainWindow(QMainWindow):
             header_font.setPointSize(9)
         header.setFont(header_font)
 
-        # Colonnes auto-ajustées au contenu
-        header.setSectionResizeMode(QHeaderView.ResizeToContents)
+        # Colonnes ajustées au contenu par _fit_columns, puis redimensionnables
+        header.setSectionResizeMode(QHeaderView.Interactive)
         header.setStretchLastSection(False)
 
         self.table_cmd.sortByColumn(4, Qt.DescendingOrder)
@@ -2317,28 +3499,18 @@ class MainWindow(QMainWindow):
         self.tabs.addTab(self.table_cmd, "📋 Commandes")
 
         # === ONGLET RAPPELS ===
-        self.table_rappels = QTableWidget()
-        self.table_rappels.setColumnCount(6)
-        self.table_rappels.setHorizontalHeaderLabels(
-            [
-                "Exercice",
-                "N° Commande",
-                "Fournisseur",
-                "Date commande",
-                "Prochain rappel",
-                "Statut",
-            ]
-        )
+        self.table_rappels = QTableView()
+        self.table_rappels.setModel(self.rappels_proxy)
         hdr_rappels = self.table_rappels.horizontalHeader()
         hdr_rappels.setDefaultAlignment(Qt.AlignCenter)
         hdr_rappels.setStyleSheet(
             "QHeaderView::section { font-weight: bold; background-color: #cfe8ff; padding: 4px; }"
         )
-        hdr_rappels.setSectionResizeMode(QHeaderView.ResizeToContents)
+        hdr_rappels.setSectionResizeMode(QHeaderView.Interactive)
         hdr_rappels.setStretchLastSection(False)
-        self.table_rappels.setEditTriggers(QTableWidget.NoEditTriggers)
-        self.table_rappels.setSelectionBehavior(QTableWidget.SelectRows)
-        self.table_rappels.setSelectionMode(QTableWidget.SingleSelection)
+        self.table_rappels.setEditTriggers(QTableView.NoEditTriggers)
+        self.table_rappels.setSelectionBehavior(QTableView.SelectRows)
+        self.table_rappels.setSelectionMode(QTableView.SingleSelection)
         self.table_rappels.setSortingEnabled(True)
         self.tabs.addTab(self.table_rappels, "🔔 Rappels")
 
@@ -2355,7 +3527,7 @@ class MainWindow(QMainWindow):
         header_fact.setStyleSheet(
             "QHeaderView::section { font-weight: bold; background-color: #cfe8ff; padding: 4px; }"
         )
-        header_fact.setSectionResizeMode(QHeaderView.ResizeToContents)
+        header_fact.setSectionResizeMode(QHeaderView.Interactive)
         header_fact.setStretchLastSection(False)
         self.table_fact.sortByColumn(4, Qt.DescendingOrder)
 
@@ -2374,12 +3546,17 @@ class MainWindow(QMainWindow):
         header_synth.setStyleSheet(
             "QHeaderView::section { font-weight: bold; background-color: #cfe8ff; padding: 4px; }"
         )
-        header_synth.setSectionResizeMode(QHeaderView.ResizeToContents)
+        header_synth.setSectionResizeMode(QHeaderView.Interactive)
         header_synth.setStretchLastSection(False)
         self.table_synth.sortByColumn(4, Qt.DescendingOrder)
 
         self.tabs.addTab(self.table_synth, "💰 Facturation")
 
+        # Hauteur de ligne fixe : aucun resizeRowsToContents à chaque mise à jour ;
+        # libellés et fournisseurs sont pré-découpés sur plusieurs lignes par display()
+        for view in (self.table_cmd, self.table_rappels, self.table_fact, self.table_synth):
+            view.verticalHeader().setDefaultSectionSize(60)  # ~3 lignes de texte
+
         # === ONGLET SUIVI DES MARCHÉS ===
         # Créer un widget container avec layout vertical
         marches_widget = QWidget()
@@ -2413,9 +3590,9 @@ class MainWindow(QMainWindow):
         """)
         header_global_layout.addWidget(btn_refresh_marches)
 
-        btn_export_marches = QPushButton("📊 Exporter Excel complet")
-        btn_export_marches.clicked.connect(self.export_marches_excel)
-        btn_export_marches.setStyleSheet("""
+        self.btn_export_marches = QPushButton("📊 Exporter Excel complet")
+        self.btn_export_marches.clicked.connect(self.export_marches_excel)
+        self.btn_export_marches.setStyleSheet("""
             QPushButton {
                 background-color: #28a745;
                 color: white;
@@ -2428,7 +3605,7 @@ class MainWindow(QMainWindow):
                 background-color: #218838;
             }
         """)
-        header_global_layout.addWidget(btn_export_marches)
+        header_global_layout.addWidget(self.btn_export_marches)
         header_global_layout.addStretch()
 
         marches_layout.addWidget(header_global)
@@ -2446,9 +3623,7 @@ class MainWindow(QMainWindow):
         self.edit_filtre_marche.setPlaceholderText("Filtrer par code marché...")
         self.edit_filtre_marche.setClearButtonEnabled(True)
         self.edit_filtre_marche.setMaximumWidth(200)
-        self.edit_filtre_marche.textChanged.connect(
-            lambda text: self.marches_global_proxy.setMarcheFilter(text)
-        )
+        self._debounce_line_edit(self.edit_filtre_marche, self.marches_global_proxy.setMarcheFilter)
         filtres_layout.addWidget(self.edit_filtre_marche)
 
         # Filtre par fournisseur
@@ -2459,9 +3634,7 @@ class MainWindow(QMainWindow):
         self.edit_filtre_fournisseur.setPlaceholderText("Filtrer par fournisseur...")
         self.edit_filtre_fournisseur.setClearButtonEnabled(True)
         self.edit_filtre_fournisseur.setMaximumWidth(200)
-        self.edit_filtre_fournisseur.textChanged.connect(
-            lambda text: self.marches_global_proxy.setFournisseurFilter(text)
-        )
+        self._debounce_line_edit(self.edit_filtre_fournisseur, self.marches_global_proxy.setFournisseurFilter)
         filtres_layout.addWidget(self.edit_filtre_fournisseur)
 
         filtres_layout.addStretch()
@@ -2510,18 +3683,35 @@ class MainWindow(QMainWindow):
         self.table_marches_tranches = QTableView()
         self.table_marches_tranches.setModel(self.marches_tranches_proxy)
         self.table_marches_tranches.setSortingEnabled(True)
+        # Tri par défaut aligné sur l'ordre fourni par MarchesAnalyzer (marché puis tranche) :
+        # le tri (stable) du proxy reçoit des lignes déjà ordonnées
+        self.table_marches_tranches.sortByColumn(0, Qt.AscendingOrder)
         self.table_marches_tranches.setSelectionBehavior(QTableView.SelectRows)
         self.table_marches_tranches.setSelectionMode(QTableView.SingleSelection)
-        self.table_marches_tranches.setWordWrap(True)
+        # Texte tronqué (texte complet en infobulle) et hauteur de ligne fixe :
+        # Qt n'a pas à mesurer chaque ligne lors du défilement
+        self.table_marches_tranches.setWordWrap(False)
+        self.table_marches_tranches.setTextElideMode(Qt.ElideRight)
+        self.table_marches_tranches.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
 
         header_marches_tranches = self.table_marches_tranches.horizontalHeader()
         header_marches_tranches.setDefaultAlignment(Qt.AlignCenter)
         header_marches_tranches.setStyleSheet(
             "QHeaderView::section { font-weight: bold; background-color: #d4edda; padding: 4px; }"
         )
-        header_marches_tranches.setSectionResizeMode(QHeaderView.ResizeToContents)
+        # Mode de redimensionnement optimisé avec largeurs contrôlées
+        header_marches_tranches.setSectionResizeMode(QHeaderView.Interactive)
         header_marches_tranches.setStretchLastSection(True)
 
+        # Définir des largeurs initiales optimales pour chaque colonne
+        # Colonnes: Marché, Tranche, Montant initial, Service fait, Payé, % consommé
+        self.table_marches_tranches.setColumnWidth(0, 120)  # Marché
+        self.table_marches_tranches.setColumnWidth(1, 250)  # Tranche
+        self.table_marches_tranches.setColumnWidth(2, 130)  # Montant initial
+        self.table_marches_tranches.setColumnWidth(3, 130)  # Service fait
+        self.table_marches_tranches.setColumnWidth(4, 130)  # Payé
+        self.table_marches_tranches.setColumnWidth(5, 90)   # % consommé
+
         marches_layout.addWidget(self.table_marches_tranches)
 
         # Ajouter l'onglet
@@ -2557,15 +3747,13 @@ class MainWindow(QMainWindow):
         self.edit_filtre_operation.setPlaceholderText("Filtrer par code opération...")
         self.edit_filtre_operation.setClearButtonEnabled(True)
         self.edit_filtre_operation.setMaximumWidth(200)
-        self.edit_filtre_operation.textChanged.connect(
-            lambda text: self.operations_proxy.setOperationFilter(text)
-        )
+        self._debounce_line_edit(self.edit_filtre_operation, self.operations_proxy.setOperationFilter)
         filtre_operation_layout.addWidget(self.edit_filtre_operation)
 
         # Bouton d'export suivi financier
-        btn_export_operation = QPushButton("📊 Exporter suivi financier")
-        btn_export_operation.setMaximumWidth(200)
-        btn_export_operation.setStyleSheet("""
+        self.btn_export_operation = QPushButton("📊 Exporter suivi financier")
+        self.btn_export_operation.setMaximumWidth(200)
+        self.btn_export_operation.setStyleSheet("""
             QPushButton {
                 background-color: #28a745;
                 color: white;
@@ -2581,13 +3769,13 @@ class MainWindow(QMainWindow):
                 background-color: #1e7e34;
             }
         """)
-        btn_export_operation.clicked.connect(self.export_suivi_financier_operation)
-        filtre_operation_layout.addWidget(btn_export_operation)
+        self.btn_export_operation.clicked.connect(self.export_suivi_financier_operation)
+        filtre_operation_layout.addWidget(self.btn_export_operation)
 
         # Bouton d'export spécifique 2020_14G3P
-        btn_export_operation_2020 = QPushButton("📊 Export 2020_14G3P")
-        btn_export_operation_2020.setMaximumWidth(200)
-        btn_export_operation_2020.setStyleSheet("""
+        self.btn_export_operation_2020 = QPushButton("📊 Export 2020_14G3P")
+        self.btn_export_operation_2020.setMaximumWidth(200)
+        self.btn_export_operation_2020.setStyleSheet("""
             QPushButton {
                 background-color: #6f42c1;
                 color: white;
@@ -2603,55 +3791,16 @@ class MainWindow(QMainWindow):
                 background-color: #4e2b8a;
             }
         """)
-        btn_export_operation_2020.clicked.connect(self.export_suivi_financier_2020_14G3P)
-        filtre_operation_layout.addWidget(btn_export_operation_2020)
+        self.btn_export_operation_2020.clicked.connect(self.export_suivi_financier_2020_14G3P)
+        filtre_operation_layout.addWidget(self.btn_export_operation_2020)
 
         filtre_operation_layout.addStretch()
 
         operations_layout.addWidget(filtre_operation_widget)
 
-        # Table opérations
-        self.table_operations = QTableView()
-        self.table_operations.setModel(self.operations_proxy)
-        self.table_operations.setSortingEnabled(True)
-        self.table_operations.setSelectionBehavior(QTableView.SelectRows)
-        self.table_operations.setSelectionMode(QTableView.SingleSelection)
-        self.table_operations.setWordWrap(True)
-
-        # Optimisation de la hauteur des lignes (3 lignes max)
-        self.table_operations.verticalHeader().setDefaultSectionSize(60)  # ~3 lignes de texte
-
-        # Connecter le double-clic pour afficher l'historique de l'opération
-        self.table_operations.doubleClicked.connect(self.on_operation_double_clicked)
-
-        header_operations_table = self.table_operations.horizontalHeader()
-        header_operations_table.setDefaultAlignment(Qt.AlignCenter)
-        header_operations_table.setStyleSheet(
-            "QHeaderView::section { font-weight: bold; background-color: #fff3cd; padding: 4px; }"
-        )
-
-        # Mode de redimensionnement optimisé avec largeurs contrôlées
-        header_operations_table.setSectionResizeMode(QHeaderView.Interactive)
-
-        # Définir des largeurs initiales optimales pour chaque colonne
-        # Colonnes: Opération, Nb lots, Marchés, Libellé, Fournisseur, Montant initial, Avenants, SF, Payé, Reste réaliser, Reste mandater, %
-        self.table_operations.setColumnWidth(0, 120)  # Opération
-        self.table_operations.setColumnWidth(1, 60)   # Nb lots
-        self.table_operations.setColumnWidth(2, 250)  # Marchés (word wrap sur 3 lignes)
-        self.table_operations.setColumnWidth(3, 300)  # Libellé (word wrap sur 3 lignes)
-        self.table_operations.setColumnWidth(4, 200)  # Fournisseur (word wrap)
-        self.table_operations.setColumnWidth(5, 120)  # Montant initial
-        self.table_operations.setColumnWidth(6, 70)   # Avenants
-        self.table_operations.setColumnWidth(7, 120)  # Service fait
-        self.table_operations.setColumnWidth(8, 120)  # Payé
-        self.table_operations.setColumnWidth(9, 120)  # Reste à réaliser
-        self.table_operations.setColumnWidth(10, 120) # Reste à mandater
-        self.table_operations.setColumnWidth(11, 80)  # % consommé
-
-        # Permettre le redimensionnement manuel par l'utilisateur
-        header_operations_table.setStretchLastSection(False)
-
-        operations_layout.addWidget(self.table_operations)
+        # Table opérations : construite à la première ouverture de l'onglet
+        self.table_operations = None
+        self._add_lazy_table(operations_widget, operations_layout, self._build_operations_table)
 
         self.tabs.addTab(operations_widget, "📦 Opérations")
 
@@ -2685,53 +3834,31 @@ class MainWindow(QMainWindow):
         self.edit_filtre_historique.setPlaceholderText("Filtrer par code marché...")
         self.edit_filtre_historique.setClearButtonEnabled(True)
         self.edit_filtre_historique.setMaximumWidth(200)
-        self.edit_filtre_historique.textChanged.connect(
-            lambda text: self.historique_proxy.setMarcheFilter(text)
-        )
+        self._debounce_line_edit(self.edit_filtre_historique, self.historique_proxy.setMarcheFilter)
         filtre_historique_layout.addWidget(self.edit_filtre_historique)
         filtre_historique_layout.addStretch()
 
         historique_layout.addWidget(filtre_historique_widget)
 
-        # Table historique
-        self.table_historique = QTableView()
-        self.table_historique.setModel(self.historique_proxy)
-        self.table_historique.setSortingEnabled(True)
-        self.table_historique.setSelectionBehavior(QTableView.SelectRows)
-        self.table_historique.setSelectionMode(QTableView.ExtendedSelection)
-        self.table_historique.setWordWrap(True)
-
-        # Optimisation de la hauteur des lignes (3 lignes max)
-        self.table_historique.verticalHeader().setDefaultSectionSize(60)  # ~3 lignes de texte
-
-        header_historique_table = self.table_historique.horizontalHeader()
-        header_historique_table.setDefaultAlignment(Qt.AlignCenter)
-        header_historique_table.setStyleSheet(
-            "QHeaderView::section { font-weight: bold; background-color: #d1ecf1; padding: 4px; }"
-        )
-
-        # Mode de redimensionnement optimisé avec largeurs contrôlées
-        header_historique_table.setSectionResizeMode(QHeaderView.Interactive)
-
-        # Définir des largeurs initiales optimales pour chaque colonne
-        # Colonnes: Marché, Fournisseur, Date SF, N° Facture, Libellé, Montant SF, Montant TTC, N° Mandat, Statut
-        self.table_historique.setColumnWidth(0, 120)  # Marché
-        self.table_historique.setColumnWidth(1, 200)  # Fournisseur (word wrap)
-        self.table_historique.setColumnWidth(2, 90)   # Date SF
-        self.table_historique.setColumnWidth(3, 100)  # N° Facture
-        self.table_historique.setColumnWidth(4, 350)  # Libellé (word wrap sur 3 lignes)
-        self.table_historique.setColumnWidth(5, 110)  # Montant SF
-        self.table_historique.setColumnWidth(6, 110)  # Montant TTC
-        self.table_historique.setColumnWidth(7, 100)  # N° Mandat
-        self.table_historique.setColumnWidth(8, 120)  # Statut
-
-        # Permettre le redimensionnement manuel par l'utilisateur
-        header_historique_table.setStretchLastSection(False)
-
-        historique_layout.addWidget(self.table_historique)
+        # Table historique : construite à la première ouverture de l'onglet
+        self.table_historique = None
+        self._add_lazy_table(historique_widget, historique_layout, self._build_historique_table)
 
         self.tabs.addTab(historique_widget, "📜 Historique")
 
+        # Valeurs distinctes des colonnes filtrables, invalidées à chaque import
+        self._distinct_cache = {}
+        # Onglets dont le modèle est à recharger à leur prochaine ouverture
+        self._dirty_models = {"rappels"}
+        # Onglet courant (mis à jour par on_tab_changed)
+        self._current_tab = Tab.COMMANDES
+        # Rafraîchissement différé des listes de filtres : les demandes rapprochées
+        # (changements d'onglet, fin d'import) relancent le délai, une seule exécution
+        self._filter_refresh_timer = QTimer(self)
+        self._filter_refresh_timer.setSingleShot(True)
+        self._filter_refresh_timer.setInterval(50)
+        self._filter_refresh_timer.timeout.connect(self._refresh_filter_combos)
+
         # Toolbar
         self.status_filter_combo = None
         self.facturation_filter_combo = None
@@ -2743,7 +3870,9 @@ class MainWindow(QMainWindow):
 
         # Timer rappels
         self.reminder_timer = QTimer(self)
-        self.reminder_timer.setInterval(self._get_reminder_interval() * 60 * 1000)
+        self._reminder_interval_ms = self._get_reminder_interval() * 60 * 1000
+        self._reminder_reschedule_pending = False
+        self.reminder_timer.setInterval(self._reminder_interval_ms)
         self.reminder_timer.timeout.connect(self.check_reminders)
         self.reminder_timer.start()
 
@@ -2760,12 +3889,27 @@ class MainWindow(QMainWindow):
                 "Ensuite, utilisez 'Import incrémental' pour importer les données."
             )
 
-        # resize
+        # Ajustement des colonnes et badge des rappels après le premier affichage
+        QTimer.singleShot(0, self._post_init_finalize)
+
+    def _post_init_finalize(self):
+        """Finalise l'initialisation une fois la fenêtre affichée."""
         self.resize_all()
-        
-        # Mettre à jour le badge des rappels
         self._update_rappels_badge()
 
+    def _add_toolbar_button(self, toolbar, action, object_name):
+        """
+        Ajoute `action` à la barre via un QToolButton nommé avant son insertion :
+        la feuille de style (sélecteurs [objectName=...]) est résolue une seule fois.
+        """
+        btn = QToolButton(toolbar)
+        btn.setDefaultAction(action)
+        btn.setObjectName(object_name)
+        btn.setAutoRaise(True)
+        btn.setIconSize(toolbar.iconSize())
+        toolbar.addWidget(btn)
+        return btn
+
     def _init_toolbar(self):
         # ========== LIGNE 1 : BOUTONS D'ACTION MODERNISÉS ==========
         tb1 = QToolBar("Actions")
@@ -2773,98 +3917,7 @@ class MainWindow(QMainWindow):
         tb1.setIconSize(QIcon().actualSize(tb1.iconSize()) * 1.2)
         
         # Style moderne avec boutons colorés, padding généreux et ombres 3D
-        tb1.setStyleSheet("""
-            QToolBar {
-                background-color: #ffffff;
-                border-bottom: 2px solid #e0e0e0;
-                padding: 6px;
-                spacing: 4px;
-            }
-            QToolButton {
-                background-color: #0078d4;
-                color: white;
-                border: none;
-                border-radius: 4px;
-                padding: 4px 10px;
-                font-weight: bold;
-                font-size: 8pt;
-                min-height: 24px;
-                min-width: 0px;
-            }
-            QToolButton:hover {
-                background-color: #005a9e;
-            }
-            QToolButton:pressed {
-                background-color: #004578;
-            }
-            QToolButton[objectName="selection_btn"] {
-                background-color: #6c757d;
-            }
-            QToolButton[objectName="selection_btn"]:hover {
-                background-color: #545b62;
-            }
-            QToolButton[objectName="selection_btn"]:pressed {
-                background-color: #3d4349;
-            }
-            QToolButton[objectName="action_envoyee"] {
-                background-color: #28a745;
-            }
-            QToolButton[objectName="action_envoyee"]:hover {
-                background-color: #218838;
-            }
-            QToolButton[objectName="action_envoyee"]:pressed {
-                background-color: #1e7e34;
-            }
-            QToolButton[objectName="action_suivre"] {
-                background-color: #fd7e14;
-            }
-            QToolButton[objectName="action_suivre"]:hover {
-                background-color: #e8590c;
-            }
-            QToolButton[objectName="action_suivre"]:pressed {
-                background-color: #bd4b00;
-            }
-            QToolButton[objectName="action_rappel"] {
-                background-color: #17a2b8;
-            }
-            QToolButton[objectName="action_rappel"]:hover {
-                background-color: #138496;
-            }
-            QToolButton[objectName="action_rappel"]:pressed {
-                background-color: #0f6674;
-            }
-            QToolButton[objectName="config_btn"] {
-                background-color: #6c757d;
-            }
-            QToolButton[objectName="config_btn"]:hover {
-                background-color: #545b62;
-            }
-            QToolButton[objectName="config_btn"]:pressed {
-                background-color: #3d4349;
-            }
-            QToolButton[objectName="export_btn"] {
-                background-color: #6610f2;
-            }
-            QToolButton[objectName="export_btn"]:hover {
-                background-color: #5a0cd9;
-            }
-            QToolButton[objectName="export_btn"]:pressed {
-                background-color: #4a09b3;
-            }
-            QToolButton[objectName="test_rappels_btn"] {
-                background-color: #20c997;
-            }
-            QToolButton[objectName="test_rappels_btn"]:hover {
-                background-color: #1ab386;
-            }
-            QToolButton[objectName="test_rappels_btn"]:pressed {
-                background-color: #148f6a;
-            }
-            QToolButton::menu-indicator {
-                image: none;
-                width: 0px;
-            }
-        """)
+        tb1.setStyleSheet(_TB1_QSS)
         self.addToolBar(tb1)
 
         # Groupe 1: Import de données (BLEU)
@@ -2876,11 +3929,8 @@ class MainWindow(QMainWindow):
         act_conf = QAction("⚙ Configuration…", self)
         act_conf.setToolTip("Ouvrir la configuration des chemins de fichiers et des paramètres de rappel")
         act_conf.triggered.connect(self.open_config)
-        tb1.addAction(act_conf)
         # Appliquer le style config au bouton
-        for widget in tb1.children():
-            if isinstance(widget, QWidget) and widget.property("text") == "⚙ Configuration…":
-                widget.setObjectName("config_btn")
+        self._add_toolbar_button(tb1, act_conf, "config_btn")
 
         # Séparateur élégant
         separator1 = tb1.addSeparator()
@@ -2889,12 +3939,12 @@ class MainWindow(QMainWindow):
         act_sel_all = QAction("☑ Tout sélectionner", self)
         act_sel_all.setToolTip("Sélectionner toutes les lignes du tableau actif")
         act_sel_all.triggered.connect(self.select_all_current_tab)
-        tb1.addAction(act_sel_all)
+        self._add_toolbar_button(tb1, act_sel_all, "selection_btn")
 
         act_sel_clear = QAction("☐ Tout désélectionner", self)
         act_sel_clear.setToolTip("Désélectionner toutes les lignes du tableau actif")
         act_sel_clear.triggered.connect(self.clear_selection_current_tab)
-        tb1.addAction(act_sel_clear)
+        self._add_toolbar_button(tb1, act_sel_clear, "selection_btn")
 
         # Séparateur élégant
         separator2 = tb1.addSeparator()
@@ -2903,22 +3953,22 @@ class MainWindow(QMainWindow):
         act_sent = QAction("✉ Marquer envoyée", self)
         act_sent.setToolTip("Marquer les commandes sélectionnées comme envoyées au fournisseur")
         act_sent.triggered.connect(self.mark_selected_sent)
-        tb1.addAction(act_sent)
+        self._add_toolbar_button(tb1, act_sent, "action_envoyee")
 
         act_follow = QAction("● Marquer à suivre", self)
         act_follow.setToolTip("Marquer les commandes sélectionnées comme nécessitant un suivi")
         act_follow.triggered.connect(self.mark_selected_follow)
-        tb1.addAction(act_follow)
+        self._add_toolbar_button(tb1, act_follow, "action_suivre")
 
         act_resched = QAction("⏰ Reprogrammer rappel", self)
         act_resched.setToolTip("Reprogrammer le rappel pour les commandes sélectionnées")
         act_resched.triggered.connect(self.reschedule_selected)
-        tb1.addAction(act_resched)
+        self._add_toolbar_button(tb1, act_resched, "action_rappel")
         
         act_test_rappels = QAction("🧪 Test Rappels", self)
         act_test_rappels.setToolTip("Tester le système de rappels (mode test sans modification)")
         act_test_rappels.triggered.connect(self.test_reminders_dialog)
-        tb1.addAction(act_test_rappels)
+        self._add_toolbar_button(tb1, act_test_rappels, "test_rappels_btn")
         
         # Séparateur élégant
         separator3 = tb1.addSeparator()
@@ -2952,38 +4002,11 @@ class MainWindow(QMainWindow):
         act_export = QAction("📥 Exporter", self)
         act_export.setToolTip("Exporter le tableau actif en PDF ou Excel")
         act_export.setMenu(export_menu)
-        tb1.addAction(act_export)
+        self.act_export = act_export
         
         # Configurer le bouton pour afficher le menu déroulant
-        for widget in tb1.children():
-            if hasattr(widget, 'defaultAction'):
-                action = widget.defaultAction()
-                if action and action.text() == "📥 Exporter":
-                    from PyQt5.QtWidgets import QToolButton
-                    widget.setPopupMode(QToolButton.InstantPopup)
-                    widget.setObjectName("export_btn")
-                    break
-        
-        # Appliquer les styles personnalisés aux boutons via objectName
-        btn_index = 0
-        for widget in tb1.children():
-            if hasattr(widget, 'defaultAction'):
-                action = widget.defaultAction()
-                if action:
-                    text = action.text()
-                    if "sélectionner" in text or "désélectionner" in text:
-                        widget.setObjectName("selection_btn")
-                    elif "envoyée" in text:
-                        widget.setObjectName("action_envoyee")
-                    elif "suivre" in text:
-                        widget.setObjectName("action_suivre")
-                    elif "rappel" in text.lower() and "test" not in text.lower():
-                        widget.setObjectName("action_rappel")
-                    elif "Test Rappels" in text:
-                        widget.setObjectName("test_rappels_btn")
-                    elif "Configuration" in text:
-                        widget.setObjectName("config_btn")
-                    widget.setStyle(widget.style())  # Force refresh du style
+        export_btn = self._add_toolbar_button(tb1, act_export, "export_btn")
+        export_btn.setPopupMode(QToolButton.InstantPopup)
 
         # ========== SAUT DE LIGNE ==========
         self.addToolBarBreak(Qt.TopToolBarArea)
@@ -2992,32 +4015,7 @@ class MainWindow(QMainWindow):
         tb2 = QToolBar("Filtres")
         tb2.setMovable(False)
         # Style moderne avec fond gris clair, coins arrondis et bordure (compact)
-        tb2.setStyleSheet("""
-            QToolBar {
-                background-color: #f5f5f5;
-                border: 1px solid #d0d0d0;
-                border-radius: 6px;
-                padding: 4px;
-                spacing: 3px;
-            }
-            QLabel {
-                font-weight: bold;
-                padding: 0px 3px;
-            }
-            QComboBox {
-                border: 1px solid #c0c0c0;
-                border-radius: 4px;
-                padding: 2px 5px;
-                background-color: white;
-                min-height: 20px;
-            }
-            QComboBox:hover {
-                border: 1px solid #0078d4;
-            }
-            QComboBox::drop-down {
-                border: none;
-            }
-        """)
+        tb2.setStyleSheet(_TB2_QSS)
         self.addToolBar(Qt.TopToolBarArea, tb2)
         
         # Label principal "Filtres:" en gras
@@ -3061,8 +4059,11 @@ class MainWindow(QMainWindow):
         self.label_fournisseur = QLabel("<b>Fournisseur:</b>", self)
         tb2.addWidget(self.label_fournisseur)
         self.fournisseur_filter_combo = QComboBox(self)
-        self.fournisseur_filter_combo.setSizeAdjustPolicy(QComboBox.AdjustToContents)
+        # Largeur fixe : pas de recalcul de la taille à chaque item ajouté
+        self.fournisseur_filter_combo.setSizeAdjustPolicy(QComboBox.AdjustToMinimumContentsLengthWithIcon)
         self.fournisseur_filter_combo.setMinimumContentsLength(12)
+        self.fournisseur_filter_combo.setMinimumWidth(180)
+        self.fournisseur_filter_combo.view().setTextElideMode(Qt.ElideRight)
         self.fournisseur_filter_combo.currentTextChanged.connect(self.on_fournisseur_filter_changed)
         tb2.addWidget(self.fournisseur_filter_combo)
 
@@ -3075,8 +4076,11 @@ class MainWindow(QMainWindow):
         self.marche_label = QLabel("<b>Marché:</b>", self)
         tb2.addWidget(self.marche_label)
         self.marche_filter_combo = QComboBox(self)
-        self.marche_filter_combo.setSizeAdjustPolicy(QComboBox.AdjustToContents)
+        # Largeur fixe : pas de recalcul de la taille à chaque item ajouté
+        self.marche_filter_combo.setSizeAdjustPolicy(QComboBox.AdjustToMinimumContentsLengthWithIcon)
         self.marche_filter_combo.setMinimumContentsLength(8)
+        self.marche_filter_combo.setMinimumWidth(120)
+        self.marche_filter_combo.view().setTextElideMode(Qt.ElideRight)
         self.marche_filter_combo.currentTextChanged.connect(self.on_marche_filter_changed)
         tb2.addWidget(self.marche_filter_combo)
 
@@ -3092,9 +4096,12 @@ class MainWindow(QMainWindow):
         self.article_fonction_label = QLabel(f"<b>{self.article_fonction_label_base}:</b>", self)
         tb2.addWidget(self.article_fonction_label)
         self.article_fonction_filter = CheckableComboBox(self)
-        self.article_fonction_filter.setSizeAdjustPolicy(QComboBox.AdjustToContents)
+        # Largeur fixe : pas de recalcul de la taille à chaque item ajouté
+        self.article_fonction_filter.setSizeAdjustPolicy(QComboBox.AdjustToMinimumContentsLengthWithIcon)
         self.article_fonction_filter.setMinimumContentsLength(12)
-        self.article_fonction_filter.currentIndexChanged.connect(self.on_article_fonction_changed)
+        self.article_fonction_filter.setMinimumWidth(180)
+        self.article_fonction_filter.view().setTextElideMode(Qt.ElideRight)
+        self.article_fonction_filter.currentIndexChanged.connect(partial(self._on_multi_filter_changed, "article_fonction"))
         tb2.addWidget(self.article_fonction_filter)
         
         # Séparateur visuel
@@ -3107,9 +4114,12 @@ class MainWindow(QMainWindow):
         self.article_nature_label = QLabel(f"<b>{self.article_nature_label_base}:</b>", self)
         tb2.addWidget(self.article_nature_label)
         self.article_nature_filter = CheckableComboBox(self)
-        self.article_nature_filter.setSizeAdjustPolicy(QComboBox.AdjustToContents)
+        # Largeur fixe : pas de recalcul de la taille à chaque item ajouté
+        self.article_nature_filter.setSizeAdjustPolicy(QComboBox.AdjustToMinimumContentsLengthWithIcon)
         self.article_nature_filter.setMinimumContentsLength(12)
-        self.article_nature_filter.currentIndexChanged.connect(self.on_article_nature_changed)
+        self.article_nature_filter.setMinimumWidth(180)
+        self.article_nature_filter.view().setTextElideMode(Qt.ElideRight)
+        self.article_nature_filter.currentIndexChanged.connect(partial(self._on_multi_filter_changed, "article_nature"))
         tb2.addWidget(self.article_nature_filter)
         
         # Séparateur visuel
@@ -3122,10 +4132,23 @@ class MainWindow(QMainWindow):
         self.service_emetteur_label = QLabel(f"<b>{self.service_emetteur_label_base}:</b>", self)
         tb2.addWidget(self.service_emetteur_label)
         self.service_emetteur_filter = CheckableComboBox(self)
-        self.service_emetteur_filter.setSizeAdjustPolicy(QComboBox.AdjustToContents)
+        # Largeur fixe : pas de recalcul de la taille à chaque item ajouté
+        self.service_emetteur_filter.setSizeAdjustPolicy(QComboBox.AdjustToMinimumContentsLengthWithIcon)
         self.service_emetteur_filter.setMinimumContentsLength(12)
-        self.service_emetteur_filter.currentIndexChanged.connect(self.on_service_emetteur_changed)
+        self.service_emetteur_filter.setMinimumWidth(180)
+        self.service_emetteur_filter.view().setTextElideMode(Qt.ElideRight)
+        self.service_emetteur_filter.currentIndexChanged.connect(partial(self._on_multi_filter_changed, "service_emetteur"))
         tb2.addWidget(self.service_emetteur_filter)
+
+        # Filtres multiples : combo, libellé, texte de base et setter du proxy Commandes
+        self._multi_filters = {
+            "article_fonction": (self.article_fonction_filter, self.article_fonction_label,
+                                 self.article_fonction_label_base, self.cmd_proxy.setArticleFonctionFilter),
+            "article_nature": (self.article_nature_filter, self.article_nature_label,
+                               self.article_nature_label_base, self.cmd_proxy.setArticleNatureFilter),
+            "service_emetteur": (self.service_emetteur_filter, self.service_emetteur_label,
+                                 self.service_emetteur_label_base, self.cmd_proxy.setServiceEmetteurFilter),
+        }
         
         # Séparateur visuel avant le bouton de réinitialisation
         self.sep8 = QLabel("||", self)
@@ -3143,33 +4166,7 @@ class MainWindow(QMainWindow):
         # ========== LIGNE 3 : RECHERCHE PAR NUMÉRO ==========
         tb3 = QToolBar("Recherche")
         tb3.setMovable(False)
-        tb3.setStyleSheet("""
-            QToolBar {
-                background-color: #e8f4f8;
-                border: 1px solid #b0d0e0;
-                border-radius: 6px;
-                padding: 4px;
-                spacing: 3px;
-            }
-            QLabel {
-                font-weight: bold;
-                padding: 0px 3px;
-            }
-            QLineEdit {
-                border: 1px solid #c0c0c0;
-                border-radius: 4px;
-                padding: 2px 5px;
-                background-color: white;
-                min-height: 20px;
-                min-width: 150px;
-            }
-            QLineEdit:hover {
-                border: 1px solid #0078d4;
-            }
-            QLineEdit:focus {
-                border: 2px solid #0078d4;
-            }
-        """)
+        tb3.setStyleSheet(_TB3_QSS)
         self.addToolBar(Qt.TopToolBarArea, tb3)
 
         # Label principal "Recherche:" en gras
@@ -3187,7 +4184,7 @@ class MainWindow(QMainWindow):
         self.search_num_commande = QLineEdit(self)
         self.search_num_commande.setPlaceholderText("Rechercher un n° de commande...")
         self.search_num_commande.setClearButtonEnabled(True)
-        self.search_num_commande.textChanged.connect(self.on_search_num_commande_changed)
+        self._debounce_line_edit(self.search_num_commande, self.on_search_num_commande_changed)
         tb3.addWidget(self.search_num_commande)
 
         # Séparateur visuel
@@ -3201,7 +4198,7 @@ class MainWindow(QMainWindow):
         self.search_num_facture = QLineEdit(self)
         self.search_num_facture.setPlaceholderText("Rechercher un n° de facture...")
         self.search_num_facture.setClearButtonEnabled(True)
-        self.search_num_facture.textChanged.connect(self.on_search_num_facture_changed)
+        self._debounce_line_edit(self.search_num_facture, self.on_search_num_facture_changed)
         tb3.addWidget(self.search_num_facture)
 
         # Espace flexible pour pousser les éléments à gauche
@@ -3210,7 +4207,9 @@ class MainWindow(QMainWindow):
         # Sauvegarder la référence à la toolbar de recherche
         self.search_toolbar = tb3
 
-        # Initialiser les filtres pour le premier onglet (APRÈS création des widgets)
+        # Initialiser les filtres pour le premier onglet (APRÈS création des widgets).
+        # Les listes déroulantes (requêtes DISTINCT) sont remplies une fois la
+        # boucle d'événements démarrée, pour ne pas retarder l'affichage.
         self.on_tab_changed(0)
 
     def _init_tray(self):
@@ -3240,14 +4239,94 @@ class MainWindow(QMainWindow):
         """Sauvegarde immédiate des logs d'erreur."""
         if self.error_log:
             try:
-                log_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "suivi_log.txt")
-                with open(log_path, "a", encoding="utf-8") as f:
-                    for line in self.error_log:
-                        f.write(line + "\n")
+                with open(self._log_path, "a", encoding="utf-8") as f:
+                    f.write("\n".join(self.error_log) + "\n")
                 self.error_log.clear()
             except Exception:
                 pass
 
+    def _fetch_db_rows(self):
+        """
+        Lit commandes, factures et synthèse de facturation en parallèle.
+
+        Chaque lecture utilise sa propre connexion SQLite (une par thread) ; les
+        modèles Qt sont ensuite alimentés depuis le thread principal.
+        Retourne (commandes, factures, synthese).
+        """
+        def fetch(method):
+            db = self.db.for_thread()
+            try:
+                return list(method(db))
+            finally:
+                db.close()
+
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            futures = [
+                executor.submit(fetch, Database.fetch_all_commandes),
+                executor.submit(fetch, Database.fetch_all_factures),
+                executor.submit(fetch, Database.fetch_facturation_synthese),
+            ]
+            return tuple(f.result() for f in futures)
+
+    def refresh_db_models(self):
+        """
+        Marque Commandes, Rappels, Factures et Facturation comme à recharger.
+
+        Seul l'onglet affiché est rechargé immédiatement ; les autres le sont
+        à leur prochaine ouverture (voir _flush_dirty).
+        """
+        self._dirty_models.update(("cmd", "rappels", "fact", "synth"))
+        self._flush_dirty(self.tabs.currentIndex())
+
+    def _flush_dirty(self, index):
+        """Recharge le modèle de l'onglet `index` s'il a été marqué à recharger."""
+        tab_widget = self.tabs.widget(index)
+        if tab_widget is self.table_cmd and "cmd" in self._dirty_models:
+            self._dirty_models.discard("cmd")
+            self.cmd_model.refresh()
+            self._fit_columns(self.table_cmd)
+        elif tab_widget is self.table_rappels and "rappels" in self._dirty_models:
+            self._dirty_models.discard("rappels")
+            self.refresh_rappels_tab()
+        elif tab_widget is self.table_fact and "fact" in self._dirty_models:
+            self._dirty_models.discard("fact")
+            self.fact_model.refresh()
+            self._fit_columns(self.table_fact)
+        elif tab_widget is self.table_synth and "synth" in self._dirty_models:
+            self._dirty_models.discard("synth")
+            self.synth_model.refresh()
+            self._fit_columns(self.table_synth)
+
+    def _debounce_line_edit(self, edit, slot, delay_ms=200):
+        """
+        Relie textChanged d'un champ de filtre à `slot` via un QTimer mono-coup.
+
+        Le filtrage du proxy n'est lancé qu'après une pause de saisie de `delay_ms`,
+        au lieu de refiltrer toutes les lignes à chaque frappe. Un timer par champ
+        pour que les filtres indépendants ne s'annulent pas entre eux.
+        """
+        timer = QTimer(edit)
+        timer.setSingleShot(True)
+        timer.setInterval(delay_ms)
+        timer.timeout.connect(lambda: slot(edit.text()))
+        edit.textChanged.connect(lambda _text: timer.start())
+        return timer
+
+    @contextmanager
+    def _batch_filters(self):
+        """
+        Regroupe plusieurs changements de filtres : chaque proxy n'est
+        refiltré qu'une fois, à la sortie du bloc.
+        """
+        proxies = (self.cmd_proxy, self.fact_proxy, self.synth_proxy)
+        for proxy in proxies:
+            proxy.suspend_invalidate()
+        try:
+            yield
+        finally:
+            for proxy in proxies:
+                proxy.resume_invalidate()
+
     def _get_reminder_interval(self):
         val = self.db.get_config("reminder_interval_minutes", "5")
         try:
@@ -3258,132 +4337,264 @@ class MainWindow(QMainWindow):
 
     # ------------ Gestion des onglets et filtres ------------
 
+    def _add_lazy_table(self, tab_widget, layout, build):
+        """
+        Réserve dans `layout` l'emplacement d'une table construite à la demande.
+
+        `build()` doit créer la table (modèle branché, en-têtes configurés) et la
+        renvoyer ; il est appelé par `on_tab_changed` à la première ouverture de
+        l'onglet, et la table remplace alors le widget provisoire.
+        """
+        placeholder = QWidget()
+        layout.addWidget(placeholder)
+        tab_widget.setProperty("_build", (layout, placeholder, build))
+
+    def _ensure_tab_built(self, index):
+        """Construit le contenu différé de l'onglet `index` s'il ne l'a pas encore été."""
+        tab_widget = self.tabs.widget(index)
+        if tab_widget is None:
+            return
+        pending = tab_widget.property("_build")
+        if not pending:
+            return
+        tab_widget.setProperty("_build", None)
+        layout, placeholder, build = pending
+        layout.replaceWidget(placeholder, build())
+        placeholder.deleteLater()
+
+    def _build_operations_table(self):
+        # Table opérations
+        self.table_operations = QTableView()
+        self.table_operations.setModel(self.operations_proxy)
+        self.table_operations.setItemDelegate(StatusDelegate(CONSOMMATION_COLORS, self.table_operations))
+        # Retour à la ligne limité aux colonnes Marchés, Libellé et Fournisseur
+        wrap_delegate = WrapStatusDelegate(CONSOMMATION_COLORS, self.table_operations)
+        for col in (2, 3, 4):
+            self.table_operations.setItemDelegateForColumn(col, wrap_delegate)
+        self.table_operations.setSortingEnabled(True)
+        # Tri par défaut aligné sur l'ordre fourni par MarchesAnalyzer (opération)
+        self.table_operations.sortByColumn(0, Qt.AscendingOrder)
+        self.table_operations.setSelectionBehavior(QTableView.SelectRows)
+        self.table_operations.setSelectionMode(QTableView.SingleSelection)
+        self.table_operations.setWordWrap(False)
+
+        # Optimisation de la hauteur des lignes (3 lignes max)
+        # Hauteur fixe : pas de mesure du texte par ligne ; au-delà, le texte est
+        # tronqué et disponible en infobulle
+        self.table_operations.setTextElideMode(Qt.ElideRight)
+        self.table_operations.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.table_operations.verticalHeader().setDefaultSectionSize(60)  # ~3 lignes de texte
+
+        # Connecter le double-clic pour afficher l'historique de l'opération
+        self.table_operations.doubleClicked.connect(self.on_operation_double_clicked)
+
+        header_operations_table = self.table_operations.horizontalHeader()
+        header_operations_table.setDefaultAlignment(Qt.AlignCenter)
+        header_operations_table.setStyleSheet(
+            "QHeaderView::section { font-weight: bold; background-color: #fff3cd; padding: 4px; }"
+        )
+
+        # Mode de redimensionnement optimisé avec largeurs contrôlées
+        header_operations_table.setSectionResizeMode(QHeaderView.Interactive)
+
+        # Définir des largeurs initiales optimales pour chaque colonne
+        # Colonnes: Opération, Nb lots, Marchés, Libellé, Fournisseur, Montant initial, Avenants, SF, Payé, Reste réaliser, Reste mandater, %
+        self.table_operations.setColumnWidth(0, 120)  # Opération
+        self.table_operations.setColumnWidth(1, 60)   # Nb lots
+        self.table_operations.setColumnWidth(2, 250)  # Marchés (word wrap sur 3 lignes)
+        self.table_operations.setColumnWidth(3, 300)  # Libellé (word wrap sur 3 lignes)
+        self.table_operations.setColumnWidth(4, 200)  # Fournisseur (word wrap)
+        self.table_operations.setColumnWidth(5, 120)  # Montant initial
+        self.table_operations.setColumnWidth(6, 70)   # Avenants
+        self.table_operations.setColumnWidth(7, 120)  # Service fait
+        self.table_operations.setColumnWidth(8, 120)  # Payé
+        self.table_operations.setColumnWidth(9, 120)  # Reste à réaliser
+        self.table_operations.setColumnWidth(10, 120) # Reste à mandater
+        self.table_operations.setColumnWidth(11, 80)  # % consommé
+
+        # Permettre le redimensionnement manuel par l'utilisateur
+        header_operations_table.setStretchLastSection(False)
+
+        return self.table_operations
+
+    def _build_historique_table(self):
+        # Table historique
+        self.table_historique = QTableView()
+        self.table_historique.setModel(self.historique_proxy)
+        self.table_historique.setItemDelegate(StatusDelegate(HISTORIQUE_STATUS_COLORS, self.table_historique))
+        # Retour à la ligne limité aux colonnes Fournisseur et Libellé
+        wrap_delegate = WrapStatusDelegate(HISTORIQUE_STATUS_COLORS, self.table_historique)
+        for col in (1, 4):
+            self.table_historique.setItemDelegateForColumn(col, wrap_delegate)
+        self.table_historique.setSortingEnabled(True)
+        # Tri par défaut aligné sur l'ordre fourni par MarchesAnalyzer (marché puis date, décroissants)
+        self.table_historique.sortByColumn(0, Qt.DescendingOrder)
+        self.table_historique.setSelectionBehavior(QTableView.SelectRows)
+        self.table_historique.setSelectionMode(QTableView.ExtendedSelection)
+        self.table_historique.setWordWrap(False)
+
+        # Optimisation de la hauteur des lignes (3 lignes max)
+        # Hauteur fixe : pas de mesure du texte par ligne ; au-delà, le texte est
+        # tronqué et disponible en infobulle
+        self.table_historique.setTextElideMode(Qt.ElideRight)
+        self.table_historique.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.table_historique.verticalHeader().setDefaultSectionSize(60)  # ~3 lignes de texte
+
+        header_historique_table = self.table_historique.horizontalHeader()
+        header_historique_table.setDefaultAlignment(Qt.AlignCenter)
+        header_historique_table.setStyleSheet(
+            "QHeaderView::section { font-weight: bold; background-color: #d1ecf1; padding: 4px; }"
+        )
+
+        # Mode de redimensionnement optimisé avec largeurs contrôlées
+        header_historique_table.setSectionResizeMode(QHeaderView.Interactive)
+
+        # Définir des largeurs initiales optimales pour chaque colonne
+        # Colonnes: Marché, Fournisseur, Date SF, N° Facture, Libellé, Montant SF, Montant TTC, N° Mandat, Statut
+        self.table_historique.setColumnWidth(0, 120)  # Marché
+        self.table_historique.setColumnWidth(1, 200)  # Fournisseur (word wrap)
+        self.table_historique.setColumnWidth(2, 90)   # Date SF
+        self.table_historique.setColumnWidth(3, 100)  # N° Facture
+        self.table_historique.setColumnWidth(4, 350)  # Libellé (word wrap sur 3 lignes)
+        self.table_historique.setColumnWidth(5, 110)  # Montant SF
+        self.table_historique.setColumnWidth(6, 110)  # Montant TTC
+        self.table_historique.setColumnWidth(7, 100)  # N° Mandat
+        self.table_historique.setColumnWidth(8, 120)  # Statut
+
+        # Permettre le redimensionnement manuel par l'utilisateur
+        header_historique_table.setStretchLastSection(False)
+
+        return self.table_historique
+
     def on_tab_changed(self, index):
         """Adapter les filtres selon l'onglet actif."""
-        tab_name = self.tabs.tabText(index)
+        self._ensure_tab_built(index)
+        self._flush_dirty(index)
+        self._current_tab = tab = Tab(index)
         
-        # Réinitialiser les combos
-        self.filter1_combo.blockSignals(True)
-        self.filter2_combo.blockSignals(True)
-        self.filter1_combo.clear()
-        self.filter2_combo.clear()
+        # Réinitialiser les combos (sans déclencher les slots de filtrage)
+        with QSignalBlocker(self.filter1_combo), QSignalBlocker(self.filter2_combo):
+            self.filter1_combo.clear()
+            self.filter2_combo.clear()
         
-        if "Commandes" in tab_name:
-            # Filtre 1: Statut commande
-            self.filter1_combo.addItems(["Tous", "A suivre", "Envoyée"])
-            # Filtre 2: Statut facturation
-            self.filter2_label.setText("<b>Facturation:</b>")
-            self.filter2_label.setVisible(True)
-            self.filter2_combo.setVisible(True)
-            self.filter2_combo.addItems(["Tous", "Non facturée", "Partiellement facturée", "Totalement facturée"])
-            # Filtre Marché: visible et avec liste déroulante
-            self.marche_label.setVisible(True)
-            self.marche_filter_combo.setVisible(True)
-            # Filtres multiples: visibles uniquement pour Commandes
-            self.sep5.setVisible(True)
-            self.article_fonction_label.setVisible(True)
-            self.article_fonction_filter.setVisible(True)
-            self.sep6.setVisible(True)
-            self.article_nature_label.setVisible(True)
-            self.article_nature_filter.setVisible(True)
-            self.sep7.setVisible(True)
-            self.service_emetteur_label.setVisible(True)
-            self.service_emetteur_filter.setVisible(True)
-            self.sep8.setVisible(True)
-            # Recherche: N° Commande visible, N° Facture caché
-            self.label_search_cmd.setVisible(True)
-            self.search_num_commande.setVisible(True)
-            self.sep_rech2.setVisible(False)
-            self.label_search_fact.setVisible(False)
-            self.search_num_facture.setVisible(False)
+            if tab is Tab.COMMANDES:
+                # Filtre 1: Statut commande
+                self.filter1_combo.addItems(["Tous", "A suivre", "Envoyée"])
+                # Filtre 2: Statut facturation
+                self.filter2_label.setText("<b>Facturation:</b>")
+                self.filter2_label.setVisible(True)
+                self.filter2_combo.setVisible(True)
+                self.filter2_combo.addItems(["Tous", "Non facturée", "Partiellement facturée", "Totalement facturée"])
+                # Filtre Marché: visible et avec liste déroulante
+                self.marche_label.setVisible(True)
+                self.marche_filter_combo.setVisible(True)
+                # Filtres multiples: visibles uniquement pour Commandes
+                self.sep5.setVisible(True)
+                self.article_fonction_label.setVisible(True)
+                self.article_fonction_filter.setVisible(True)
+                self.sep6.setVisible(True)
+                self.article_nature_label.setVisible(True)
+                self.article_nature_filter.setVisible(True)
+                self.sep7.setVisible(True)
+                self.service_emetteur_label.setVisible(True)
+                self.service_emetteur_filter.setVisible(True)
+                self.sep8.setVisible(True)
+                # Recherche: N° Commande visible, N° Facture caché
+                self.label_search_cmd.setVisible(True)
+                self.search_num_commande.setVisible(True)
+                self.sep_rech2.setVisible(False)
+                self.label_search_fact.setVisible(False)
+                self.search_num_facture.setVisible(False)
             
-        elif "Factures" in tab_name and "Facturation" not in tab_name:
-            # Filtre 1: Statut facture
-            self.filter1_combo.addItems(["Tous", "Facturée", "Service fait", "En attente de paiement", "A vérifier"])
-            # Filtre 2: Exercice
-            self.filter2_label.setText("<b>Exercice:</b>")
-            self.filter2_label.setVisible(True)
-            self.filter2_combo.setVisible(True)
-            exercices = self._get_exercices_factures()
-            self.filter2_combo.addItem("Tous")
-            self.filter2_combo.addItems(exercices)
-            # Filtre Marché: VISIBLE pour Factures
-            self.marche_label.setVisible(True)
-            self.marche_filter_combo.setVisible(True)
-            # Filtres multiples: cachés pour Factures
-            self.sep5.setVisible(False)
-            self.article_fonction_label.setVisible(False)
-            self.article_fonction_filter.setVisible(False)
-            self.sep6.setVisible(False)
-            self.article_nature_label.setVisible(False)
-            self.article_nature_filter.setVisible(False)
-            self.sep7.setVisible(False)
-            self.service_emetteur_label.setVisible(False)
-            self.service_emetteur_filter.setVisible(False)
-            self.sep8.setVisible(False)
-            # Recherche: N° Commande et N° Facture visibles
-            self.label_search_cmd.setVisible(True)
-            self.search_num_commande.setVisible(True)
-            self.sep_rech2.setVisible(True)
-            self.label_search_fact.setVisible(True)
-            self.search_num_facture.setVisible(True)
+            elif tab is Tab.FACTURES:
+                # Filtre 1: Statut facture
+                self.filter1_combo.addItems(["Tous", "Facturée", "Service fait", "En attente de paiement", "A vérifier"])
+                # Filtre 2: Exercice
+                self.filter2_label.setText("<b>Exercice:</b>")
+                self.filter2_label.setVisible(True)
+                self.filter2_combo.setVisible(True)
+                exercices = self._get_exercices_factures()
+                self.filter2_combo.addItems(["Tous"] + exercices)
+                # Filtre Marché: VISIBLE pour Factures
+                self.marche_label.setVisible(True)
+                self.marche_filter_combo.setVisible(True)
+                # Filtres multiples: cachés pour Factures
+                self.sep5.setVisible(False)
+                self.article_fonction_label.setVisible(False)
+                self.article_fonction_filter.setVisible(False)
+                self.sep6.setVisible(False)
+                self.article_nature_label.setVisible(False)
+                self.article_nature_filter.setVisible(False)
+                self.sep7.setVisible(False)
+                self.service_emetteur_label.setVisible(False)
+                self.service_emetteur_filter.setVisible(False)
+                self.sep8.setVisible(False)
+                # Recherche: N° Commande et N° Facture visibles
+                self.label_search_cmd.setVisible(True)
+                self.search_num_commande.setVisible(True)
+                self.sep_rech2.setVisible(True)
+                self.label_search_fact.setVisible(True)
+                self.search_num_facture.setVisible(True)
             
-        elif "Facturation" in tab_name:
-            # Filtre 1: Statut facturation
-            self.filter1_combo.addItems(["Tous", "Non facturée", "Partiellement facturée", "Totalement facturée"])
-            # Filtre 2: caché (pas de second filtre pour Facturation)
-            self.filter2_label.setVisible(False)
-            self.filter2_combo.setVisible(False)
-            # Filtre Marché: visible et avec liste déroulante
-            self.marche_label.setVisible(True)
-            self.marche_filter_combo.setVisible(True)
-            # Filtres multiples: cachés pour Facturation
-            self.sep5.setVisible(False)
-            self.article_fonction_label.setVisible(False)
-            self.article_fonction_filter.setVisible(False)
-            self.sep6.setVisible(False)
-            self.article_nature_label.setVisible(False)
-            self.article_nature_filter.setVisible(False)
-            self.sep7.setVisible(False)
-            self.service_emetteur_label.setVisible(False)
-            self.service_emetteur_filter.setVisible(False)
-            self.sep8.setVisible(False)
-            # Recherche: tous cachés pour Facturation
-            self.label_search_cmd.setVisible(False)
-            self.search_num_commande.setVisible(False)
-            self.sep_rech2.setVisible(False)
-            self.label_search_fact.setVisible(False)
-            self.search_num_facture.setVisible(False)
-
-        elif "Rappels" in tab_name:
-            # Pas de filtres spécifiques pour rappels
-            self.filter2_label.setVisible(False)
-            self.filter2_combo.setVisible(False)
-            self.filter1_combo.addItem("Tous")
-            # Filtre Marché: caché pour Rappels
-            self.marche_label.setVisible(False)
-            self.marche_filter_combo.setVisible(False)
-            # Filtres multiples: cachés pour Rappels
-            self.sep5.setVisible(False)
-            self.article_fonction_label.setVisible(False)
-            self.article_fonction_filter.setVisible(False)
-            self.sep6.setVisible(False)
-            self.article_nature_label.setVisible(False)
-            self.article_nature_filter.setVisible(False)
-            self.sep7.setVisible(False)
-            self.service_emetteur_label.setVisible(False)
-            self.service_emetteur_filter.setVisible(False)
-            self.sep8.setVisible(False)
-            # Recherche: tous cachés pour Rappels
-            self.label_search_cmd.setVisible(False)
-            self.search_num_commande.setVisible(False)
-            self.sep_rech2.setVisible(False)
-            self.label_search_fact.setVisible(False)
-            self.search_num_facture.setVisible(False)
-
-        self.filter1_combo.blockSignals(False)
-        self.filter2_combo.blockSignals(False)
-        
+            elif tab is Tab.FACTURATION:
+                # Filtre 1: Statut facturation
+                self.filter1_combo.addItems(["Tous", "Non facturée", "Partiellement facturée", "Totalement facturée"])
+                # Filtre 2: caché (pas de second filtre pour Facturation)
+                self.filter2_label.setVisible(False)
+                self.filter2_combo.setVisible(False)
+                # Filtre Marché: visible et avec liste déroulante
+                self.marche_label.setVisible(True)
+                self.marche_filter_combo.setVisible(True)
+                # Filtres multiples: cachés pour Facturation
+                self.sep5.setVisible(False)
+                self.article_fonction_label.setVisible(False)
+                self.article_fonction_filter.setVisible(False)
+                self.sep6.setVisible(False)
+                self.article_nature_label.setVisible(False)
+                self.article_nature_filter.setVisible(False)
+                self.sep7.setVisible(False)
+                self.service_emetteur_label.setVisible(False)
+                self.service_emetteur_filter.setVisible(False)
+                self.sep8.setVisible(False)
+                # Recherche: tous cachés pour Facturation
+                self.label_search_cmd.setVisible(False)
+                self.search_num_commande.setVisible(False)
+                self.sep_rech2.setVisible(False)
+                self.label_search_fact.setVisible(False)
+                self.search_num_facture.setVisible(False)
+
+            elif tab is Tab.RAPPELS:
+                # Pas de filtres spécifiques pour rappels
+                self.filter2_label.setVisible(False)
+                self.filter2_combo.setVisible(False)
+                self.filter1_combo.addItem("Tous")
+                # Filtre Marché: caché pour Rappels
+                self.marche_label.setVisible(False)
+                self.marche_filter_combo.setVisible(False)
+                # Filtres multiples: cachés pour Rappels
+                self.sep5.setVisible(False)
+                self.article_fonction_label.setVisible(False)
+                self.article_fonction_filter.setVisible(False)
+                self.sep6.setVisible(False)
+                self.article_nature_label.setVisible(False)
+                self.article_nature_filter.setVisible(False)
+                self.sep7.setVisible(False)
+                self.service_emetteur_label.setVisible(False)
+                self.service_emetteur_filter.setVisible(False)
+                self.sep8.setVisible(False)
+                # Recherche: tous cachés pour Rappels
+                self.label_search_cmd.setVisible(False)
+                self.search_num_commande.setVisible(False)
+                self.sep_rech2.setVisible(False)
+                self.label_search_fact.setVisible(False)
+                self.search_num_facture.setVisible(False)
+
+        # Listes fournisseurs/marchés/filtres multiples : remplies une fois les
+        # changements d'onglet rapprochés terminés
+        self._filter_refresh_timer.start()
+
+    def _refresh_filter_combos(self):
+        """Remplit les listes fournisseurs, marchés et filtres multiples de l'onglet actif."""
         # Rafraîchir la liste des fournisseurs
         self.refresh_fournisseur_filter()
         
@@ -3393,59 +4604,99 @@ class MainWindow(QMainWindow):
         # Rafraîchir les filtres multiples (uniquement pour Commandes)
         self.refresh_multiple_filters()
 
+        # Les combos ont été remplis signaux bloqués : aligner le proxy une seule fois
+        self._apply_filters()
+
+    def _apply_filters(self):
+        """Applique au proxy de l'onglet actif l'état affiché de tous les filtres (un seul refiltrage)."""
+        tab = self._current_tab
+        with self._batch_filters():
+            self.on_filter1_changed(self.filter1_combo.currentText())
+            self.on_filter2_changed(self.filter2_combo.currentText())
+            self.on_fournisseur_filter_changed(self.fournisseur_filter_combo.currentText())
+            self.on_marche_filter_changed(self.marche_filter_combo.currentText())
+            if tab is Tab.COMMANDES:
+                self.cmd_proxy.setArticleFonctionFilter(self.article_fonction_filter.checked_items())
+                self.cmd_proxy.setArticleNatureFilter(self.article_nature_filter.checked_items())
+                self.cmd_proxy.setServiceEmetteurFilter(self.service_emetteur_filter.checked_items())
+
+    def _distinct_values(self, table, column):
+        """
+        Valeurs distinctes non vides de `table.column`, triées.
+
+        Mémorisées dans self._distinct_cache : un changement d'onglet ne relance
+        pas de SELECT DISTINCT. Le cache est vidé par les imports, seuls à
+        modifier ces colonnes.
+        """
+        key = (table, column)
+        values = self._distinct_cache.get(key)
+        if values is None:
+            cur = self.db.conn.cursor()
+            cur.execute(
+                f"SELECT DISTINCT {column} FROM {table} "
+                f"WHERE {column} IS NOT NULL AND {column} != '' ORDER BY {column}"
+            )
+            values = self._distinct_cache[key] = [r[0] for r in cur.fetchall()]
+        return values
+
+    def _distinct_union_values(self, column):
+        """
+        Valeurs distinctes non vides de `column` dans commandes ET factures, triées.
+
+        L'UNION dédoublonne et trie côté SQLite en une seule requête ; le
+        résultat est mémorisé comme pour _distinct_values.
+        """
+        key = ("commandes+factures", column)
+        values = self._distinct_cache.get(key)
+        if values is None:
+            cur = self.db.conn.cursor()
+            cur.execute(
+                f"SELECT {column} FROM commandes WHERE {column} IS NOT NULL AND {column} != '' "
+                "UNION "
+                f"SELECT {column} FROM factures WHERE {column} IS NOT NULL AND {column} != '' "
+                f"ORDER BY {column}"
+            )
+            values = self._distinct_cache[key] = [r[0] for r in cur.fetchall()]
+        return values
+
     def _get_exercices_factures(self):
         """Récupère la liste des exercices dans les factures."""
-        cur = self.db.conn.cursor()
-        cur.execute("SELECT DISTINCT exercice FROM factures WHERE exercice IS NOT NULL AND exercice != '' ORDER BY exercice DESC")
-        return [r[0] for r in cur.fetchall()]
+        return self._distinct_values("factures", "exercice")[::-1]
 
     def _get_marches(self):
         """Récupère la liste des marchés selon l'onglet actif."""
-        cur = self.db.conn.cursor()
-        tab_index = self.tabs.currentIndex()
-        tab_name = self.tabs.tabText(tab_index)
-        
-        marches_set = set()
+        tab = self._current_tab
         
         # Pour l'onglet Factures, lire depuis les factures
-        if "Factures" in tab_name and "Facturation" not in tab_name:
-            cur.execute("SELECT DISTINCT marche FROM factures WHERE marche IS NOT NULL AND marche != '' ORDER BY marche")
-            marches_set.update([r[0] for r in cur.fetchall()])
+        if tab is Tab.FACTURES:
+            return self._distinct_values("factures", "marche")
         # Pour Commandes, lire depuis les commandes
-        elif "Commandes" in tab_name:
-            cur.execute("SELECT DISTINCT marche FROM commandes WHERE marche IS NOT NULL AND marche != '' ORDER BY marche")
-            marches_set.update([r[0] for r in cur.fetchall()])
+        if tab is Tab.COMMANDES:
+            return self._distinct_values("commandes", "marche")
         # Pour Facturation, lire depuis les DEUX tables (commandes ET factures)
-        elif "Facturation" in tab_name:
-            # Marchés depuis commandes
-            cur.execute("SELECT DISTINCT marche FROM commandes WHERE marche IS NOT NULL AND marche != '' ORDER BY marche")
-            marches_set.update([r[0] for r in cur.fetchall()])
-            # Marchés depuis factures
-            cur.execute("SELECT DISTINCT marche FROM factures WHERE marche IS NOT NULL AND marche != '' ORDER BY marche")
-            marches_set.update([r[0] for r in cur.fetchall()])
+        if tab is Tab.FACTURATION:
+            return self._distinct_union_values("marche")
         
-        return sorted(list(marches_set))
+        return []
 
     def on_filter1_changed(self, text):
         """Filtre 1 change selon l'onglet."""
-        tab_index = self.tabs.currentIndex()
-        tab_name = self.tabs.tabText(tab_index)
+        tab = self._current_tab
         
-        if "Commandes" in tab_name:
+        if tab is Tab.COMMANDES:
             self.cmd_proxy.setStatusFilter(text)
-        elif "Factures" in tab_name and "Facturation" not in tab_name:
+        elif tab is Tab.FACTURES:
             self.fact_proxy.setStatutFilter(text)
-        elif "Facturation" in tab_name:
+        elif tab is Tab.FACTURATION:
             self.synth_proxy.setStatutFilter(text)
 
     def on_filter2_changed(self, text):
         """Filtre 2 change selon l'onglet."""
-        tab_index = self.tabs.currentIndex()
-        tab_name = self.tabs.tabText(tab_index)
+        tab = self._current_tab
         
-        if "Commandes" in tab_name:
+        if tab is Tab.COMMANDES:
             self.cmd_proxy.setFacturationFilter(text)
-        elif "Factures" in tab_name and "Facturation" not in tab_name:
+        elif tab is Tab.FACTURES:
             self.fact_proxy.setExerciceFilter(text)
 
     def on_fournisseur_filter_changed(self, text):
@@ -3453,137 +4704,108 @@ class MainWindow(QMainWindow):
         # Si "Tous" est sélectionné, on passe une chaîne vide pour ne pas filtrer
         filter_text = "" if text == "Tous" else text
         
-        tab_index = self.tabs.currentIndex()
-        tab_name = self.tabs.tabText(tab_index)
+        tab = self._current_tab
         
-        if "Commandes" in tab_name:
+        if tab is Tab.COMMANDES:
             self.cmd_proxy.setFournisseurFilter(filter_text)
-        elif "Factures" in tab_name and "Facturation" not in tab_name:
+        elif tab is Tab.FACTURES:
             self.fact_proxy.setFournisseurFilter(filter_text)
-        elif "Facturation" in tab_name:
+        elif tab is Tab.FACTURATION:
             self.synth_proxy.setFournisseurFilter(filter_text)
 
     def on_marche_filter_changed(self, text):
         """Filtre marché - fonctionne sur Commandes, Factures et Facturation."""
-        tab_index = self.tabs.currentIndex()
-        tab_name = self.tabs.tabText(tab_index)
+        tab = self._current_tab
         
-        if "Commandes" in tab_name:
+        if tab is Tab.COMMANDES:
             self.cmd_proxy.setMarcheFilter(text)
-        elif "Factures" in tab_name and "Facturation" not in tab_name:
+        elif tab is Tab.FACTURES:
             self.fact_proxy.setMarcheFilter(text)
-        elif "Facturation" in tab_name:
+        elif tab is Tab.FACTURATION:
             self.synth_proxy.setMarcheFilter(text)
     
-    def on_article_fonction_changed(self, index):
-        """Filtre article fonction (choix multiples) - Commandes uniquement."""
-        tab_index = self.tabs.currentIndex()
-        tab_name = self.tabs.tabText(tab_index)
-        
-        if "Commandes" in tab_name:
-            checked = self.article_fonction_filter.checked_items()
-            self.cmd_proxy.setArticleFonctionFilter(checked)
-        self.update_multi_filter_labels()
-
-    
-    def on_article_nature_changed(self, index):
-        """Filtre article nature (choix multiples) - Commandes uniquement."""
-        tab_index = self.tabs.currentIndex()
-        tab_name = self.tabs.tabText(tab_index)
-        
-        if "Commandes" in tab_name:
-            checked = self.article_nature_filter.checked_items()
-            self.cmd_proxy.setArticleNatureFilter(checked)
-        self.update_multi_filter_labels()
-
-    
-    def on_service_emetteur_changed(self, index):
-        """Filtre service émetteur (choix multiples) - Commandes uniquement."""
-        tab_index = self.tabs.currentIndex()
-        tab_name = self.tabs.tabText(tab_index)
-        
-        if "Commandes" in tab_name:
-            checked = self.service_emetteur_filter.checked_items()
-            self.cmd_proxy.setServiceEmetteurFilter(checked)
-        self.update_multi_filter_labels()
+    def _on_multi_filter_changed(self, kind, index=None):
+        """Filtre à choix multiples `kind` modifié - Commandes uniquement."""
+        combo, _, _, setter = self._multi_filters[kind]
+        checked = combo.checked_items()
+        if self._current_tab is Tab.COMMANDES:
+            setter(checked)
+        # Seul le libellé du filtre modifié change d'état
+        self._update_multi_filter_label(kind, checked)
+
+    def _update_multi_filter_label(self, kind, checked):
+        """Met à jour le libellé du filtre `kind` selon qu'il est actif ou non."""
+        _, label, base_text, _ = self._multi_filters[kind]
+        if checked:
+            # Texte avec mention "(actif)" et couleur mise en avant
+            label.setText(f"<b>{base_text} (actif):</b>")
+            label.setStyleSheet("color: #0078d4;")
+        else:
+            # Texte et style par défaut
+            label.setText(f"<b>{base_text}:</b>")
+            label.setStyleSheet("")
 
-    
     def update_multi_filter_labels(self):
         """Met à jour les libellés des filtres multiples selon qu'ils sont actifs ou non."""
         # Les filtres peuvent ne pas encore être initialisés au moment de l'appel.
-        try:
-            af_checked = self.article_fonction_filter.checked_items()
-            an_checked = self.article_nature_filter.checked_items()
-            se_checked = self.service_emetteur_filter.checked_items()
-        except AttributeError:
+        multi_filters = getattr(self, "_multi_filters", None)
+        if multi_filters is None:
             return
-
-        def apply(label, base_text, is_active):
-            if is_active:
-                # Texte avec mention "(actif)" et couleur mise en avant
-                label.setText(f"<b>{base_text} (actif):</b>")
-                label.setStyleSheet("color: #0078d4;")
-            else:
-                # Texte et style par défaut
-                label.setText(f"<b>{base_text}:</b>")
-                label.setStyleSheet("")
-
-        apply(self.article_fonction_label, self.article_fonction_label_base, bool(af_checked))
-        apply(self.article_nature_label, self.article_nature_label_base, bool(an_checked))
-        apply(self.service_emetteur_label, self.service_emetteur_label_base, bool(se_checked))
+        for kind, (combo, _, _, _) in multi_filters.items():
+            self._update_multi_filter_label(kind, combo.checked_items())
 
     def clear_multiple_filters(self):
         """Réinitialise tous les filtres à choix multiples."""
-        self.article_fonction_filter.clear_selection()
-        self.article_nature_filter.clear_selection()
-        self.service_emetteur_filter.clear_selection()
+        with QSignalBlocker(self.article_fonction_filter), \
+                QSignalBlocker(self.article_nature_filter), \
+                QSignalBlocker(self.service_emetteur_filter):
+            self.article_fonction_filter.clear_selection()
+            self.article_nature_filter.clear_selection()
+            self.service_emetteur_filter.clear_selection()
         
-        # Réappliquer les filtres vides
-        self.cmd_proxy.setArticleFonctionFilter([])
-        self.cmd_proxy.setArticleNatureFilter([])
-        self.cmd_proxy.setServiceEmetteurFilter([])
+        # Réappliquer les filtres vides (un seul refiltrage)
+        with self._batch_filters():
+            self.cmd_proxy.setArticleFonctionFilter([])
+            self.cmd_proxy.setArticleNatureFilter([])
+            self.cmd_proxy.setServiceEmetteurFilter([])
         self.update_multi_filter_labels()
 
     def on_search_num_commande_changed(self, text):
         """Filtre par numéro de commande - fonctionne sur Commandes et Factures."""
-        tab_index = self.tabs.currentIndex()
-        tab_name = self.tabs.tabText(tab_index)
+        tab = self._current_tab
 
-        if "Commandes" in tab_name:
+        if tab is Tab.COMMANDES:
             self.cmd_proxy.setNumCommandeFilter(text)
-        elif "Factures" in tab_name and "Facturation" not in tab_name:
+        elif tab is Tab.FACTURES:
             self.fact_proxy.setNumCommandeFilter(text)
 
     def on_search_num_facture_changed(self, text):
         """Filtre par numéro de facture - fonctionne sur Factures uniquement."""
-        tab_index = self.tabs.currentIndex()
-        tab_name = self.tabs.tabText(tab_index)
+        tab = self._current_tab
 
-        if "Factures" in tab_name and "Facturation" not in tab_name:
+        if tab is Tab.FACTURES:
             self.fact_proxy.setNumFactureFilter(text)
 
     def select_all_current_tab(self):
         """Sélectionner tout dans l'onglet actif."""
-        tab_index = self.tabs.currentIndex()
-        tab_name = self.tabs.tabText(tab_index)
+        tab = self._current_tab
         
-        if tab_name == "Commandes":
+        if tab is Tab.COMMANDES:
             self.table_cmd.selectAll()
-        elif tab_name == "Factures":
+        elif tab is Tab.FACTURES:
             self.table_fact.selectAll()
-        elif tab_name == "Facturation":
+        elif tab is Tab.FACTURATION:
             self.table_synth.selectAll()
 
     def clear_selection_current_tab(self):
         """Désélectionner tout dans l'onglet actif."""
-        tab_index = self.tabs.currentIndex()
-        tab_name = self.tabs.tabText(tab_index)
+        tab = self._current_tab
         
-        if tab_name == "Commandes":
+        if tab is Tab.COMMANDES:
             self.table_cmd.clearSelection()
-        elif tab_name == "Factures":
+        elif tab is Tab.FACTURES:
             self.table_fact.clearSelection()
-        elif tab_name == "Facturation":
+        elif tab is Tab.FACTURATION:
             self.table_synth.clearSelection()
 
     # ------------ Import incrémental multi-fichiers ------------
@@ -3638,19 +4860,27 @@ class MainWindow(QMainWindow):
         nb_to_import = len(to_import["commandes"]) + len(to_import["factures"])
         nb_skipped = len(skipped["commandes"]) + len(skipped["factures"])
 
-        # Afficher un résumé et demander confirmation
-        summary = f"📁 Dossier : {source_dir}\n\n"
-        summary += f"📊 Analyse :\n"
-        summary += f"  • {total_files} fichiers Excel trouvés\n"
-        summary += f"  • {nb_to_import} à importer (nouveaux/modifiés)\n"
-        summary += f"  • {nb_skipped} déjà à jour\n\n"
+        # Afficher un résumé et demander confirmation (liste des fichiers limitée)
+        max_shown = 30
+        lines = [
+            f"📁 Dossier : {source_dir}",
+            "",
+            "📊 Analyse :",
+            f"  • {total_files} fichiers Excel trouvés",
+            f"  • {nb_to_import} à importer (nouveaux/modifiés)",
+            f"  • {nb_skipped} déjà à jour",
+            "",
+        ]
 
         if nb_to_import > 0:
-            summary += "📥 Fichiers à importer :\n"
-            for filepath, reason in to_import["commandes"]:
-                summary += f"  • {os.path.basename(filepath)} ({reason})\n"
-            for filepath, reason in to_import["factures"]:
-                summary += f"  • {os.path.basename(filepath)} ({reason})\n"
+            lines.append("📥 Fichiers à importer :")
+            shown = (to_import["commandes"] + to_import["factures"])[:max_shown]
+            lines.extend(f"  • {os.path.basename(filepath)} ({reason})" for filepath, reason in shown)
+            if nb_to_import > max_shown:
+                lines.append(f"  • … et {nb_to_import - max_shown} autres")
+            lines.append("")
+
+        summary = "\n".join(lines)
 
         if nb_to_import == 0:
             QMessageBox.information(self, "Aucune mise à jour nécessaire", summary)
@@ -3669,31 +4899,44 @@ class MainWindow(QMainWindow):
         # Importer les fichiers
         results = []
         errors = []
-
-        for filepath, reason in to_import["commandes"]:
-            try:
-                count = self.import_commandes_from_file(filepath)
-                results.append(f"✅ {os.path.basename(filepath)}: {count} commandes")
-            except Exception as e:
-                errors.append(f"❌ {os.path.basename(filepath)}: {str(e)}")
-
-        for filepath, reason in to_import["factures"]:
-            try:
-                count = self.import_factures_from_file(filepath)
-                results.append(f"✅ {os.path.basename(filepath)}: {count} factures")
-            except Exception as e:
-                errors.append(f"❌ {os.path.basename(filepath)}: {str(e)}")
-
-        # Recalculer la facturation
-        self.db.recompute_facturation()
-
-        # Rafraîchir les vues
-        self.cmd_model.refresh()
-        self.fact_model.refresh()
-        self.synth_model.refresh()
-        self.refresh_fournisseur_filter()
-        self.refresh_rappels_tab()
-        self.resize_all()
+        # Numéros de commande touchés par l'import (commandes et factures liées)
+        changed = set()
+
+        # Lecture des fichiers en parallèle (processus de travail) ; les écritures
+        # en base restent dans le processus principal, dans l'ordre des fichiers
+        jobs = [(filepath, "commandes") for filepath, _ in to_import["commandes"]]
+        jobs += [(filepath, "factures") for filepath, _ in to_import["factures"]]
+
+        progress = QProgressDialog("Import des fichiers…", None, 0, len(jobs), self)
+        progress.setWindowTitle("Import incrémental")
+        progress.setWindowModality(Qt.WindowModal)
+        progress.setMinimumDuration(0)
+        progress.setValue(0)
+
+        with ProcessPoolExecutor(max_workers=min(len(jobs), os.cpu_count() or 1)) as pool:
+            futures = [
+                pool.submit(parse_commandes_file if kind == "commandes" else parse_factures_file, filepath)
+                for filepath, kind in jobs
+            ]
+            for done, ((filepath, kind), future) in enumerate(zip(jobs, futures)):
+                try:
+                    if kind == "commandes":
+                        count = self.import_commandes_from_file(filepath, changed, future)
+                    else:
+                        count = self.import_factures_from_file(filepath, changed, future)
+                    results.append(f"✅ {os.path.basename(filepath)}: {count} {kind}")
+                except Exception as e:
+                    errors.append(f"❌ {os.path.basename(filepath)}: {str(e)}")
+                progress.setValue(done + 1)
+        progress.close()
+
+        # Recalculer la facturation des seules commandes concernées
+        self.db.recompute_facturation(changed)
+
+        # Rafraîchir les vues (onglet courant ; les autres à leur ouverture)
+        self.refresh_db_models()
+        self._filter_refresh_timer.start()
+        self._update_rappels_badge()
 
         # Afficher le résultat
         result_msg = "Import incrémental terminé !\n\n"
@@ -3706,10 +4949,13 @@ class MainWindow(QMainWindow):
         else:
             QMessageBox.information(self, "Import réussi", result_msg)
 
-    def import_commandes_from_file(self, filepath: str) -> int:
+    def import_commandes_from_file(self, filepath: str, changed: set = None, rows_future=None) -> int:
         """
         Importe les commandes d'un fichier spécifique.
-        Retourne le nombre de commandes importées.
+        Retourne le nombre de commandes importées ; leurs numéros sont ajoutés
+        à `changed` s'il est fourni (recalcul ciblé de la facturation).
+        `rows_future` : lecture du fichier déjà lancée dans un processus de travail
+        (Future de parse_commandes_file) ; sinon le fichier est lu ici.
         """
         import os
 
@@ -3718,177 +4964,49 @@ class MainWindow(QMainWindow):
         file_size = os.path.getsize(filepath)
 
         try:
-            df = pd.read_excel(filepath)
+            rows = rows_future.result() if rows_future is not None else parse_commandes_file(filepath)
         except Exception as e:
             self.db.record_import(filename, filepath, file_hash, file_size,
                                  "commandes", 0, "error", str(e))
             raise
 
-        expected = [
-            "Exercice", "N° Commande", "Fournisseur", "Libellé",
-            "Date de la commande", "Marché", "Service émetteur", "Montant TTC",
-            "Section", "Article par fonction", "Article par nature"
-        ]
-        missing = [c for c in expected if c not in df.columns]
-        if missing:
-            error_msg = "Colonnes manquantes: " + ", ".join(missing)
-            self.db.record_import(filename, filepath, file_hash, file_size,
-                                 "commandes", 0, "error", error_msg)
-            raise ValueError(error_msg)
-
-        # Grouper par (Exercice, N° Commande)
-        grouped = df.groupby(["Exercice", "N° Commande"], as_index=False).agg({
-            "Fournisseur": "first",
-            "Libellé": "first",
-            "Date de la commande": "first",
-            "Marché": "first",
-            "Service émetteur": "first",
-            "Montant TTC": "sum",
-            "Section": "first",
-            "Article par fonction": "first",
-            "Article par nature": "first"
-        })
-
-        for _, row in grouped.iterrows():
-            data = {
-                "exercice": str(row["Exercice"]),
-                "num_commande": str(row["N° Commande"]),
-                "fournisseur": "" if pd.isna(row["Fournisseur"]) else str(row["Fournisseur"]),
-                "libelle": "" if pd.isna(row["Libellé"]) else str(row["Libellé"]),
-                "date_commande": parse_date_safe(row["Date de la commande"]),
-                "marche": "" if pd.isna(row["Marché"]) else str(row["Marché"]),
-                "service_emetteur": "" if pd.isna(row["Service émetteur"]) else str(row["Service émetteur"]),
-                "montant_ttc": None if pd.isna(row["Montant TTC"]) else float(row["Montant TTC"]),
-                "section": "" if pd.isna(row["Section"]) else str(row["Section"]),
-                "article_fonction": "" if pd.isna(row["Article par fonction"]) else str(row["Article par fonction"]),
-                "article_nature": "" if pd.isna(row["Article par nature"]) else str(row["Article par nature"]),
-                "source_file": filename
-            }
-            self.db.upsert_commande(data)
+        self.db.upsert_commandes_bulk(rows)
+        self._distinct_cache.clear()
+        if changed is not None:
+            changed.update(row[1] for row in rows)
 
         # Enregistrer l'import
-        count = len(grouped)
+        count = len(rows)
         self.db.record_import(filename, filepath, file_hash, file_size,
                              "commandes", count, "success")
 
         return count
 
-    def import_factures_from_file(self, filepath: str) -> int:
+    def import_factures_from_file(self, filepath: str, changed: set = None, rows_future=None) -> int:
         """
         Importe les factures d'un fichier spécifique.
-        Retourne le nombre de factures importées.
+        Retourne le nombre de factures importées ; les numéros de commande
+        concernés sont ajoutés à `changed` s'il est fourni.
+        `rows_future` : Future de parse_factures_file, comme pour les commandes.
         """
         import os
-        from datetime import datetime
 
         filename = os.path.basename(filepath)
         file_hash = self.db.calculate_file_hash(filepath)
         file_size = os.path.getsize(filepath)
 
         try:
-            df = pd.read_excel(filepath)
+            rows = rows_future.result() if rows_future is not None else parse_factures_file(filepath)
         except Exception as e:
             self.db.record_import(filename, filepath, file_hash, file_size,
                                  "factures", 0, "error", str(e))
             raise
 
-        # DEBUG: Afficher toutes les colonnes trouvées
-        print(f"[DEBUG] Colonnes trouvées dans {filename}:")
-        print(f"  Total: {len(df.columns)} colonnes")
-        for i, col in enumerate(df.columns):
-            print(f"  [{i}] '{col}'")
-
-        required_cols = {
-            "Exercice", "Code mouvement", "Nom tiers",
-            "Libellé mouvement", "Date service fait", "Montant service fait"
-        }
-        missing = required_cols - set(df.columns)
-        if missing:
-            error_msg = "Colonnes manquantes: " + ", ".join(missing)
-            self.db.record_import(filename, filepath, file_hash, file_size,
-                                 "factures", 0, "error", error_msg)
-            raise ValueError(error_msg)
-
-        # Trouver la colonne N° de facture (optionnelle)
-        col_facture = None
-        for col in ["N° pièce", "Facture", "N° facture"]:
-            if col in df.columns:
-                col_facture = col
-                print(f"[DEBUG] Colonne facture trouvée: '{col}'")
-                break
-
-        # Trouver la colonne Montant TTC
-        col_montant_ttc = None
-        for col in ["Montant TTC", "Montant TTC mouvement"]:
-            if col in df.columns:
-                col_montant_ttc = col
-                print(f"[DEBUG] Colonne montant TTC trouvée: '{col}'")
-                break
-
-        # Trouver la colonne Marché
-        col_marche = None
-        for col in ["Marché", "March\u00e9"]:
-            if col in df.columns:
-                col_marche = col
-                print(f"[DEBUG] Colonne marché trouvée: '{col}'")
-                break
-
-        if col_marche is None:
-            print(f"[WARNING] Aucune colonne Marché trouvée dans {filename}")
-
-        # Trouver les colonnes additionnelles pour l'analyse des marchés
-        col_tranche = "Tranche" if "Tranche" in df.columns else None
-        col_mandat = "Mandat" if "Mandat" in df.columns else None
-        col_montant_initial = "Montant initial" if "Montant initial" in df.columns else None
-
-        now = datetime.now().isoformat(timespec="seconds")
-        cur = self.db.conn.cursor()
-        count = 0
-
-        for _, row in df.iterrows():
-            exercice = "" if pd.isna(row["Exercice"]) else str(int(row["Exercice"]))
-            num_facture = "" if col_facture is None or pd.isna(row[col_facture]) else str(row[col_facture])
-            code_mouvement = "" if pd.isna(row["Code mouvement"]) else str(row["Code mouvement"])
-            fournisseur = "" if pd.isna(row["Nom tiers"]) else str(row["Nom tiers"])
-            libelle = "" if pd.isna(row["Libellé mouvement"]) else str(row["Libellé mouvement"])
-            date_facture = parse_date_safe(row["Date service fait"])
-            montant_ttc = None if col_montant_ttc is None or pd.isna(row[col_montant_ttc]) else float(row[col_montant_ttc])
-            montant_service_fait = 0.0 if pd.isna(row["Montant service fait"]) else float(row["Montant service fait"])
-            marche = "" if col_marche is None or pd.isna(row[col_marche]) else str(row[col_marche])
-
-            # Nouvelles colonnes pour l'analyse des marchés
-            tranche = "" if col_tranche is None or pd.isna(row[col_tranche]) else str(row[col_tranche])
-            # IMPORTANT: Le N° de commande est dans "Code mouvement", pas dans "Commande" (qui est vide)
-            commande = code_mouvement
-            num_mandat = "" if col_mandat is None or pd.isna(row[col_mandat]) else str(row[col_mandat])
-            montant_initial = None if col_montant_initial is None or pd.isna(row[col_montant_initial]) else float(row[col_montant_initial])
-
-            statut = compute_facture_status(num_facture, montant_service_fait, date_facture)
-
-            cur.execute(
-                """
-                INSERT INTO factures (
-                    exercice, num_facture, code_mouvement,
-                    fournisseur, libelle, date_facture,
-                    montant_ttc, montant_service_fait, marche,
-                    statut_facture,
-                    rappel_facture_actif, frequence_rappel_facture_jours,
-                    prochaine_date_rappel_facture, notes, last_update, source_file,
-                    tranche, commande, num_mandat, montant_initial
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """,
-                (
-                    exercice, num_facture, code_mouvement,
-                    fournisseur, libelle, date_facture,
-                    montant_ttc, montant_service_fait, marche,
-                    statut,
-                    0, None, None, "", now, filename,
-                    tranche, commande, num_mandat, montant_initial
-                )
-            )
-            count += 1
-
-        self.db.conn.commit()
+        count = self.db.insert_factures_bulk(rows, filename)
+        self._distinct_cache.clear()
+        if changed is not None:
+            # Le N° de commande est dans "Code mouvement" (3e champ)
+            changed.update(row[2] for row in rows)
 
         # Enregistrer l'import
         self.db.record_import(filename, filepath, file_hash, file_size,
@@ -3898,22 +5016,41 @@ class MainWindow(QMainWindow):
 
     # ------------ Actions commandes ------------
 
+    @staticmethod
+    def _selected_rows(view):
+        """
+        Lignes (du modèle de la vue) couvertes par la sélection, dans l'ordre.
+
+        Parcourt les plages de la sélection (QItemSelectionRange) plutôt que
+        selectedRows(), qui teste chaque cellule de chaque ligne.
+        """
+        rows = set()
+        for rng in view.selectionModel().selection():
+            rows.update(range(rng.top(), rng.bottom() + 1))
+        return sorted(rows)
+
     def selected_cmd_ids(self):
-        idxs = self.table_cmd.selectionModel().selectedRows()
-        if not idxs:
+        rows = self._selected_rows(self.table_cmd)
+        if not rows:
             return []
         ids = []
-        for proxy_index in idxs:
-            src_row = self.cmd_proxy.mapToSource(proxy_index).row()
+        for proxy_row in rows:
+            src_row = self.cmd_proxy.mapToSource(self.cmd_proxy.index(proxy_row, 0)).row()
             cid = self.cmd_model.get_row_id(src_row)
             if cid is not None:
                 ids.append(cid)
         return ids
 
+    def _show_empty_selection(self):
+        """Affiche (ou ramène au premier plan) l'avertissement de sélection vide."""
+        self._empty_selection_msg.show()
+        self._empty_selection_msg.raise_()
+        self._empty_selection_msg.activateWindow()
+
     def mark_selected_sent(self):
         ids = self.selected_cmd_ids()
         if not ids:
-            QMessageBox.information(self, "Sélection vide", "Aucune ligne sélectionnée.")
+            self._show_empty_selection()
             return
         self.db.update_statut_for_ids(ids, "Envoyée", disable_rappel=True)
         self.cmd_model.refresh()
@@ -3924,7 +5061,7 @@ class MainWindow(QMainWindow):
     def mark_selected_follow(self):
         ids = self.selected_cmd_ids()
         if not ids:
-            QMessageBox.information(self, "Sélection vide", "Aucune ligne sélectionnée.")
+            self._show_empty_selection()
             return
         # Changer le statut vers "A suivre"
         self.db.update_statut_for_ids(ids, "A suivre", disable_rappel=False)
@@ -3938,7 +5075,7 @@ class MainWindow(QMainWindow):
     def reschedule_selected(self):
         ids = self.selected_cmd_ids()
         if not ids:
-            QMessageBox.information(self, "Sélection vide", "Aucune ligne sélectionnée.")
+            self._show_empty_selection()
             return
         self.db.reschedule_rappel_for_ids(ids)
         self.cmd_model.refresh()
@@ -3969,23 +5106,23 @@ class MainWindow(QMainWindow):
     # ------------ Rappels ------------
 
     def check_reminders(self):
+        # Une replanification précédente est encore en cours : on attend le prochain tick
+        if self._reminder_reschedule_pending:
+            return
         due = self.db.due_reminders()
         if not due:
             return
 
         # Debug minimal en console pour vérification
-        try:
-            print("[DEBUG] due_reminders:", [(row["id"], row["num_commande"], row["prochaine_date_rappel"]) for row in due])
-        except Exception:
-            pass
+        if DEBUG:
+            try:
+                print("[DEBUG] due_reminders:", [(row["id"], row["num_commande"], row["prochaine_date_rappel"]) for row in due])
+            except Exception:
+                pass
 
         lines = []
         for row in due:
-            dc = row["date_commande"]
-            try:
-                dc_fmt = datetime.strptime(dc, "%Y-%m-%d").strftime("%d/%m/%Y") if dc else ""
-            except Exception:
-                dc_fmt = dc or ""
+            dc_fmt = format_iso_date(row["date_commande"])
             lines.append(f"{row['num_commande']} - {row['fournisseur']} ({dc_fmt})")
 
         text = "\n".join(lines[:10])
@@ -4003,12 +5140,27 @@ class MainWindow(QMainWindow):
         # Envoi mail éventuel
         self._send_email_reminders(title, text, due)
 
-        # Replanifier tous les rappels traités
-        for row in due:
-            self.db.reschedule_rappel_for_ids([row["id"]])
-        self.cmd_model.refresh()
-        self.refresh_rappels_tab()
-        self.resize_all()
+        # Replanifier tous les rappels traités, par lots rendus à la boucle d'événements
+        self._reminder_reschedule_pending = True
+        self._reschedule_reminders_chunk([row["id"] for row in due])
+
+    def _reschedule_reminders_chunk(self, ids):
+        """Replanifie un lot de rappels puis programme le lot suivant."""
+        chunk, rest = ids[:REMINDER_CHUNK_SIZE], ids[REMINDER_CHUNK_SIZE:]
+        try:
+            self.db.reschedule_rappel_for_ids(chunk)
+        except Exception:
+            self._reminder_reschedule_pending = False
+            raise
+        if rest:
+            QTimer.singleShot(0, lambda: self._reschedule_reminders_chunk(rest))
+            return
+        self._reminder_reschedule_pending = False
+        # Seuls Commandes et Rappels changent (le nombre de rappels actifs, donc le
+        # badge, reste le même) : rechargés maintenant s'ils sont affichés, sinon à
+        # leur prochaine ouverture
+        self._dirty_models.update(("cmd", "rappels"))
+        self._flush_dirty(self.tabs.currentIndex())
 
 
     def _send_email_reminders(self, subject, body, due_rows):
@@ -4030,27 +5182,52 @@ class MainWindow(QMainWindow):
 
         # Tentative via Outlook COM (environnement Windows classique avec Office 365)
         try:
-            import win32com.client  # type: ignore
-
-            outlook = win32com.client.Dispatch("Outlook.Application")
-            mail = outlook.CreateItem(0)
+            mail = self._outlook_app().CreateItem(0)
             mail.To = to_addr
             mail.Subject = subject
             mail.Body = body
             mail.Send()
         except Exception as e:
+            # Outlook fermé ou instance invalide : nouvelle connexion au prochain envoi
+            self._outlook = None
             # En cas d'erreur, on loggue seulement en console sans interrompre le flux.
             try:
                 print("[WARN] Echec envoi rappel mail:", e)
             except Exception:
                 pass
+
+    def _outlook_app(self):
+        """
+        Application Outlook (COM), réutilisée d'un envoi à l'autre.
+
+        Liaison précoce (gencache.EnsureDispatch) si possible, sinon Dispatch
+        classique. Lève une exception si pywin32 ou Outlook est absent.
+        """
+        if self._outlook is None:
+            import win32com.client  # type: ignore
+
+            try:
+                self._outlook = win32com.client.gencache.EnsureDispatch("Outlook.Application")
+            except Exception:
+                self._outlook = win32com.client.Dispatch("Outlook.Application")
+        return self._outlook
+
     def test_reminders_dialog(self):
         """
         Fenêtre de test du système de rappels.
         Affiche tous les rappels actifs et permet de simuler un popup sans modifier les dates.
+        Les rappels sont lus en arrière-plan ; la fenêtre s'ouvre à réception.
         """
-        # Récupérer TOUS les rappels actifs (même futurs)
-        all_rappels = self.db.all_active_reminders()
+        # Récupérer TOUS les rappels actifs (même futurs) et aussi les rappels dus AUJOURD'HUI
+        self._run_db_read(
+            "test_rappels",
+            lambda db: (list(db.all_active_reminders()), list(db.due_reminders())),
+            self._show_test_reminders_dialog,
+        )
+
+    def _show_test_reminders_dialog(self, rappels):
+        """Fenêtre de test des rappels, une fois `rappels` = (actifs, dus) lus."""
+        all_rappels, due_rappels = rappels
         
         if not all_rappels:
             QMessageBox.information(
@@ -4064,9 +5241,6 @@ class MainWindow(QMainWindow):
             )
             return
         
-        # Récupérer aussi les rappels dus AUJOURD'HUI
-        due_rappels = self.db.due_reminders()
-        
         # Créer la fenêtre de dialogue
         dialog = QDialog(self)
         dialog.setWindowTitle("🧪 Test du système de rappels")
@@ -4080,68 +5254,18 @@ class MainWindow(QMainWindow):
             f"<b>📊 Statistiques des rappels :</b><br>"
             f"• Rappels actifs totaux : <b>{len(all_rappels)}</b><br>"
             f"• Rappels dus aujourd'hui : <b style='color: #dc3545;'>{len(due_rappels)}</b><br>"
-            f"• Intervalle de vérification : <b>{self._get_reminder_interval()} minutes</b><br><br>"
+            f"• Intervalle de vérification : <b>{self._reminder_interval_ms // 60000} minutes</b><br><br>"
             f"<i>Mode test : aucune modification ne sera apportée aux dates de rappel</i>"
         )
         info_label.setStyleSheet("padding: 10px; background-color: #e7f3ff; border-radius: 5px;")
         layout.addWidget(info_label)
         
         # === TABLEAU DES RAPPELS ===
-        table = QTableWidget()
-        table.setColumnCount(6)
-        table.setHorizontalHeaderLabels([
-            "N° Commande", 
-            "Fournisseur", 
-            "Date commande",
-            "Prochain rappel",
-            "Statut",
-            "État"
-        ])
-        table.setRowCount(len(all_rappels))
-        table.setSelectionBehavior(QTableWidget.SelectRows)
+        table = QTableView()
+        table.setModel(ReminderTestModel(all_rappels, {r["id"] for r in due_rappels}, table))
+        table.setSelectionBehavior(QTableView.SelectRows)
         table.setAlternatingRowColors(True)
         
-        due_ids = {r["id"] for r in due_rappels}
-        today = datetime.now().date()
-        
-        for i, row in enumerate(all_rappels):
-            # N° Commande
-            table.setItem(i, 0, QTableWidgetItem(row["num_commande"] or ""))
-            
-            # Fournisseur
-            table.setItem(i, 1, QTableWidgetItem(row["fournisseur"] or ""))
-            
-            # Date commande
-            dc = row["date_commande"]
-            try:
-                dc_fmt = datetime.strptime(dc, "%Y-%m-%d").strftime("%d/%m/%Y") if dc else ""
-            except Exception:
-                dc_fmt = dc or ""
-            table.setItem(i, 2, QTableWidgetItem(dc_fmt))
-            
-            # Prochain rappel
-            pr = row["prochaine_date_rappel"]
-            try:
-                pr_date = datetime.strptime(pr, "%Y-%m-%d").date() if pr else None
-                pr_fmt = pr_date.strftime("%d/%m/%Y") if pr_date else ""
-            except Exception:
-                pr_date = None
-                pr_fmt = pr or ""
-            table.setItem(i, 3, QTableWidgetItem(pr_fmt))
-            
-            # Statut
-            table.setItem(i, 4, QTableWidgetItem(row["statut"] or ""))
-            
-            # État (Dû / Futur)
-            is_due = row["id"] in due_ids
-            etat_item = QTableWidgetItem("🔴 DÛ" if is_due else "🟢 Futur")
-            if is_due:
-                etat_item.setBackground(QColor("#ffe6e6"))
-                font = etat_item.font()
-                font.setBold(True)
-                etat_item.setFont(font)
-            table.setItem(i, 5, etat_item)
-        
         table.resizeColumnsToContents()
         layout.addWidget(table)
         
@@ -4227,18 +5351,9 @@ class MainWindow(QMainWindow):
         
         lines = []
         for row in rappels:
-            dc = row["date_commande"]
-            try:
-                dc_fmt = datetime.strptime(dc, "%Y-%m-%d").strftime("%d/%m/%Y") if dc else ""
-            except Exception:
-                dc_fmt = dc or ""
-            
+            dc_fmt = format_iso_date(row["date_commande"])
             # sqlite3.Row supporte l'accès par [] mais pas .get()
-            pr = row["prochaine_date_rappel"] or ""
-            try:
-                pr_fmt = datetime.strptime(pr, "%Y-%m-%d").strftime("%d/%m/%Y") if pr else ""
-            except Exception:
-                pr_fmt = pr or ""
+            pr_fmt = format_iso_date(row["prochaine_date_rappel"])
             
             lines.append(
                 f"{row['num_commande']} - {row['fournisseur']}\n"
@@ -4257,230 +5372,171 @@ class MainWindow(QMainWindow):
 
     def refresh_fournisseur_filter(self):
         """Mise à jour de la liste des fournisseurs dans le filtre."""
-        tab_index = self.tabs.currentIndex()
-        tab_name = self.tabs.tabText(tab_index)
+        tab = self._current_tab
         
-        cur = self.db.conn.cursor()
-        fournisseurs_set = set()
-        
-        if "Commandes" in tab_name:
-            cur.execute(
-                "SELECT DISTINCT fournisseur FROM commandes WHERE fournisseur IS NOT NULL AND fournisseur != '' ORDER BY fournisseur"
-            )
-            fournisseurs_set.update([r[0] for r in cur.fetchall()])
-        elif "Factures" in tab_name and "Facturation" not in tab_name:
-            cur.execute(
-                "SELECT DISTINCT fournisseur FROM factures WHERE fournisseur IS NOT NULL AND fournisseur != '' ORDER BY fournisseur"
-            )
-            fournisseurs_set.update([r[0] for r in cur.fetchall()])
-        elif "Facturation" in tab_name:
-            # Fournisseurs depuis commandes
-            cur.execute(
-                "SELECT DISTINCT fournisseur FROM commandes WHERE fournisseur IS NOT NULL AND fournisseur != '' ORDER BY fournisseur"
-            )
-            fournisseurs_set.update([r[0] for r in cur.fetchall()])
-            # Fournisseurs depuis factures
-            cur.execute(
-                "SELECT DISTINCT fournisseur FROM factures WHERE fournisseur IS NOT NULL AND fournisseur != '' ORDER BY fournisseur"
-            )
-            fournisseurs_set.update([r[0] for r in cur.fetchall()])
+        if tab is Tab.COMMANDES:
+            fournisseurs = self._distinct_values("commandes", "fournisseur")
+        elif tab is Tab.FACTURES:
+            fournisseurs = self._distinct_values("factures", "fournisseur")
+        elif tab is Tab.FACTURATION:
+            # Fournisseurs depuis commandes et factures
+            fournisseurs = self._distinct_union_values("fournisseur")
         else:
             return
         
-        fournisseurs = sorted(list(fournisseurs_set))
-        self.fournisseur_filter_combo.blockSignals(True)
-        self.fournisseur_filter_combo.clear()
-        self.fournisseur_filter_combo.addItem("Tous")
-        for f in fournisseurs:
-            self.fournisseur_filter_combo.addItem(f)
-        self.fournisseur_filter_combo.blockSignals(False)
+        self._sync_combo(self.fournisseur_filter_combo, ["Tous"] + fournisseurs)
 
     def refresh_marche_filter(self):
         """Mise à jour de la liste des marchés dans le filtre."""
-        tab_index = self.tabs.currentIndex()
-        tab_name = self.tabs.tabText(tab_index)
+        tab = self._current_tab
         
         # Le filtre marché est pertinent pour Commandes, Factures et Facturation
-        if "Commandes" not in tab_name and "Factures" not in tab_name and "Facturation" not in tab_name:
+        if tab not in (Tab.COMMANDES, Tab.FACTURES, Tab.FACTURATION):
             return
         
         marches = self._get_marches()
-        self.marche_filter_combo.blockSignals(True)
-        self.marche_filter_combo.clear()
-        self.marche_filter_combo.addItem("Tous")
-        for m in marches:
-            self.marche_filter_combo.addItem(m)
-        self.marche_filter_combo.blockSignals(False)
+        self._sync_combo(self.marche_filter_combo, ["Tous"] + marches)
+
+    @staticmethod
+    def _sync_combo(combo, new_items):
+        """
+        Remplace les éléments de `combo` par `new_items` seulement s'ils ont changé.
+
+        La sélection courante est conservée si elle existe encore, sinon on
+        revient au premier élément ("Tous"). Aucun signal n'est émis.
+        """
+        existing = [combo.itemText(i) for i in range(combo.count())]
+        if existing == new_items:
+            return
+        current = combo.currentText()
+        with QSignalBlocker(combo):
+            combo.clear()
+            combo.addItems(new_items)
+            idx = combo.findText(current)
+            combo.setCurrentIndex(idx if idx >= 0 else 0)
     
     def refresh_multiple_filters(self):
         """Mise à jour des filtres à choix multiples."""
-        tab_index = self.tabs.currentIndex()
-        tab_name = self.tabs.tabText(tab_index)
+        tab = self._current_tab
         
         # Les filtres multiples sont seulement pour Commandes
-        if "Commandes" not in tab_name:
-            return
-        
-        cur = self.db.conn.cursor()
+        if tab is not Tab.COMMANDES:
+            return
         
         # Article fonction
-        cur.execute(
-            "SELECT DISTINCT article_fonction FROM commandes WHERE article_fonction IS NOT NULL AND article_fonction != '' ORDER BY article_fonction"
-        )
-        article_fonctions = [r[0] for r in cur.fetchall()]
-        self.article_fonction_filter.blockSignals(True)
-        self.article_fonction_filter.clear()
-        for af in article_fonctions:
-            self.article_fonction_filter.addItem(af)
-        self.article_fonction_filter.blockSignals(False)
+        article_fonctions = self._distinct_values("commandes", "article_fonction")
+        with QSignalBlocker(self.article_fonction_filter):
+            self.article_fonction_filter.set_items(article_fonctions)
         
         # Article nature
-        cur.execute(
-            "SELECT DISTINCT article_nature FROM commandes WHERE article_nature IS NOT NULL AND article_nature != '' ORDER BY article_nature"
-        )
-        article_natures = [r[0] for r in cur.fetchall()]
-        self.article_nature_filter.blockSignals(True)
-        self.article_nature_filter.clear()
-        for an in article_natures:
-            self.article_nature_filter.addItem(an)
-        self.article_nature_filter.blockSignals(False)
+        article_natures = self._distinct_values("commandes", "article_nature")
+        with QSignalBlocker(self.article_nature_filter):
+            self.article_nature_filter.set_items(article_natures)
         
         # Service émetteur
-        cur.execute(
-            "SELECT DISTINCT service_emetteur FROM commandes WHERE service_emetteur IS NOT NULL AND service_emetteur != '' ORDER BY service_emetteur"
-        )
-        service_emetteurs = [r[0] for r in cur.fetchall()]
-        self.service_emetteur_filter.blockSignals(True)
-        self.service_emetteur_filter.clear()
-        for se in service_emetteurs:
-            self.service_emetteur_filter.addItem(se)
-        self.service_emetteur_filter.blockSignals(False)
+        service_emetteurs = self._distinct_values("commandes", "service_emetteur")
+        with QSignalBlocker(self.service_emetteur_filter):
+            self.service_emetteur_filter.set_items(service_emetteurs)
         # Mettre à jour l'état visuel des labels (actif/inactif)
         self.update_multi_filter_labels()
 
 
     def refresh_rappels_tab(self):
-        rows = self.db.all_active_reminders()
-        self.table_rappels.setRowCount(len(rows))
-
-        def fmt(val):
-            if not val:
-                return ""
-            try:
-                # Supporte soit une date seule, soit une date avec heure.
-                if len(val) > 10:
-                    d = datetime.strptime(val, "%Y-%m-%d %H:%M")
-                    return d.strftime("%d/%m/%Y %H:%M")
-                else:
-                    d = datetime.strptime(val, "%Y-%m-%d")
-                    return d.strftime("%d/%m/%Y")
-            except Exception:
-                return val
-
-        for i, row in enumerate(rows):
-            vals = [
-                row["exercice"] or "",
-                row["num_commande"] or "",
-                row["fournisseur"] or "",
-                fmt(row["date_commande"]),
-                fmt(row["prochaine_date_rappel"]),
-                row["statut"] or "",
-            ]
-            for j, v in enumerate(vals):
-                item = QTableWidgetItem(str(v))
-                if j in (3, 4):
-                    item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
-                else:
-                    item.setTextAlignment(Qt.AlignLeft | Qt.AlignVCenter)
-                self.table_rappels.setItem(i, j, item)
+        """Recharge l'onglet Rappels et son badge ; la lecture se fait en arrière-plan."""
+        self._run_db_read(
+            "rappels",
+            lambda db: list(db.all_active_reminders()),
+            self._apply_rappels_rows,
+        )
 
-        self.table_rappels.resizeColumnsToContents()
-        self.table_rappels.resizeRowsToContents()
+    def _apply_rappels_rows(self, rows):
+        """Affiche les rappels actifs lus par refresh_rappels_tab."""
+        self.rappels_model.refresh(rows)
+        self._fit_columns(self.table_rappels)
         
         # Mettre à jour le badge de l'onglet Rappels
-        self._update_rappels_badge()
+        self._set_rappels_badge(len(rows))
 
     def resize_all(self):
-        """Ajuste colonnes et lignes de tous les onglets sur le contenu."""
-        # Commandes
-        self.table_cmd.resizeColumnsToContents()
-        self.table_cmd.resizeRowsToContents()
+        """Ajuste les colonnes de tous les onglets sur le contenu (si leur nombre de lignes a augmenté)."""
+        for view in (self.table_cmd, self.table_rappels, self.table_fact, self.table_synth):
+            self._fit_columns(view)
 
-        # Rappels
-        self.table_rappels.resizeColumnsToContents()
-        self.table_rappels.resizeRowsToContents()
-
-        # Factures
-        self.table_fact.resizeColumnsToContents()
-        self.table_fact.resizeRowsToContents()
+    def _fit_columns(self, view):
+        """
+        Ajuste les colonnes de `view` sur leur contenu.
 
-        # Facturation
-        self.table_synth.resizeColumnsToContents()
-        self.table_synth.resizeRowsToContents()
+        Le parcours de toutes les cellules n'est refait que si la vue compte plus
+        de lignes qu'à la mesure précédente : un changement de statut garde les
+        largeurs en place (et celles réglées à la main par l'utilisateur).
+        """
+        rows = view.model().rowCount()
+        if rows > self._measured_rows.get(view, -1):
+            view.resizeColumnsToContents()
+            self._measured_rows[view] = rows
 
     # ------------ Config ------------
 
     
     def _update_tab_colors(self, index):
         """Met à jour dynamiquement les couleurs des onglets selon l'onglet actif."""
-        # Couleurs selon l'onglet
-        colors = {
-            0: {"bg": "#0078d4", "border": "#005a9e", "shadow": "rgba(0, 120, 212, 0.3)"},  # Commandes - Bleu
-            1: {"bg": "#fd7e14", "border": "#e8590c", "shadow": "rgba(253, 126, 20, 0.3)"},  # Rappels - Orange
-            2: {"bg": "#28a745", "border": "#218838", "shadow": "rgba(40, 167, 69, 0.3)"},   # Factures - Vert
-            3: {"bg": "#6f42c1", "border": "#5a32a3", "shadow": "rgba(111, 66, 193, 0.3)"},  # Facturation - Violet
-        }
-        
-        if index in colors:
-            color = colors[index]
-            # Mettre à jour le style avec la couleur de l'onglet actif
-            self.tabs.setStyleSheet(f"""
-                QTabWidget::pane {{
-                    border: 2px solid #e0e0e0;
-                    border-radius: 8px;
-                    background-color: white;
-                    top: -2px;
-                }}
-                QTabBar::tab {{
-                    background-color: #f8f9fa;
-                    color: #495057;
-                    border: 2px solid transparent;
-                    border-radius: 8px 8px 0 0;
-                    padding: 12px 24px;
-                    margin-right: 4px;
-                    font-size: 10pt;
-                    font-weight: normal;
-                    min-width: 120px;
-                }}
-                QTabBar::tab:hover {{
-                    background-color: #e9ecef;
-                }}
-                QTabBar::tab:selected {{
-                    background-color: {color['bg']};
-                    color: white;
-                    border: 2px solid {color['border']};
-                    font-weight: bold;
-                }}
-            """)
+        qss = _TAB_QSS.get(index)
+        # Feuille de style précalculée ; Qt ne la réanalyse que si elle change
+        if qss is not None and self.tabs.styleSheet() != qss:
+            self.tabs.setStyleSheet(qss)
     
+    def _run_db_read(self, key, fetch, on_loaded):
+        """
+        Exécute `fetch(db)` dans le QThreadPool sur une connexion dédiée, puis
+        appelle `on_loaded(résultat)` dans le thread principal.
+
+        Pour une même `key`, seule la lecture la plus récente est transmise :
+        une réponse plus ancienne arrivée en retard est ignorée.
+        """
+        seq = self._db_read_seq[key] = self._db_read_seq.get(key, 0) + 1
+        db = self.db
+
+        def job():
+            reader = db.for_thread()
+            try:
+                return fetch(reader)
+            finally:
+                reader.close()
+
+        task = ExportTask(job)
+
+        def loaded(result):
+            self._db_read_tasks.discard(task)
+            if self._db_read_seq[key] == seq:
+                on_loaded(result)
+
+        def failed(message):
+            self._db_read_tasks.discard(task)
+            print(f"[ERREUR] Lecture en arrière-plan ({key}) : {message}")
+
+        task.signals.finished.connect(loaded)
+        task.signals.failed.connect(failed)
+        # Garder une référence : les signaux doivent survivre jusqu'à la fin de la tâche
+        self._db_read_tasks.add(task)
+        QThreadPool.globalInstance().start(task)
+
     def _update_rappels_badge(self):
-        """Met à jour le badge de l'onglet Rappels avec le nombre de rappels actifs."""
+        """Met à jour le badge de l'onglet Rappels avec le nombre de rappels actifs (lu en arrière-plan)."""
+        self._run_db_read("badge", Database.count_active_reminders, self._set_rappels_badge)
+
+    def _set_rappels_badge(self, count):
+        """Affiche `count` rappels actifs dans le titre de l'onglet Rappels."""
+        # Titre déjà à jour : pas de setTabText (ni de relayout de la barre d'onglets)
+        if count == self._rappels_badge_count:
+            return
+        self._rappels_badge_count = count
         try:
-            # Compter le nombre de rappels actifs
-            rows = self.db.all_active_reminders()
-            count = len(rows)
-            
-            # Trouver l'index de l'onglet Rappels
-            for i in range(self.tabs.count()):
-                tab_text = self.tabs.tabText(i)
-                if "Rappels" in tab_text:
-                    # Mettre à jour le texte avec le badge
-                    if count > 0:
-                        new_text = f"🔔 Rappels ({count})"
-                    else:
-                        new_text = "🔔 Rappels"
-                    self.tabs.setTabText(i, new_text)
-                    break
+            # Mettre à jour le texte de l'onglet Rappels avec le badge
+            if count > 0:
+                new_text = f"🔔 Rappels ({count})"
+            else:
+                new_text = "🔔 Rappels"
+            self.tabs.setTabText(Tab.RAPPELS, new_text)
         except Exception:
             pass  # En cas d'erreur, on ne fait rien
 
@@ -4488,43 +5544,38 @@ class MainWindow(QMainWindow):
     
     def _get_active_table_data(self):
         """Récupère les données du tableau actif avec métadonnées."""
-        tab_index = self.tabs.currentIndex()
-        tab_name = self.tabs.tabText(tab_index)
+        tab = self._current_tab
+        tab_name = self.tabs.tabText(tab)
         
         # Déterminer le tableau, le modèle et les colonnes
-        if "Commandes" in tab_name:
+        if tab is Tab.COMMANDES:
             table = self.table_cmd
             proxy = self.cmd_proxy
             source_model = self.cmd_model
             columns = COMMANDES_COLUMNS
             titre = "Liste des commandes"
-        elif "Factures" in tab_name and "Facturation" not in tab_name:
+        elif tab is Tab.FACTURES:
             table = self.table_fact
             proxy = self.fact_proxy
             source_model = self.fact_model
             columns = FACTURES_COLUMNS
             titre = "Liste des factures"
-        elif "Facturation" in tab_name:
+        elif tab is Tab.FACTURATION:
             table = self.table_synth
             proxy = self.synth_proxy
             source_model = self.synth_model
             columns = FACTURATION_COLUMNS
             titre = "Synthèse de facturation"
-        elif "Rappels" in tab_name:
-            # Pour les rappels, on utilise le QTableWidget
+        elif tab is Tab.RAPPELS:
+            # Pour les rappels, textes affichés dans l'ordre de tri courant
             titre = "Rappels de paiement en cours"
-            headers = []
-            for col in range(self.table_rappels.columnCount()):
-                header_item = self.table_rappels.horizontalHeaderItem(col)
-                headers.append(header_item.text() if header_item else f"Col{col}")
+            headers = [col[1] for col in RAPPELS_COLUMNS]
             
-            data = []
-            for row in range(self.table_rappels.rowCount()):
-                row_data = []
-                for col in range(self.table_rappels.columnCount()):
-                    item = self.table_rappels.item(row, col)
-                    row_data.append(item.text() if item else "")
-                data.append(row_data)
+            proxy = self.rappels_proxy
+            data = [
+                [proxy.index(row, col).data() for col in range(proxy.columnCount())]
+                for row in range(proxy.rowCount())
+            ]
             
             return {
                 "titre": titre,
@@ -4539,29 +5590,20 @@ class MainWindow(QMainWindow):
         headers = [col[1] for col in columns]
         
         # Récupérer les données filtrées
-        data = []
         config = self.db.get_config_exports()
         
         if config.get("lignes_filtrees_uniquement", True):
-            # Exporter seulement les lignes visibles (filtrées)
-            for row in range(proxy.rowCount()):
-                row_data = []
-                for col in range(len(columns)):
-                    index = proxy.index(row, col)
-                    value = proxy.data(index, Qt.DisplayRole)
-                    row_data.append(str(value) if value is not None else "")
-                data.append(row_data)
+            # Exporter seulement les lignes visibles (filtrées), dans l'ordre affiché :
+            # une correspondance proxy -> source par ligne, pas par cellule
+            source_rows = [
+                proxy.mapToSource(proxy.index(row, 0)).row() for row in range(proxy.rowCount())
+            ]
         else:
             # Exporter toutes les lignes (non filtré)
-            for row in range(source_model.rowCount()):
-                row_data = []
-                for col in range(len(columns)):
-                    index = source_model.index(row, col)
-                    value = source_model.data(index, Qt.DisplayRole)
-                    row_data.append(str(value) if value is not None else "")
-                data.append(row_data)
+            source_rows = range(source_model.rowCount())
+        data = source_model.display_rows(source_rows, columns)
         
-        return {
+        table_data = {
             "titre": titre,
             "headers": headers,
             "data": data,
@@ -4570,11 +5612,18 @@ class MainWindow(QMainWindow):
             "proxy": proxy,
             "source_model": source_model
         }
+        if tab is Tab.FACTURATION:
+            # Statut classé une fois par ligne : les exports colorient sur un entier
+            codes = STATUT_FACTURATION_CODES
+            model_rows = source_model.rows
+            table_data["status_codes"] = [
+                codes.get(model_rows[r]["statut_facturation"], 0) for r in source_rows
+            ]
+        return table_data
     
     def _get_active_filters_description(self):
         """Retourne une description textuelle des filtres actifs."""
-        tab_index = self.tabs.currentIndex()
-        tab_name = self.tabs.tabText(tab_index)
+        tab = self._current_tab
         
         filters = []
         
@@ -4601,7 +5650,7 @@ class MainWindow(QMainWindow):
                 filters.append(f"Marché: {marche_text}")
         
         # Filtres multiples (Commandes uniquement)
-        if "Commandes" in tab_name:
+        if tab is Tab.COMMANDES:
             checked_af = self.article_fonction_filter.checked_items()
             if checked_af:
                 filters.append(f"Art. fonction: {', '.join(checked_af)}")
@@ -4619,15 +5668,99 @@ class MainWindow(QMainWindow):
         
         return " | ".join(filters)
     
+    def _set_exports_enabled(self, enabled):
+        """Active/désactive les commandes d'export (une seule écriture à la fois)."""
+        for widget in (self.act_export, self.btn_export_marches,
+                       self.btn_export_operation, self.btn_export_operation_2020):
+            widget.setEnabled(enabled)
+
+    def _run_in_pool(self, label, job, on_success, error_title, window_title="Export en cours"):
+        """
+        Lance `job` dans le QThreadPool global derrière une fenêtre de progression.
+
+        `job` peut écrire un fichier d'export ou charger des données (cache des
+        marchés, visions) ; il ne doit jamais toucher aux widgets ni aux modèles
+        Qt, et s'il lit la base il ouvre sa propre connexion via
+        `Database.for_thread()` (la connexion principale est réservée au thread
+        principal). `on_success(résultat)` est appelé dans le thread principal
+        avec la valeur retournée par `job`.
+        """
+        progress = QProgressDialog(label, None, 0, 0, self)
+        progress.setWindowTitle(window_title)
+        progress.setWindowModality(Qt.WindowModal)
+        progress.setMinimumDuration(0)
+        progress.show()
+        self._set_exports_enabled(False)
+
+        task = ExportTask(job)
+
+        def finish():
+            progress.close()
+            self._set_exports_enabled(True)
+            self._export_task = None
+
+        def succeeded(result):
+            finish()
+            on_success(result)
+
+        def failed(message):
+            finish()
+            QMessageBox.critical(self, error_title, f"Une erreur est survenue :\n{message}")
+
+        task.signals.finished.connect(succeeded)
+        task.signals.failed.connect(failed)
+        # Garder une référence : les signaux doivent survivre jusqu'à la fin de la tâche
+        self._export_task = task
+        QThreadPool.globalInstance().start(task)
+
+    def _analyzer_export_job(self, method_name, *args, **kwargs):
+        """
+        Prépare un export MarchesAnalyzer exécutable dans un thread de travail.
+
+        L'analyseur est copié (données partagées en lecture) et reçoit sa propre
+        connexion SQLite, la connexion principale n'étant utilisable que depuis
+        le thread principal.
+        """
+        analyzer = copy.copy(self.marches_analyzer)
+
+        def job():
+            db = self.db.for_thread()
+            try:
+                analyzer.db = db
+                return getattr(analyzer, method_name)(*args, **kwargs)
+            finally:
+                db.close()
+
+        return job
+
+    def _propose_open_export(self, file_path, label):
+        """Propose d'ouvrir le fichier exporté."""
+        reply = QMessageBox.question(
+            self,
+            "Export réussi",
+            f"{label} a été créé avec succès :\n{file_path}\n\nVoulez-vous l'ouvrir ?",
+            QMessageBox.Yes | QMessageBox.No
+        )
+        
+        if reply == QMessageBox.Yes:
+            # Lancement détaché : la visionneuse s'ouvre sans bloquer l'interface
+            # (os.startfile rend la main dès que le shell a pris le relais et
+            # ne passe pas le chemin à l'interpréteur de cmd.exe)
+            if sys.platform == "win32":
+                os.startfile(file_path)
+            elif sys.platform == "darwin":
+                subprocess.Popen(["open", file_path])
+            else:
+                subprocess.Popen(["xdg-open", file_path])
+
     def export_to_pdf(self):
         """Exporte le tableau actif en PDF avec mise en page professionnelle."""
         try:
             from reportlab.lib import colors
             from reportlab.lib.pagesizes import A4, landscape
-            from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
             from reportlab.lib.units import cm
-            from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, Image, PageBreak
-            from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
+            from reportlab.lib.utils import simpleSplit
+            from reportlab.platypus import SimpleDocTemplate, LongTable, TableStyle, Paragraph, Spacer, Image, PageBreak
             
             # Récupérer les données
             table_data = self._get_active_table_data()
@@ -4665,8 +5798,8 @@ class MainWindow(QMainWindow):
                 bottomMargin=2*cm
             )
             
-            # Styles
-            styles = getSampleStyleSheet()
+            # Styles (construits une fois, partagés entre les exports)
+            pdf_styles = pdf_paragraph_styles()
             story = []
             
             # === EN-TÊTE ===
@@ -4683,26 +5816,14 @@ class MainWindow(QMainWindow):
             # Informations entreprise
             nom_entreprise = config.get("nom_entreprise", "")
             if nom_entreprise:
-                style_entreprise = ParagraphStyle(
-                    'Entreprise',
-                    parent=styles['Normal'],
-                    fontSize=12,
-                    alignment=TA_CENTER,
-                    fontName='Helvetica-Bold'
-                )
-                story.append(Paragraph(nom_entreprise, style_entreprise))
+                story.append(Paragraph(nom_entreprise, pdf_styles["entreprise"]))
                 
                 adresse_1 = config.get("adresse_1", "")
                 adresse_2 = config.get("adresse_2", "")
                 code_postal = config.get("code_postal", "")
                 ville = config.get("ville", "")
                 
-                style_adresse = ParagraphStyle(
-                    'Adresse',
-                    parent=styles['Normal'],
-                    fontSize=9,
-                    alignment=TA_CENTER
-                )
+                style_adresse = pdf_styles["adresse"]
                 
                 if adresse_1:
                     story.append(Paragraph(adresse_1, style_adresse))
@@ -4719,26 +5840,11 @@ class MainWindow(QMainWindow):
             story.append(Spacer(1, 0.3*cm))
             
             # Titre du document
-            style_titre = ParagraphStyle(
-                'Titre',
-                parent=styles['Heading1'],
-                fontSize=16,
-                alignment=TA_CENTER,
-                fontName='Helvetica-Bold',
-                textColor=colors.HexColor("#0078d4")
-            )
-            story.append(Paragraph(table_data['titre'], style_titre))
+            story.append(Paragraph(table_data['titre'], pdf_styles["titre"]))
             
             # Date de génération
             now = datetime.now().strftime("%d/%m/%Y à %H:%M")
-            style_date = ParagraphStyle(
-                'Date',
-                parent=styles['Normal'],
-                fontSize=9,
-                alignment=TA_CENTER,
-                textColor=colors.grey
-            )
-            story.append(Paragraph(f"Généré le : {now}", style_date))
+            story.append(Paragraph(f"Généré le : {now}", pdf_styles["date"]))
             story.append(Spacer(1, 0.2*cm))
             
             # Ligne de séparation
@@ -4747,65 +5853,13 @@ class MainWindow(QMainWindow):
             
             # Filtres appliqués
             filters_desc = self._get_active_filters_description()
-            style_filtres = ParagraphStyle(
-                'Filtres',
-                parent=styles['Normal'],
-                fontSize=8,
-                alignment=TA_LEFT,
-                textColor=colors.grey
-            )
-            story.append(Paragraph(f"<b>Filtres appliqués :</b> {filters_desc}", style_filtres))
+            story.append(Paragraph(f"<b>Filtres appliqués :</b> {filters_desc}", pdf_styles["filtres"]))
             story.append(Spacer(1, 0.5*cm))
             
             # === TABLEAU DE DONNÉES ===
             # Préparer les données avec word wrap pour certaines colonnes
             
-            # Style pour les cellules avec word wrap
-            style_cell = ParagraphStyle(
-                'CellStyle',
-                parent=styles['Normal'],
-                fontSize=6,
-                leading=7,
-                alignment=TA_LEFT
-            )
-            
-            # Convertir les données en Paragraphs pour word wrap sur colonnes 2 (Fournisseur) et 3 (Libellé)
-            pdf_data = []
-            
-            # En-têtes (première ligne)
-            pdf_data.append(table_data['headers'])
-            
-            # Données avec word wrap
-            for row_data in table_data['data']:
-                new_row = []
-                for col_idx, cell_value in enumerate(row_data):
-                    # Colonnes 2 (Fournisseur) et 3 (Libellé) : word wrap
-                    if col_idx == 2:  # Fournisseur - word wrap 2 lignes max
-                        # Limiter à environ 35 caractères pour forcer 2 lignes
-                        text = str(cell_value)[:70] if cell_value else ""
-                        new_row.append(Paragraph(text, style_cell))
-                    elif col_idx == 3:  # Libellé - word wrap
-                        text = str(cell_value) if cell_value else ""
-                        new_row.append(Paragraph(text, style_cell))
-                    elif col_idx == 8:  # Section - raccourcir les termes
-                        text = str(cell_value) if cell_value else ""
-                        text = text.replace("Fonctionnement", "Fonct").replace("Investissement", "Invest")
-                        new_row.append(text)
-                    elif col_idx == 16:  # Statut facturation - ajouter retour ligne
-                        text = str(cell_value) if cell_value else ""
-                        # Ajouter retour ligne après le premier mot (ex: "Totalement\nfacturée")
-                        if " " in text:
-                            parts = text.split(" ", 1)
-                            text = parts[0] + "\n" + parts[1]
-                        new_row.append(text)
-                    else:
-                        # Autres colonnes : texte simple
-                        new_row.append(str(cell_value) if cell_value else "")
-                pdf_data.append(new_row)
-            
             # Définir les largeurs de colonnes en cm (optimisées pour A4 paysage)
-            num_cols = len(table_data['headers'])
-            
             if num_cols == 17:  # Commandes
                 col_widths = [
                     1.0*cm,   # Exercice
@@ -4830,8 +5884,58 @@ class MainWindow(QMainWindow):
                 # Largeurs automatiques pour autres onglets
                 col_widths = None
             
-            # Créer le tableau avec largeurs de colonnes
-            pdf_table = Table(pdf_data, colWidths=col_widths, repeatRows=1)
+            # Style pour les cellules avec word wrap
+            style_cell = pdf_styles["cell"]
+            
+            # Cellules à retour à la ligne mémoïsées par (colonne, texte) : un fournisseur
+            # présent sur des centaines de lignes n'est traité qu'une fois.
+            # Avec des largeurs fixes, le texte est découpé d'avance à la largeur utile
+            # de la colonne (simpleSplit, mesure des glyphes Helvetica) et passé comme
+            # simple chaîne multiligne : pas d'analyse ni de mise en page de Paragraph.
+            # Sans largeurs fixes, Paragraph reste nécessaire (la colonne s'adapte).
+            @lru_cache(maxsize=4096)
+            def cell_paragraph(col_idx, text):
+                if col_widths is None:
+                    return Paragraph(text, style_cell)
+                width = col_widths[col_idx] - 4  # LEFTPADDING + RIGHTPADDING
+                # Retours à la ligne de display() repliés en espaces, comme Paragraph
+                return "\n".join(simpleSplit(" ".join(text.split()), "Helvetica", 6, width))
+            
+            # Convertir les données en Paragraphs pour word wrap sur colonnes 2 (Fournisseur) et 3 (Libellé)
+            pdf_data = []
+            
+            # En-têtes (première ligne)
+            pdf_data.append(table_data['headers'])
+            
+            # Mise en forme par colonne : une fonction par indice, choisie une fois
+            # pour toutes au lieu d'une cascade de tests sur chaque cellule
+            def cell_text(value):
+                # Autres colonnes : texte simple
+                return str(value) if value else ""
+            
+            def cell_fournisseur(value):
+                # Fournisseur - word wrap 2 lignes max
+                # Limiter à environ 35 caractères pour forcer 2 lignes
+                return cell_paragraph(2, str(value)[:70] if value else "")
+            
+            def cell_libelle(value):
+                # Libellé - word wrap
+                return cell_paragraph(3, cell_text(value))
+            
+            def cell_section(value):
+                # Section - raccourcir les termes
+                return cell_text(value).replace("Fonctionnement", "Fonct").replace("Investissement", "Invest")
+            
+            def cell_statut_facturation(value):
+                # Statut facturation - retour ligne après le premier mot (ex: "Totalement\nfacturée")
+                return cell_text(value).replace(" ", "\n", 1)
+            
+            width = max(map(len, table_data['data']), default=0)
+            handlers = [cell_text] * max(width, 17)
+            handlers[2] = cell_fournisseur
+            handlers[3] = cell_libelle
+            handlers[8] = cell_section
+            handlers[16] = cell_statut_facturation
             
             # Style du tableau (optimisé pour densité)
             table_style = [
@@ -4848,6 +5952,7 @@ class MainWindow(QMainWindow):
                 # Données
                 ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
                 ('FONTSIZE', (0, 1), (-1, -1), 6),
+                ('LEADING', (0, 1), (-1, -1), 7),
                 ('ALIGN', (0, 1), (-1, -1), 'LEFT'),
                 ('VALIGN', (0, 0), (-1, -1), 'TOP'),
                 ('LEFTPADDING', (0, 1), (-1, -1), 2),
@@ -4867,51 +5972,56 @@ class MainWindow(QMainWindow):
             
             # Appliquer les couleurs de fond selon le statut (si demandé)
             if config.get("inclure_couleurs", True) and "Facturation" in table_data.get("tab_name", ""):
-                # Pour la facturation, colorier selon le statut
-                for row_idx, row_data in enumerate(table_data['data'], start=1):
-                    # Le statut est généralement en avant-dernière colonne
-                    if len(row_data) >= 2:
-                        statut = row_data[-2] if len(row_data) > 1 else ""
-                        if "Totalement" in str(statut):
-                            table_style.append(('BACKGROUND', (0, row_idx), (-1, row_idx), colors.HexColor("#e0ffe0")))
-                        elif "Partiellement" in str(statut):
-                            table_style.append(('BACKGROUND', (0, row_idx), (-1, row_idx), colors.HexColor("#fff3cd")))
-                        elif "Non facturée" in str(statut):
-                            table_style.append(('BACKGROUND', (0, row_idx), (-1, row_idx), colors.HexColor("#ffe0e0")))
-            
-            pdf_table.setStyle(TableStyle(table_style))
-            story.append(pdf_table)
-            
-            # Pied de page (sera sur toutes les pages)
-            story.append(Spacer(1, 1*cm))
-            style_footer = ParagraphStyle(
-                'Footer',
-                parent=styles['Normal'],
-                fontSize=7,
-                alignment=TA_CENTER,
-                textColor=colors.grey
-            )
-            story.append(Paragraph(f"Document généré par Suivi Commandes/Factures/Marchés", style_footer))
+                # Pour la facturation, colorier selon le statut.
+                # Les lignes consécutives de même couleur sont regroupées en une seule
+                # commande BACKGROUND (une par plage au lieu d'une par ligne).
+                # Indexé par STATUT_FACTURATION_CODES (0 : pas de couleur)
+                status_colors = (
+                    None,
+                    colors.HexColor("#ffe0e0"),
+                    colors.HexColor("#fff3cd"),
+                    colors.HexColor("#e0ffe0"),
+                )
+                status_codes = table_data.get("status_codes", ())
+                run_color = None
+                run_start = 1
+                for row_idx, code in enumerate(status_codes, start=1):
+                    color = status_colors[code]
+                    if color is not run_color:
+                        if run_color is not None:
+                            table_style.append(('BACKGROUND', (0, run_start), (-1, row_idx - 1), run_color))
+                        run_color = color
+                        run_start = row_idx
+                if run_color is not None:
+                    table_style.append(('BACKGROUND', (0, run_start), (-1, len(status_codes)), run_color))
             
-            # Générer le PDF
-            doc.build(story)
+            def build_pdf():
+                # Conversion des cellules (découpage des textes) et mise en page dans
+                # le thread d'export : les lignes sont des copies, sans accès Qt
+                
+                # Données avec word wrap
+                for row_data in table_data['data']:
+                    pdf_data.append([handler(value) for handler, value in zip(handlers, row_data)])
+                
+                # Créer le tableau avec largeurs de colonnes (LongTable : découpage en
+                # pages sans recalculer toute la table à chaque page)
+                pdf_table = LongTable(pdf_data, colWidths=col_widths, repeatRows=1)
+                pdf_table.setStyle(TableStyle(table_style))
+                story.append(pdf_table)
+                
+                # Pied de page (sera sur toutes les pages)
+                story.append(Spacer(1, 1*cm))
+                story.append(Paragraph(f"Document généré par Suivi Commandes/Factures/Marchés", pdf_styles["footer"]))
+                
+                doc.build(story)
             
-            # Message de succès
-            reply = QMessageBox.question(
-                self,
-                "Export réussi",
-                f"Le fichier PDF a été créé avec succès :\n{file_path}\n\nVoulez-vous l'ouvrir ?",
-                QMessageBox.Yes | QMessageBox.No
+            # Générer le PDF (en arrière-plan)
+            self._run_in_pool(
+                "Génération du PDF…",
+                build_pdf,
+                lambda _result: self._propose_open_export(file_path, "Le fichier PDF"),
+                "Erreur d'export PDF",
             )
-            
-            if reply == QMessageBox.Yes:
-                import subprocess
-                if sys.platform == "win32":
-                    os.startfile(file_path)
-                elif sys.platform == "darwin":
-                    subprocess.call(["open", file_path])
-                else:
-                    subprocess.call(["xdg-open", file_path])
         
         except Exception as e:
             QMessageBox.critical(self, "Erreur d'export PDF", f"Une erreur est survenue :\n{str(e)}")
@@ -4920,7 +6030,7 @@ class MainWindow(QMainWindow):
         """Exporte le tableau actif en Excel avec mise en page professionnelle."""
         try:
             from openpyxl import Workbook
-            from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
+            from openpyxl.styles import Font, NamedStyle
             from openpyxl.utils import get_column_letter
             from openpyxl.drawing.image import Image as OpenpyxlImage
             
@@ -4947,6 +6057,11 @@ class MainWindow(QMainWindow):
                 return
             
             # Créer le classeur
+            # (mode normal et non write_only : la feuille Statistiques fusionne
+            # ses bandeaux et la page de garde écrit par coordonnées, deux
+            # opérations refusées en écriture en flux ; les lignes de données
+            # sont déjà ajoutées par ws.append et l'enregistrement se fait hors
+            # du thread principal)
             wb = Workbook()
             
             # === FEUILLE DE GARDE ===
@@ -4971,8 +6086,7 @@ class MainWindow(QMainWindow):
             # Informations entreprise
             nom_entreprise = config.get("nom_entreprise", "")
             if nom_entreprise:
-                ws_garde[f'A{row}'] = nom_entreprise
-                ws_garde[f'A{row}'].font = Font(size=14, bold=True)
+                ws_garde.cell(row=row, column=1, value=nom_entreprise).font = Font(size=14, bold=True)
                 row += 1
                 
                 adresse_1 = config.get("adresse_1", "")
@@ -4981,35 +6095,31 @@ class MainWindow(QMainWindow):
                 ville = config.get("ville", "")
                 
                 if adresse_1:
-                    ws_garde[f'A{row}'] = adresse_1
+                    ws_garde.cell(row=row, column=1, value=adresse_1)
                     row += 1
                 if adresse_2:
-                    ws_garde[f'A{row}'] = adresse_2
+                    ws_garde.cell(row=row, column=1, value=adresse_2)
                     row += 1
                 if code_postal or ville:
-                    ws_garde[f'A{row}'] = f"{code_postal} {ville}"
+                    ws_garde.cell(row=row, column=1, value=f"{code_postal} {ville}")
                     row += 1
             
             row += 2
             
             # Titre du document
-            ws_garde[f'A{row}'] = table_data['titre']
-            ws_garde[f'A{row}'].font = Font(size=16, bold=True, color="0078D4")
+            ws_garde.cell(row=row, column=1, value=table_data['titre']).font = Font(size=16, bold=True, color="0078D4")
             row += 1
             
             # Date de génération
             now = datetime.now().strftime("%d/%m/%Y à %H:%M")
-            ws_garde[f'A{row}'] = f"Généré le : {now}"
-            ws_garde[f'A{row}'].font = Font(size=10, italic=True)
+            ws_garde.cell(row=row, column=1, value=f"Généré le : {now}").font = Font(size=10, italic=True)
             row += 2
             
             # Filtres appliqués
             filters_desc = self._get_active_filters_description()
-            ws_garde[f'A{row}'] = "Filtres appliqués :"
-            ws_garde[f'A{row}'].font = Font(bold=True)
+            ws_garde.cell(row=row, column=1, value="Filtres appliqués :").font = Font(bold=True)
             row += 1
-            ws_garde[f'A{row}'] = filters_desc
-            ws_garde[f'A{row}'].font = Font(size=9, color="666666")
+            ws_garde.cell(row=row, column=1, value=filters_desc).font = Font(size=9, color="666666")
             
             # Largeur de colonne
             ws_garde.column_dimensions['A'].width = 60
@@ -5017,53 +6127,57 @@ class MainWindow(QMainWindow):
             # === FEUILLE DE DONNÉES ===
             ws_data = wb.create_sheet(title="Données")
             
-            # En-têtes
-            for col_idx, header in enumerate(table_data['headers'], start=1):
-                cell = ws_data.cell(row=1, column=col_idx, value=header)
-                cell.font = Font(bold=True, color="FFFFFF")
-                cell.fill = PatternFill(start_color="0078D4", end_color="0078D4", fill_type="solid")
-                cell.alignment = Alignment(horizontal='center', vertical='center', wrap_text=True)
-                cell.border = Border(
-                    left=Side(style='thin'),
-                    right=Side(style='thin'),
-                    top=Side(style='thin'),
-                    bottom=Side(style='thin')
-                )
+            # Styles nommés enregistrés une seule fois : chaque cellule ne reçoit
+            # ensuite qu'une référence de style au lieu de 3-4 objets recréés.
+            xl_styles = excel_export_styles()
+            fills = xl_styles["fills"]
             
-            # Données
-            for row_idx, row_data in enumerate(table_data['data'], start=2):
-                for col_idx, value in enumerate(row_data, start=1):
-                    cell = ws_data.cell(row=row_idx, column=col_idx, value=value)
-                    cell.alignment = Alignment(horizontal='left', vertical='center', wrap_text=True)
-                    cell.border = Border(
-                        left=Side(style='thin', color="CCCCCC"),
-                        right=Side(style='thin', color="CCCCCC"),
-                        top=Side(style='thin', color="CCCCCC"),
-                        bottom=Side(style='thin', color="CCCCCC")
-                    )
-                    
-                    # Alternance de couleurs
-                    if row_idx % 2 == 0:
-                        cell.fill = PatternFill(start_color="F8F9FA", end_color="F8F9FA", fill_type="solid")
+            def add_style(name, fill_color=None, **kwargs):
+                style = NamedStyle(name=name, **kwargs)
+                if fill_color:
+                    style.fill = fills[fill_color]
+                wb.add_named_style(style)
+                return name
             
-            # Appliquer les couleurs selon le statut (si demandé)
+            header_style = add_style(
+                "export_header", "0078D4",
+                font=xl_styles["header_font"],
+                alignment=xl_styles["header_alignment"],
+                border=xl_styles["header_border"],
+            )
+            data_kwargs = {
+                "alignment": xl_styles["data_alignment"],
+                "border": xl_styles["data_border"],
+            }
+            data_even_style = add_style("export_data_even", "F8F9FA", **data_kwargs)
+            data_odd_style = add_style("export_data_odd", **data_kwargs)
+            
+            # Couleurs selon le statut de facturation (si demandé)
+            # (indexé par STATUT_FACTURATION_CODES, 0 : style de ligne habituel)
+            status_codes = ()
             if config.get("inclure_couleurs", True) and "Facturation" in table_data.get("tab_name", ""):
-                for row_idx, row_data in enumerate(table_data['data'], start=2):
-                    if len(row_data) >= 2:
-                        statut = row_data[-2] if len(row_data) > 1 else ""
-                        color = None
-                        if "Totalement" in str(statut):
-                            color = "E0FFE0"
-                        elif "Partiellement" in str(statut):
-                            color = "FFF3CD"
-                        elif "Non facturée" in str(statut):
-                            color = "FFE0E0"
-                        
-                        if color:
-                            for col_idx in range(1, len(row_data) + 1):
-                                ws_data.cell(row=row_idx, column=col_idx).fill = PatternFill(
-                                    start_color=color, end_color=color, fill_type="solid"
-                                )
+                status_codes = table_data.get("status_codes", ())
+                status_styles = (
+                    None,
+                    add_style("export_data_non_facturee", "FFE0E0", **data_kwargs),
+                    add_style("export_data_partiel", "FFF3CD", **data_kwargs),
+                    add_style("export_data_total", "E0FFE0", **data_kwargs),
+                )
+            
+            # En-têtes
+            ws_data.append(table_data['headers'])
+            for cell in ws_data[1]:
+                cell.style = header_style
+            
+            # Données : une ligne ajoutée d'un bloc, un seul style par cellule
+            # (accès direct par ws.cell : ws[ligne] rebalaye toute la feuille)
+            for row_idx, row_data in enumerate(table_data['data'], start=2):
+                ws_data.append(row_data)
+                style = data_even_style if row_idx % 2 == 0 else data_odd_style
+                if status_codes:
+                    style = status_styles[status_codes[row_idx - 2]] or style
+                for col_idx in range(1, len(row_data) + 1):
+                    ws_data.cell(row=row_idx, column=col_idx).style = style
             
             # Figer la première ligne
             ws_data.freeze_panes = "A2"
@@ -5072,13 +6186,21 @@ class MainWindow(QMainWindow):
             ws_data.auto_filter.ref = ws_data.dimensions
             
             # Ajuster les largeurs de colonnes
+            # Longueurs max calculées d'un coup (numpy) sur l'échantillon des 100
+            # premières lignes, complétées à la largeur des en-têtes
+            nb_cols = len(table_data['headers'])
+            sample = table_data['data'][:100]
+            if sample and nb_cols:
+                grid = np.array(
+                    [list(r[:nb_cols]) + [""] * (nb_cols - len(r)) for r in sample],
+                    dtype=object,
+                )
+                col_max = np.char.str_len(grid.astype(str)).max(axis=0)
+            else:
+                col_max = np.zeros(nb_cols, dtype=int)
+            
             for col_idx, header in enumerate(table_data['headers'], start=1):
-                # Calcul de la largeur optimale
-                max_length = len(str(header))
-                for row_data in table_data['data'][:100]:  # Échantillon des 100 premières lignes
-                    if col_idx <= len(row_data):
-                        cell_value = str(row_data[col_idx - 1])
-                        max_length = max(max_length, len(cell_value))
+                max_length = max(len(str(header)), int(col_max[col_idx - 1]))
                 
                 # Limiter la largeur entre 10 et 50
                 adjusted_width = min(max(max_length + 2, 10), 50)
@@ -5087,396 +6209,155 @@ class MainWindow(QMainWindow):
             # === FEUILLE STATISTIQUES ===
             ws_stats = wb.create_sheet(title="Statistiques")
             
+            # Styles partagés par tous les blocs (mêmes instances réutilisées)
+            block_font = xl_styles["block_font"]
+            block_fill = fills["0078D4"]
+            table_head_font = xl_styles["bold_font"]
+            table_head_fill = fills["E7F3FF"]
+            status_fills = fills
+            # Formats monétaire et pourcentage : styles nommés enregistrés une fois
+            # (police et remplissage éventuels appliqués après le style)
+            montant_style = add_style("export_montant", number_format='#,##0.00 €')
+            pourcentage_style = add_style("export_pourcentage", number_format='0.00%')
+            
             # Titre principal
             row = 1
-            ws_stats[f'A{row}'] = "Statistiques détaillées"
-            ws_stats[f'A{row}'].font = Font(size=14, bold=True, color="0078D4")
-            ws_stats.merge_cells(f'A{row}:D{row}')
+            ws_stats.cell(row=row, column=1, value="Statistiques détaillées").font = xl_styles["title_font"]
+            # Fusions des bandeaux appliquées en une fois, après l'écriture des tableaux
+            pending_merges = [f'A{row}:D{row}']
             row += 2
             
             # Analyser les données pour extraire les colonnes nécessaires
             headers = table_data['headers']
             data = table_data['data']
             
-            # Trouver les indices des colonnes (peuvent varier selon l'onglet)
-            col_indices = {}
-            for idx, header in enumerate(headers):
-                header_lower = header.lower()
-                if "montant" in header_lower and "ttc" in header_lower:
-                    col_indices['montant_ttc'] = idx
-                elif "montant" in header_lower and "factur" in header_lower:
-                    col_indices['montant_facture'] = idx
-                elif "reste" in header_lower and "facturer" in header_lower:
-                    col_indices['reste_a_facturer'] = idx
-                elif "fournisseur" in header_lower:
-                    col_indices['fournisseur'] = idx
-                elif "statut" in header_lower and "facturation" in header_lower:
-                    col_indices['statut_facturation'] = idx
-                elif "statut" in header_lower and "facturation" not in header_lower:
-                    col_indices['statut'] = idx
-                elif "section" in header_lower:
-                    col_indices['section'] = idx
-                elif "exercice" in header_lower:
-                    col_indices['exercice'] = idx
-                elif "marché" in header_lower or "marche" in header_lower:
-                    col_indices['marche'] = idx
+            # Trouver les indices des colonnes (peuvent varier selon l'onglet ;
+            # résultat mis en cache par jeu d'en-têtes)
+            col_indices = export_column_indices(tuple(headers))
             
-            # Fonction helper pour extraire montant
-            def parse_montant(value):
-                if not value:
-                    return 0.0
-                try:
-                    clean = str(value).replace(' ', '').replace(',', '.').replace('€', '').strip()
-                    return float(clean)
-                except:
-                    return 0.0
+            # Totaux et regroupements calculés colonne par colonne (pandas)
+            totals, groups = aggregate_export_stats(data, col_indices)
+            total_commandes = totals['montant_ttc']
+            total_facture = totals['montant_facture']
+            total_reste = totals['reste_a_facturer']
+            nb_commandes = len(data)
             
             # ==========================================
             # BLOC 1 : SYNTHÈSE FINANCIÈRE
             # ==========================================
-            ws_stats[f'A{row}'] = "📊 SYNTHÈSE FINANCIÈRE"
-            ws_stats[f'A{row}'].font = Font(size=12, bold=True, color="FFFFFF")
-            ws_stats[f'A{row}'].fill = PatternFill(start_color="0078D4", end_color="0078D4", fill_type="solid")
-            ws_stats.merge_cells(f'A{row}:B{row}')
+            cell = ws_stats.cell(row=row, column=1, value="📊 SYNTHÈSE FINANCIÈRE")
+            cell.font = block_font
+            cell.fill = block_fill
+            pending_merges.append(f'A{row}:B{row}')
             row += 1
             
-            total_commandes = 0.0
-            total_facture = 0.0
-            total_reste = 0.0
-            nb_commandes = len(data)
-            
-            for row_data in data:
-                if 'montant_ttc' in col_indices and col_indices['montant_ttc'] < len(row_data):
-                    total_commandes += parse_montant(row_data[col_indices['montant_ttc']])
-                if 'montant_facture' in col_indices and col_indices['montant_facture'] < len(row_data):
-                    total_facture += parse_montant(row_data[col_indices['montant_facture']])
-                if 'reste_a_facturer' in col_indices and col_indices['reste_a_facturer'] < len(row_data):
-                    total_reste += parse_montant(row_data[col_indices['reste_a_facturer']])
-            
             taux_facturation = (total_facture / total_commandes * 100) if total_commandes > 0 else 0
             montant_moyen = total_commandes / nb_commandes if nb_commandes > 0 else 0
             
-            ws_stats[f'A{row}'] = "Montant total des commandes (TTC)"
-            ws_stats[f'B{row}'] = total_commandes
-            ws_stats[f'B{row}'].number_format = '#,##0.00 €'
-            ws_stats[f'B{row}'].font = Font(bold=True)
-            row += 1
-            
-            ws_stats[f'A{row}'] = "Montant total facturé"
-            ws_stats[f'B{row}'] = total_facture
-            ws_stats[f'B{row}'].number_format = '#,##0.00 €'
-            ws_stats[f'B{row}'].font = Font(color="28A745")
-            row += 1
-            
-            ws_stats[f'A{row}'] = "Reste à facturer"
-            ws_stats[f'B{row}'] = total_reste
-            ws_stats[f'B{row}'].number_format = '#,##0.00 €'
-            ws_stats[f'B{row}'].font = Font(color="DC3545", bold=True)
+            # (libellé, valeur, style nommé, police de la valeur)
+            synthese = (
+                ("Montant total des commandes (TTC)", total_commandes, montant_style, table_head_font),
+                ("Montant total facturé", total_facture, montant_style, xl_styles["facture_font"]),
+                ("Reste à facturer", total_reste, montant_style, xl_styles["reste_font"]),
+                ("Taux de facturation", taux_facturation / 100, pourcentage_style, table_head_font),
+                ("Montant moyen par commande", montant_moyen, montant_style, None),
+            )
+            for label, value, style, font in synthese:
+                ws_stats.cell(row=row, column=1, value=label)
+                cell = ws_stats.cell(row=row, column=2, value=value)
+                cell.style = style
+                if font is not None:
+                    cell.font = font
+                row += 1
             row += 1
             
-            ws_stats[f'A{row}'] = "Taux de facturation"
-            ws_stats[f'B{row}'] = taux_facturation / 100
-            ws_stats[f'B{row}'].number_format = '0.00%'
-            ws_stats[f'B{row}'].font = Font(bold=True)
-            row += 1
+            # Tableaux de répartition : une ligne libellé / nombre / montant / % du total,
+            # chaque cellule obtenue une seule fois par (ligne, colonne)
+            def stats_block(row, title, labels):
+                """Titre de bloc et en-têtes du tableau ; retourne la première ligne de données."""
+                cell = ws_stats.cell(row=row, column=1, value=title)
+                cell.font = block_font
+                cell.fill = block_fill
+                pending_merges.append(f'A{row}:D{row}')
+                row += 1
+                for col, label in enumerate(labels, start=1):
+                    cell = ws_stats.cell(row=row, column=col, value=label)
+                    cell.font = table_head_font
+                    cell.fill = table_head_fill
+                return row + 1
             
-            ws_stats[f'A{row}'] = "Montant moyen par commande"
-            ws_stats[f'B{row}'] = montant_moyen
-            ws_stats[f'B{row}'].number_format = '#,##0.00 €'
-            row += 2
+            def stats_row(row, label, stats, fill=None):
+                # stats : [nombre, montant, part du total] (parts calculées en bloc)
+                cells = [
+                    ws_stats.cell(row=row, column=col, value=value)
+                    for col, value in enumerate((label, *stats), start=1)
+                ]
+                cells[2].style = montant_style
+                cells[3].style = pourcentage_style
+                if fill is not None:
+                    for cell in cells:
+                        cell.fill = fill
             
             # ==========================================
-            # BLOC 2 : STATUT DE FACTURATION
+            # BLOCS 2 à 6 : RÉPARTITIONS
             # ==========================================
-            if 'statut_facturation' in col_indices:
-                ws_stats[f'A{row}'] = "💰 RÉPARTITION PAR STATUT DE FACTURATION"
-                ws_stats[f'A{row}'].font = Font(size=12, bold=True, color="FFFFFF")
-                ws_stats[f'A{row}'].fill = PatternFill(start_color="0078D4", end_color="0078D4", fill_type="solid")
-                ws_stats.merge_cells(f'A{row}:D{row}')
-                row += 1
-                
-                # En-têtes tableau
-                ws_stats[f'A{row}'] = "Statut facturation"
-                ws_stats[f'B{row}'] = "Nombre"
-                ws_stats[f'C{row}'] = "Montant"
-                ws_stats[f'D{row}'] = "% du total"
-                for col in ['A', 'B', 'C', 'D']:
-                    ws_stats[f'{col}{row}'].font = Font(bold=True)
-                    ws_stats[f'{col}{row}'].fill = PatternFill(start_color="E7F3FF", end_color="E7F3FF", fill_type="solid")
-                row += 1
-                
-                # Calculer les stats
-                stats_fact = {}
-                for row_data in data:
-                    if col_indices['statut_facturation'] < len(row_data):
-                        statut = str(row_data[col_indices['statut_facturation']])
-                        if statut not in stats_fact:
-                            stats_fact[statut] = {'count': 0, 'montant': 0.0}
-                        stats_fact[statut]['count'] += 1
-                        if 'montant_ttc' in col_indices and col_indices['montant_ttc'] < len(row_data):
-                            stats_fact[statut]['montant'] += parse_montant(row_data[col_indices['montant_ttc']])
-                
-                # Ordre souhaité
-                ordre = ["Non facturée", "Partiellement facturée", "Totalement facturée"]
-                for statut in ordre:
-                    if statut in stats_fact:
-                        count = stats_fact[statut]['count']
-                        montant = stats_fact[statut]['montant']
-                        pct = (montant / total_commandes * 100) if total_commandes > 0 else 0
-                        
-                        ws_stats[f'A{row}'] = statut
-                        ws_stats[f'B{row}'] = count
-                        ws_stats[f'C{row}'] = montant
-                        ws_stats[f'C{row}'].number_format = '#,##0.00 €'
-                        ws_stats[f'D{row}'] = pct / 100
-                        ws_stats[f'D{row}'].number_format = '0.00%'
-                        
-                        # Couleur selon statut
-                        color = None
-                        if "Totalement" in statut:
-                            color = "E0FFE0"
-                        elif "Partiellement" in statut:
-                            color = "FFF3CD"
-                        elif "Non facturée" in statut:
-                            color = "FFE0E0"
-                        
-                        if color:
-                            for col in ['A', 'B', 'C', 'D']:
-                                ws_stats[f'{col}{row}'].fill = PatternFill(start_color=color, end_color=color, fill_type="solid")
-                        
-                        row += 1
-                row += 1
+            # Ordres d'affichage : chacun renvoie les lignes (libellé, [nombre, montant], remplissage)
+            def fixed_order(colors, others=False):
+                """Libellés imposés (colorés) d'abord ; les autres ensuite si `others`."""
+                def rows(stats):
+                    out = [(label, stats[label], status_fills[color])
+                           for label, color in colors.items() if label in stats]
+                    if others:
+                        out.extend((label, st, None) for label, st in stats.items() if label not in colors)
+                    return out
+                return rows
             
-            # ==========================================
-            # BLOC 3 : TOP 10 FOURNISSEURS
-            # ==========================================
-            if 'fournisseur' in col_indices:
-                ws_stats[f'A{row}'] = "🏢 TOP 10 FOURNISSEURS"
-                ws_stats[f'A{row}'].font = Font(size=12, bold=True, color="FFFFFF")
-                ws_stats[f'A{row}'].fill = PatternFill(start_color="0078D4", end_color="0078D4", fill_type="solid")
-                ws_stats.merge_cells(f'A{row}:D{row}')
-                row += 1
-                
-                # En-têtes
-                ws_stats[f'A{row}'] = "Fournisseur"
-                ws_stats[f'B{row}'] = "Nb commandes"
-                ws_stats[f'C{row}'] = "Montant total"
-                ws_stats[f'D{row}'] = "% du total"
-                for col in ['A', 'B', 'C', 'D']:
-                    ws_stats[f'{col}{row}'].font = Font(bold=True)
-                    ws_stats[f'{col}{row}'].fill = PatternFill(start_color="E7F3FF", end_color="E7F3FF", fill_type="solid")
-                row += 1
-                
-                # Calculer les stats
-                stats_fourn = {}
-                for row_data in data:
-                    if col_indices['fournisseur'] < len(row_data):
-                        fourn = str(row_data[col_indices['fournisseur']]).strip()
-                        if not fourn:
-                            fourn = "(Vide)"
-                        if fourn not in stats_fourn:
-                            stats_fourn[fourn] = {'count': 0, 'montant': 0.0}
-                        stats_fourn[fourn]['count'] += 1
-                        if 'montant_ttc' in col_indices and col_indices['montant_ttc'] < len(row_data):
-                            stats_fourn[fourn]['montant'] += parse_montant(row_data[col_indices['montant_ttc']])
-                
-                # Trier par montant décroissant et prendre top 10
-                top_fourn = sorted(stats_fourn.items(), key=lambda x: x[1]['montant'], reverse=True)[:10]
-                
-                for fourn, stats in top_fourn:
-                    count = stats['count']
-                    montant = stats['montant']
-                    pct = (montant / total_commandes * 100) if total_commandes > 0 else 0
-                    
-                    ws_stats[f'A{row}'] = fourn
-                    ws_stats[f'B{row}'] = count
-                    ws_stats[f'C{row}'] = montant
-                    ws_stats[f'C{row}'].number_format = '#,##0.00 €'
-                    ws_stats[f'D{row}'] = pct / 100
-                    ws_stats[f'D{row}'].number_format = '0.00%'
-                    
-                    row += 1
-                row += 1
+            def by_amount(limit=None):
+                """Montant décroissant ; top `limit` par sélection par tas, sans tri complet."""
+                def rows(stats):
+                    if limit is None:
+                        items = sorted(stats.items(), key=lambda x: x[1][1], reverse=True)
+                    else:
+                        items = heapq.nlargest(limit, stats.items(), key=lambda x: x[1][1])
+                    return [(label, st, None) for label, st in items]
+                return rows
             
-            # ==========================================
-            # BLOC 4 : SECTION FONCTIONNEMENT/INVESTISSEMENT
-            # ==========================================
-            if 'section' in col_indices:
-                ws_stats[f'A{row}'] = "🎯 RÉPARTITION PAR SECTION"
-                ws_stats[f'A{row}'].font = Font(size=12, bold=True, color="FFFFFF")
-                ws_stats[f'A{row}'].fill = PatternFill(start_color="0078D4", end_color="0078D4", fill_type="solid")
-                ws_stats.merge_cells(f'A{row}:D{row}')
-                row += 1
-                
-                # En-têtes
-                ws_stats[f'A{row}'] = "Section"
-                ws_stats[f'B{row}'] = "Nombre"
-                ws_stats[f'C{row}'] = "Montant"
-                ws_stats[f'D{row}'] = "% du total"
-                for col in ['A', 'B', 'C', 'D']:
-                    ws_stats[f'{col}{row}'].font = Font(bold=True)
-                    ws_stats[f'{col}{row}'].fill = PatternFill(start_color="E7F3FF", end_color="E7F3FF", fill_type="solid")
-                row += 1
-                
-                # Calculer les stats
-                stats_section = {}
-                for row_data in data:
-                    if col_indices['section'] < len(row_data):
-                        section = str(row_data[col_indices['section']]).strip()
-                        if not section:
-                            section = "(Non renseigné)"
-                        if section not in stats_section:
-                            stats_section[section] = {'count': 0, 'montant': 0.0}
-                        stats_section[section]['count'] += 1
-                        if 'montant_ttc' in col_indices and col_indices['montant_ttc'] < len(row_data):
-                            stats_section[section]['montant'] += parse_montant(row_data[col_indices['montant_ttc']])
-                
-                # Trier par montant décroissant
-                sorted_sections = sorted(stats_section.items(), key=lambda x: x[1]['montant'], reverse=True)
-                
-                for section, stats in sorted_sections:
-                    count = stats['count']
-                    montant = stats['montant']
-                    pct = (montant / total_commandes * 100) if total_commandes > 0 else 0
-                    
-                    ws_stats[f'A{row}'] = section
-                    ws_stats[f'B{row}'] = count
-                    ws_stats[f'C{row}'] = montant
-                    ws_stats[f'C{row}'].number_format = '#,##0.00 €'
-                    ws_stats[f'D{row}'] = pct / 100
-                    ws_stats[f'D{row}'].number_format = '0.00%'
-                    
-                    row += 1
-                row += 1
+            def by_label_desc(stats):
+                return [(label, st, None) for label, st in sorted(stats.items(), reverse=True)]
             
-            # ==========================================
-            # BLOC 5 : RÉPARTITION PAR EXERCICE
-            # ==========================================
-            if 'exercice' in col_indices:
-                ws_stats[f'A{row}'] = "📅 RÉPARTITION PAR EXERCICE"
-                ws_stats[f'A{row}'].font = Font(size=12, bold=True, color="FFFFFF")
-                ws_stats[f'A{row}'].fill = PatternFill(start_color="0078D4", end_color="0078D4", fill_type="solid")
-                ws_stats.merge_cells(f'A{row}:D{row}')
-                row += 1
-                
-                # En-têtes
-                ws_stats[f'A{row}'] = "Exercice"
-                ws_stats[f'B{row}'] = "Nombre"
-                ws_stats[f'C{row}'] = "Montant"
-                ws_stats[f'D{row}'] = "% du total"
-                for col in ['A', 'B', 'C', 'D']:
-                    ws_stats[f'{col}{row}'].font = Font(bold=True)
-                    ws_stats[f'{col}{row}'].fill = PatternFill(start_color="E7F3FF", end_color="E7F3FF", fill_type="solid")
-                row += 1
-                
-                # Calculer les stats
-                stats_exercice = {}
-                for row_data in data:
-                    if col_indices['exercice'] < len(row_data):
-                        exercice = str(row_data[col_indices['exercice']]).strip()
-                        if not exercice:
-                            exercice = "(Non renseigné)"
-                        if exercice not in stats_exercice:
-                            stats_exercice[exercice] = {'count': 0, 'montant': 0.0}
-                        stats_exercice[exercice]['count'] += 1
-                        if 'montant_ttc' in col_indices and col_indices['montant_ttc'] < len(row_data):
-                            stats_exercice[exercice]['montant'] += parse_montant(row_data[col_indices['montant_ttc']])
-                
-                # Trier par exercice décroissant
-                sorted_exercices = sorted(stats_exercice.items(), reverse=True)
-                
-                for exercice, stats in sorted_exercices:
-                    count = stats['count']
-                    montant = stats['montant']
-                    pct = (montant / total_commandes * 100) if total_commandes > 0 else 0
-                    
-                    ws_stats[f'A{row}'] = exercice
-                    ws_stats[f'B{row}'] = count
-                    ws_stats[f'C{row}'] = montant
-                    ws_stats[f'C{row}'].number_format = '#,##0.00 €'
-                    ws_stats[f'D{row}'] = pct / 100
-                    ws_stats[f'D{row}'].number_format = '0.00%'
-                    
+            # (clé de regroupement, titre, en-têtes, ordre des lignes)
+            repartitions = (
+                ('statut_facturation', "💰 RÉPARTITION PAR STATUT DE FACTURATION",
+                 ("Statut facturation", "Nombre", "Montant", "% du total"),
+                 fixed_order({"Non facturée": "FFE0E0",
+                              "Partiellement facturée": "FFF3CD",
+                              "Totalement facturée": "E0FFE0"})),
+                ('fournisseur', "🏢 TOP 10 FOURNISSEURS",
+                 ("Fournisseur", "Nb commandes", "Montant total", "% du total"),
+                 by_amount(limit=10)),
+                ('section', "🎯 RÉPARTITION PAR SECTION",
+                 ("Section", "Nombre", "Montant", "% du total"),
+                 by_amount()),
+                ('exercice', "📅 RÉPARTITION PAR EXERCICE",
+                 ("Exercice", "Nombre", "Montant", "% du total"),
+                 by_label_desc),
+                ('statut', "📊 RÉPARTITION PAR STATUT",
+                 ("Statut", "Nombre", "Montant", "% du total"),
+                 fixed_order({"A suivre": "FFF3CD", "Envoyée": "E0FFE0"}, others=True)),
+            )
+            
+            for key, title, labels, ordered_rows in repartitions:
+                if key not in col_indices:
+                    continue
+                row = stats_block(row, title, labels)
+                # Stats calculées lors du passage unique ci-dessus
+                for label, stats, fill in ordered_rows(groups[key]):
+                    stats_row(row, label, stats, fill)
                     row += 1
                 row += 1
             
-            # ==========================================
-            # BLOC 6 : RÉPARTITION PAR STATUT
-            # ==========================================
-            if 'statut' in col_indices:
-                ws_stats[f'A{row}'] = "📊 RÉPARTITION PAR STATUT"
-                ws_stats[f'A{row}'].font = Font(size=12, bold=True, color="FFFFFF")
-                ws_stats[f'A{row}'].fill = PatternFill(start_color="0078D4", end_color="0078D4", fill_type="solid")
-                ws_stats.merge_cells(f'A{row}:D{row}')
-                row += 1
-                
-                # En-têtes
-                ws_stats[f'A{row}'] = "Statut"
-                ws_stats[f'B{row}'] = "Nombre"
-                ws_stats[f'C{row}'] = "Montant"
-                ws_stats[f'D{row}'] = "% du total"
-                for col in ['A', 'B', 'C', 'D']:
-                    ws_stats[f'{col}{row}'].font = Font(bold=True)
-                    ws_stats[f'{col}{row}'].fill = PatternFill(start_color="E7F3FF", end_color="E7F3FF", fill_type="solid")
-                row += 1
-                
-                # Calculer les stats
-                stats_statut = {}
-                for row_data in data:
-                    if col_indices['statut'] < len(row_data):
-                        statut = str(row_data[col_indices['statut']]).strip()
-                        if not statut:
-                            statut = "(Non renseigné)"
-                        if statut not in stats_statut:
-                            stats_statut[statut] = {'count': 0, 'montant': 0.0}
-                        stats_statut[statut]['count'] += 1
-                        if 'montant_ttc' in col_indices and col_indices['montant_ttc'] < len(row_data):
-                            stats_statut[statut]['montant'] += parse_montant(row_data[col_indices['montant_ttc']])
-                
-                # Ordre souhaité
-                ordre_statut = ["A suivre", "Envoyée"]
-                for statut in ordre_statut:
-                    if statut in stats_statut:
-                        count = stats_statut[statut]['count']
-                        montant = stats_statut[statut]['montant']
-                        pct = (montant / total_commandes * 100) if total_commandes > 0 else 0
-                        
-                        ws_stats[f'A{row}'] = statut
-                        ws_stats[f'B{row}'] = count
-                        ws_stats[f'C{row}'] = montant
-                        ws_stats[f'C{row}'].number_format = '#,##0.00 €'
-                        ws_stats[f'D{row}'] = pct / 100
-                        ws_stats[f'D{row}'].number_format = '0.00%'
-                        
-                        # Couleur selon statut
-                        if statut == "Envoyée":
-                            color = "E0FFE0"
-                        elif statut == "A suivre":
-                            color = "FFF3CD"
-                        else:
-                            color = None
-                        
-                        if color:
-                            for col in ['A', 'B', 'C', 'D']:
-                                ws_stats[f'{col}{row}'].fill = PatternFill(start_color=color, end_color=color, fill_type="solid")
-                        
-                        row += 1
-                
-                # Autres statuts (si présents)
-                for statut, stats in stats_statut.items():
-                    if statut not in ordre_statut:
-                        count = stats['count']
-                        montant = stats['montant']
-                        pct = (montant / total_commandes * 100) if total_commandes > 0 else 0
-                        
-                        ws_stats[f'A{row}'] = statut
-                        ws_stats[f'B{row}'] = count
-                        ws_stats[f'C{row}'] = montant
-                        ws_stats[f'C{row}'].number_format = '#,##0.00 €'
-                        ws_stats[f'D{row}'] = pct / 100
-                        ws_stats[f'D{row}'].number_format = '0.00%'
-                        
-                        row += 1
+            for cell_range in pending_merges:
+                ws_stats.merge_cells(cell_range)
             
             # Ajuster les largeurs de colonnes
             ws_stats.column_dimensions['A'].width = 35
@@ -5484,59 +6365,33 @@ class MainWindow(QMainWindow):
             ws_stats.column_dimensions['C'].width = 18
             ws_stats.column_dimensions['D'].width = 12
             
-            # Sauvegarder le fichier
-            wb.save(file_path)
-            
-            # Message de succès
-            reply = QMessageBox.question(
-                self,
-                "Export réussi",
-                f"Le fichier Excel a été créé avec succès :\n{file_path}\n\nVoulez-vous l'ouvrir ?",
-                QMessageBox.Yes | QMessageBox.No
+            # Sauvegarder le fichier (en arrière-plan)
+            self._run_in_pool(
+                "Enregistrement du fichier Excel…",
+                lambda: wb.save(file_path),
+                lambda _result: self._propose_open_export(file_path, "Le fichier Excel"),
+                "Erreur d'export Excel",
             )
-            
-            if reply == QMessageBox.Yes:
-                import subprocess
-                if sys.platform == "win32":
-                    os.startfile(file_path)
-                elif sys.platform == "darwin":
-                    subprocess.call(["open", file_path])
-                else:
-                    subprocess.call(["xdg-open", file_path])
         
         except Exception as e:
             QMessageBox.critical(self, "Erreur d'export Excel", f"Une erreur est survenue :\n{str(e)}")
 
     # ============== MÉTHODES POUR LE SUIVI DES MARCHÉS ==============
 
-    def sync_marches_cache_from_database(self):
+    def sync_marches_cache_from_database(self, db=None):
         """
         Synchronise le cache MarchesSync depuis la base de données principale.
         Retourne le nombre de factures synchronisées.
+
+        `db` : connexion à lire (par défaut la connexion principale ; une connexion
+        dédiée lorsqu'appelée depuis un thread de travail).
         """
-        from marches_sync import MarchesSync
+        if db is None:
+            db = self.db
 
-        # D'abord, vérifier combien de factures au total
-        cur = self.db.conn.cursor()
-        cur.execute("SELECT COUNT(*) as total FROM factures")
-        total_factures = cur.fetchone()['total']
-        print(f"[DEBUG] Total factures dans la base: {total_factures}")
-
-        # Vérifier combien ont un marché rempli
-        cur.execute("SELECT COUNT(*) as avec_marche FROM factures WHERE marche IS NOT NULL AND marche != ''")
-        avec_marche = cur.fetchone()['avec_marche']
-        print(f"[DEBUG] Factures avec marché: {avec_marche}")
-
-        # Si aucune facture avec marché, afficher quelques exemples
-        if avec_marche == 0:
-            cur.execute("SELECT exercice, num_facture, fournisseur, marche FROM factures LIMIT 5")
-            exemples = cur.fetchall()
-            print(f"[DEBUG] Exemples de factures (5 premières):")
-            for ex in exemples:
-                print(f"  - {ex['exercice']}/{ex['num_facture']}: marché='{ex['marche']}'")
-
-        # Charger toutes les factures avec un marché non vide depuis la base
-        cur.execute("""
+        # Charger toutes les factures avec un marché non vide depuis la base,
+        # directement en DataFrame (noms de colonnes issus des alias du SELECT)
+        df = pd.read_sql_query("""
             SELECT
                 marche,
                 fournisseur,
@@ -5551,41 +6406,27 @@ class MainWindow(QMainWindow):
                 commande
             FROM factures
             WHERE marche IS NOT NULL AND marche != ''
-        """)
-
-        rows = cur.fetchall()
+        """, db.conn)
 
-        if not rows:
+        if df.empty:
             print("[WARNING] Aucune facture avec un marché n'a été trouvée dans la base")
+            if DEBUG:
+                # Diagnostic seulement dans ce cas : total et quelques exemples
+                cur = db.conn.cursor()
+                cur.execute("SELECT COUNT(*) as total FROM factures")
+                print(f"[DEBUG] Total factures dans la base: {cur.fetchone()['total']}")
+                cur.execute("SELECT exercice, num_facture, fournisseur, marche FROM factures LIMIT 5")
+                print(f"[DEBUG] Exemples de factures (5 premières):")
+                for ex in cur.fetchall():
+                    print(f"  - {ex['exercice']}/{ex['num_facture']}: marché='{ex['marche']}'")
             return 0
 
-        # Convertir en DataFrame avec noms de colonnes explicites
-        # Les colonnes doivent correspondre exactement à l'ordre du SELECT
-        column_names = [
-            'marche', 'fournisseur', 'libelle', 'date_sf', 'num_facture',
-            'montant_ttc', 'montant_sf', 'montant_initial', 'num_mandat',
-            'tranche', 'commande'
-        ]
-
-        # Convertir les rows en liste de tuples pour créer le DataFrame
-        data = [tuple(row) for row in rows]
-        df = pd.DataFrame(data, columns=column_names)
-
-        print(f"[DEBUG] DataFrame créé avec {len(df)} lignes et colonnes: {list(df.columns)}")
+        if DEBUG:
+            print(f"[DEBUG] DataFrame créé avec {len(df)} lignes et colonnes: {list(df.columns)}")
 
         # Si montant_initial est vide/null, utiliser montant_ttc comme fallback
-        try:
-            if 'montant_initial' in df.columns and 'montant_ttc' in df.columns:
-                # Remplacer les valeurs null de montant_initial par montant_ttc
-                df.loc[df['montant_initial'].isna(), 'montant_initial'] = df.loc[df['montant_initial'].isna(), 'montant_ttc']
-            elif 'montant_ttc' in df.columns:
-                # Si pas de colonne montant_initial, la créer
-                df['montant_initial'] = df['montant_ttc']
-        except Exception as e:
-            print(f"[WARNING] Erreur lors du traitement de montant_initial: {e}")
-            # Fallback: créer une colonne vide
-            if 'montant_initial' not in df.columns:
-                df['montant_initial'] = 0.0
+        # (les deux colonnes sont toujours présentes : elles viennent du SELECT)
+        df['montant_initial'] = df['montant_initial'].fillna(df['montant_ttc'])
 
         # Synchroniser vers le cache MarchesSync
         try:
@@ -5616,20 +6457,45 @@ class MainWindow(QMainWindow):
             )
             return
 
-        try:
-            # Synchroniser le cache MarchesSync depuis notre base de données
-            nb_synced = self.sync_marches_cache_from_database()
-            print(f"[INFO] {nb_synced} factures synchronisées vers le cache marchés")
+        # Synchronisation, chargement et calcul des visions dans le QThreadPool,
+        # sur une connexion dédiée ; les modèles sont remplis dans le thread principal
+        main_db = self.db
+
+        def job():
+            db = main_db.for_thread()
+            try:
+                # Synchroniser le cache MarchesSync depuis notre base de données
+                nb_synced = self.sync_marches_cache_from_database(db)
+                print(f"[INFO] {nb_synced} factures synchronisées vers le cache marchés")
+
+                # Utiliser un chemin factice pour MarchesAnalyzer
+                # (il va charger depuis son cache SQLite qui a été peuplé depuis notre DB)
+                fact_path = "database_sync"
 
-            # Utiliser un chemin factice pour MarchesAnalyzer
-            # (il va charger depuis son cache SQLite qui a été peuplé depuis notre DB)
-            fact_path = "database_sync"
+                # Initialiser l'analyseur avec la base de données
+                analyzer = MarchesAnalyzer(fact_path, database=db, use_cache=True)
 
-            # Initialiser l'analyseur avec la base de données
-            self.marches_analyzer = MarchesAnalyzer(fact_path, database=self.db, use_cache=True)
+                # Charger les données depuis le cache ; la connexion du cache est
+                # fermée ici, dans le thread qui l'a ouverte (elle ne sert qu'à load_data)
+                try:
+                    if not analyzer.load_data():
+                        return None
+                finally:
+                    if analyzer.sync is not None:
+                        analyzer.sync.close()
+                        analyzer.sync = None
+
+                return analyzer, (
+                    analyzer.get_vision_globale(),        # vision globale
+                    analyzer.get_vision_detaillee(),      # toutes les tranches
+                    analyzer.get_vision_operations(),     # vision opérations
+                    analyzer.get_historique_factures(),   # historique complet des factures
+                )
+            finally:
+                db.close()
 
-            # Charger les données depuis le cache
-            if not self.marches_analyzer.load_data():
+        def loaded(result):
+            if result is None:
                 QMessageBox.critical(
                     self,
                     "Erreur de chargement",
@@ -5638,20 +6504,14 @@ class MainWindow(QMainWindow):
                 )
                 return
 
-            # Calculer la vision globale
-            vision_globale = self.marches_analyzer.get_vision_globale()
-            self.marches_global_model.set_data(vision_globale)
+            analyzer, (vision_globale, vision_detaillee, vision_operations, historique_factures) = result
+            # La connexion du thread est fermée : l'analyseur reprend la connexion principale
+            analyzer.db = self.db
+            self.marches_analyzer = analyzer
 
-            # Calculer la vision détaillée (toutes les tranches)
-            vision_detaillee = self.marches_analyzer.get_vision_detaillee()
+            self.marches_global_model.set_data(vision_globale)
             self.marches_tranches_model.set_data(vision_detaillee)
-
-            # Calculer la vision opérations
-            vision_operations = self.marches_analyzer.get_vision_operations()
             self.operations_model.set_data(vision_operations)
-
-            # Calculer l'historique complet des factures
-            historique_factures = self.marches_analyzer.get_historique_factures()
             self.historique_model.set_data(historique_factures)
 
             # Message de confirmation
@@ -5669,12 +6529,13 @@ class MainWindow(QMainWindow):
                 f"• {nb_lignes_historique} lignes d'historique"
             )
 
-        except Exception as e:
-            QMessageBox.critical(
-                self,
-                "Erreur",
-                f"Une erreur est survenue lors du chargement des données :\n\n{str(e)}"
-            )
+        self._run_in_pool(
+            "Chargement des données des marchés…",
+            job,
+            loaded,
+            "Erreur",
+            window_title="Chargement en cours",
+        )
 
     def on_marche_selection_changed(self, selected, deselected):
         """Appelée quand la sélection dans la table globale change."""
@@ -5724,11 +6585,7 @@ class MainWindow(QMainWindow):
                 return
 
             # Basculer vers l'onglet Historique
-            # Trouver l'index de l'onglet Historique
-            for i in range(self.tabs.count()):
-                if self.tabs.tabText(i) == "📜 Historique":
-                    self.tabs.setCurrentIndex(i)
-                    break
+            self.tabs.setCurrentIndex(Tab.HISTORIQUE)
 
             # Si l'opération contient un seul marché, filtrer par ce marché
             # Sinon, filtrer par le code de l'opération (tous les marchés commençant par ce code)
@@ -5747,8 +6604,10 @@ class MainWindow(QMainWindow):
             )
             return
 
-        # Récupérer l'opération sélectionnée
-        selected_indexes = self.table_operations.selectionModel().selectedRows()
+        # Récupérer l'opération sélectionnée (table non construite : aucune sélection)
+        selected_indexes = []
+        if self.table_operations is not None:
+            selected_indexes = self.table_operations.selectionModel().selectedRows()
         if not selected_indexes:
             QMessageBox.warning(
                 self,
@@ -5776,7 +6635,6 @@ class MainWindow(QMainWindow):
         exercice_choisi = None
 
         # Demander le chemin du fichier
-        from PyQt5.QtWidgets import QFileDialog
         default_filename = f"suivi_financier_{code_operation}.xlsx"
         filepath, _ = QFileDialog.getSaveFileName(
             self,
@@ -5788,15 +6646,8 @@ class MainWindow(QMainWindow):
         if not filepath:
             return
 
-        # Exporter
-        try:
-            success = self.marches_analyzer.export_suivi_financier_operation(
-                code_operation,
-                filepath,
-                exercice_filter=exercice_choisi,
-                special_export=False
-            )
-
+        # Exporter (en arrière-plan)
+        def on_done(success):
             if success:
                 QMessageBox.information(
                     self,
@@ -5815,12 +6666,18 @@ class MainWindow(QMainWindow):
                     "Consultez la console pour plus de détails."
                 )
 
-        except Exception as e:
-            QMessageBox.critical(
-                self,
-                "Erreur",
-                f"Une erreur est survenue lors de l'export :\n\n{str(e)}"
-            )
+        self._run_in_pool(
+            f"Export du suivi financier {code_operation}…",
+            self._analyzer_export_job(
+                "export_suivi_financier_operation",
+                code_operation,
+                filepath,
+                exercice_filter=exercice_choisi,
+                special_export=False
+            ),
+            on_done,
+            "Erreur",
+        )
 
     def export_suivi_financier_2020_14G3P(self):
         """Export spécifique pour l'opération 2020_14G3P."""
@@ -5835,7 +6692,6 @@ class MainWindow(QMainWindow):
         code_operation = "2020_14G3P"
         exercices = self.marches_analyzer.get_exercices_for_operation(code_operation)
 
-        from PyQt5.QtWidgets import QInputDialog, QFileDialog
         exercice_choisi, ok = QInputDialog.getItem(
             self,
             "Choisir l'exercice",
@@ -5858,14 +6714,7 @@ class MainWindow(QMainWindow):
         if not filepath:
             return
 
-        try:
-            success = self.marches_analyzer.export_suivi_financier_operation(
-                code_operation,
-                filepath,
-                exercice_filter=exercice_choisi,
-                special_export=True
-            )
-
+        def on_done(success):
             if success:
                 QMessageBox.information(
                     self,
@@ -5883,12 +6732,19 @@ class MainWindow(QMainWindow):
                     "Une erreur est survenue lors de l'export.\n\n"
                     "Consultez la console pour plus de détails."
                 )
-        except Exception as e:
-            QMessageBox.critical(
-                self,
-                "Erreur",
-                f"Une erreur est survenue lors de l'export :\n\n{str(e)}"
-            )
+
+        self._run_in_pool(
+            f"Export du suivi financier {code_operation}…",
+            self._analyzer_export_job(
+                "export_suivi_financier_operation",
+                code_operation,
+                filepath,
+                exercice_filter=exercice_choisi,
+                special_export=True
+            ),
+            on_done,
+            "Erreur",
+        )
 
     def export_marches_excel(self):
         """Exporte les données des marchés dans un fichier Excel avec 5 feuilles."""
@@ -5901,7 +6757,6 @@ class MainWindow(QMainWindow):
             return
 
         # Demander le chemin du fichier
-        from PyQt5.QtWidgets import QFileDialog
         filepath, _ = QFileDialog.getSaveFileName(
             self,
             "Exporter les données des marchés",
@@ -5912,9 +6767,8 @@ class MainWindow(QMainWindow):
         if not filepath:
             return
 
-        # Exporter
-        try:
-            success = self.marches_analyzer.export_to_excel(filepath)
+        # Exporter (en arrière-plan)
+        def on_done(success):
             if success:
                 QMessageBox.information(
                     self,
@@ -5934,29 +6788,23 @@ class MainWindow(QMainWindow):
                     "Erreur d'export",
                     "Une erreur est survenue lors de l'export."
                 )
-        except Exception as e:
-            QMessageBox.critical(
-                self,
-                "Erreur d'export",
-                f"Une erreur est survenue lors de l'export :\n\n{str(e)}"
-            )
+
+        self._run_in_pool(
+            "Export des données des marchés…",
+            self._analyzer_export_job("export_to_excel", filepath),
+            on_done,
+            "Erreur d'export",
+        )
 
     def open_config(self):
         dlg = ConfigDialog(self.db, self)
         if dlg.exec_() == QDialog.Accepted:
             # relance le timer avec le nouvel intervalle
-            self.reminder_timer.setInterval(self._get_reminder_interval() * 60 * 1000)
+            self._reminder_interval_ms = self._get_reminder_interval() * 60 * 1000
+            self.reminder_timer.setInterval(self._reminder_interval_ms)
 
     def closeEvent(self, event):
-        if self.error_log:
-            try:
-                log_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "suivi_log.txt")
-                with open(log_path, "a", encoding="utf-8") as f:
-                    for line in self.error_log:
-                        f.write(line + "\n")
-                self.error_log.clear()
-            except Exception:
-                pass
+        self._save_error_log()
         super().closeEvent(event)
 
 
@@ -5970,4 +6818,6 @@ def main():
 
 
 if __name__ == "__main__":
+    # Processus de travail des imports dans l'exécutable PyInstaller (Windows)
+    multiprocessing.freeze_support()
     main()